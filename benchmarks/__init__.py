@@ -0,0 +1 @@
+"""Бенчмарки SDK (запуск из корня проекта: python -m benchmarks.<модуль>)."""
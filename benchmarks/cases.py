@@ -0,0 +1,230 @@
+"""
+Сценарии бенчмарков горячих путей SDK.
+
+Каждый сценарий — функция, которая готовит данные и возвращает
+вызываемый объект без аргументов; измеряется только он. Регистрация
+через декоратор @case.
+"""
+
+import json
+import random
+import tempfile
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from src import IikoSDK
+from src.auth.auth_manager import TokenStorage
+from src.client.rate_limiter import reset_rate_limiters
+from src.reports.chunking import DateWindow
+from src.reports import olap
+from src.reports.olap import OLAPReport, OLAPReports, ReportSpec
+from src.reports.streaming import parse_olap_stream
+from src.testing import FakeIikoServer, FakeServerConfig, SyntheticOLAP, read_chunks
+from src.testing.fake_server import SALES_COLUMNS
+
+# Сценарий: (ExitStack для ресурсов) -> измеряемая функция
+CaseFactory = Callable[[ExitStack], Callable[[], object]]
+
+CASES: Dict[str, CaseFactory] = {}
+
+# Размер синтетического списка колонок (у реального SALES их несколько сотен)
+COLUMNS_COUNT = 600
+REPORT_ROWS = 50_000
+MERGE_WINDOWS = 30
+MERGE_ROWS_PER_WINDOW = 2_000
+# Размер синтетического ответа для сценариев *_synthetic
+# (меняется параметром --rows: 10 тыс., 1 млн, 10 млн)
+SYNTHETIC_ROWS = 100_000
+
+GROUP_BY = ["OpenDate.Typed", "Department", "WaiterName", "PayTypes"]
+AGGREGATES = ["DishDiscountSumInt", "GuestNum", "DishAmountInt"]
+
+
+def case(name: str) -> Callable[[CaseFactory], CaseFactory]:
+    """Зарегистрировать сценарий под именем name."""
+    def decorator(factory: CaseFactory) -> CaseFactory:
+        CASES[name] = factory
+        return factory
+    return decorator
+
+
+def _columns(count: int) -> Dict[str, Dict[str, object]]:
+    """Синтетический ответ /v2/reports/olap/columns на count колонок."""
+    templates = list(SALES_COLUMNS.values())
+    return {
+        f"Column{i}.Field": {**templates[i % len(templates)], "name": f"Колонка {i}"}
+        for i in range(count)
+    }
+
+
+def _rows(count: int, seed: int = 0) -> Tuple[list, list]:
+    """Строки отчета GROUP_BY + AGGREGATES."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    rows = [
+        [
+            (start + timedelta(days=i % 31)).strftime("%Y-%m-%d"),
+            f"Ресторан №{rng.randint(1, 5)}",
+            f"Официант {rng.randint(1, 40)}",
+            rng.choice(("Наличные", "Банковские карты", "СБП")),
+            round(rng.uniform(100, 20_000), 2),
+            rng.randint(1, 12),
+            rng.randint(1, 30),
+        ]
+        for i in range(count)
+    ]
+    return GROUP_BY, rows
+
+
+@case("parse_columns_json")
+def parse_columns_json(stack: ExitStack) -> Callable[[], object]:
+    text = json.dumps(_columns(COLUMNS_COUNT), ensure_ascii=False)
+    return lambda: OLAPReports._parse_columns_json(text)
+
+
+@case("parse_columns_xml")
+def parse_columns_xml(stack: ExitStack) -> Callable[[], object]:
+    items = "".join(
+        f'<column name="{key}" caption="{info["name"]}" type="{info["type"]}" '
+        f'aggregationAllowed="{str(info["aggregationAllowed"]).lower()}" '
+        f'groupingAllowed="{str(info["groupingAllowed"]).lower()}"/>'
+        for key, info in _columns(COLUMNS_COUNT).items()
+    )
+    text = f'<?xml version="1.0" encoding="UTF-8"?><columns>{items}</columns>'
+    return lambda: OLAPReports._parse_columns_xml(text)
+
+
+@case("report_to_dicts")
+def report_to_dicts(stack: ExitStack) -> Callable[[], object]:
+    group_by, rows = _rows(REPORT_ROWS)
+    report = OLAPReport(group_by, AGGREGATES)
+    for row in rows:
+        report.append(row)
+    return lambda: sum(1 for _ in report.iter_dicts())
+
+
+@case("merge_windows")
+def merge_windows(stack: ExitStack) -> Callable[[], object]:
+    spec = ReportSpec("SALES", GROUP_BY, AGGREGATES)
+    start = datetime(2026, 1, 1)
+    parts = []
+    for i in range(MERGE_WINDOWS):
+        _, rows = _rows(MERGE_ROWS_PER_WINDOW, seed=i)
+        part = OLAPReport(GROUP_BY, AGGREGATES, summary={f: 1 for f in AGGREGATES}, raw={})
+        for row in rows:
+            part.append(row)
+        window = DateWindow(start + timedelta(days=i), start + timedelta(days=i + 1))
+        parts.append((window, part))
+    return lambda: olap.merge_windows(spec, parts)
+
+
+@case("token_save_load")
+def token_save_load(stack: ExitStack) -> Callable[[], object]:
+    tmp = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+    storage = TokenStorage(tmp / ".token")
+
+    def run() -> object:
+        storage.save("00000000-0000-0000-0000-000000000000")
+        return storage.load_with_created_at()
+
+    return run
+
+
+@case("build_report_v2")
+def build_report_v2(stack: ExitStack) -> Callable[[], object]:
+    reset_rate_limiters()
+    tmp = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+    server = stack.enter_context(FakeIikoServer(FakeServerConfig(rows_per_day=2_000)))
+    settings = server.make_settings(
+        token_storage_path=tmp / ".token",
+        rate_limit_per_second=10_000,
+        rate_limit_burst=1_000,
+    )
+    sdk = stack.enter_context(IikoSDK(settings))
+    window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 2))
+    filters = {"OpenDate.Typed": window.to_filter()}
+
+    return lambda: sdk.olap.build_report_v2(
+        "SALES",
+        group_by_row_fields=["Department", "WaiterName", "DishName"],
+        aggregate_fields=["DishDiscountSumInt", "DishAmountInt"],
+        filters=filters,
+    )
+
+
+def _synthetic_file(stack: ExitStack) -> Tuple[SyntheticOLAP, Path]:
+    """Записать синтетический ответ на SYNTHETIC_ROWS строк во временный файл."""
+    tmp = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+    generator = SyntheticOLAP(GROUP_BY, AGGREGATES, rows=SYNTHETIC_ROWS)
+    path = tmp / "olap.json"
+    generator.write(path)
+    return generator, path
+
+
+@case("parse_stream_synthetic")
+def parse_stream_synthetic(stack: ExitStack) -> Callable[[], object]:
+    generator, path = _synthetic_file(stack)
+
+    def run() -> object:
+        report = OLAPReport(generator.group_by_row_fields, generator.aggregate_fields)
+        parse_olap_stream(read_chunks(path), on_row=report.append_record)
+        return report
+
+    return run
+
+
+@case("parse_json_synthetic")
+def parse_json_synthetic(stack: ExitStack) -> Callable[[], object]:
+    generator, path = _synthetic_file(stack)
+
+    def run() -> object:
+        data = json.loads(path.read_bytes())
+        return OLAPReport.from_records(
+            generator.group_by_row_fields,
+            generator.aggregate_fields,
+            data.pop("data"),
+        )
+
+    return run
+
+
+@case("merge_synthetic")
+def merge_synthetic(stack: ExitStack) -> Callable[[], object]:
+    spec = ReportSpec("SALES", GROUP_BY, AGGREGATES)
+    start = datetime(2026, 1, 1)
+    per_window = max(1, SYNTHETIC_ROWS // MERGE_WINDOWS)
+    parts = []
+    for i in range(MERGE_WINDOWS):
+        day = start + timedelta(days=i)
+        generator = SyntheticOLAP(
+            GROUP_BY, AGGREGATES, rows=per_window, seed=i,
+            start=day.date(), cardinalities={"OpenDate.Typed": 1},
+        )
+        part = OLAPReport.from_records(
+            GROUP_BY, AGGREGATES, generator.iter_records(),
+            summary={f: 1 for f in AGGREGATES}, raw={},
+        )
+        parts.append((DateWindow(day, day + timedelta(days=1)), part))
+    return lambda: olap.merge_windows(spec, parts)
+
+
+@case("merge_regroup_synthetic")
+def merge_regroup_synthetic(stack: ExitStack) -> Callable[[], object]:
+    # Без даты в группировке одни и те же группы приходят в каждом окне
+    # и сливаются по ключу
+    group_by = [f for f in GROUP_BY if f != "OpenDate.Typed"]
+    spec = ReportSpec("SALES", group_by, AGGREGATES)
+    start = datetime(2026, 1, 1)
+    per_window = max(1, SYNTHETIC_ROWS // MERGE_WINDOWS)
+    parts = []
+    for i in range(MERGE_WINDOWS):
+        day = start + timedelta(days=i)
+        generator = SyntheticOLAP(group_by, AGGREGATES, rows=per_window, seed=0)
+        part = OLAPReport.from_records(
+            group_by, AGGREGATES, generator.iter_records(),
+            summary={f: 1 for f in AGGREGATES}, raw={},
+        )
+        parts.append((DateWindow(day, day + timedelta(days=1)), part))
+    return lambda: olap.merge_windows(spec, parts)
@@ -0,0 +1,127 @@
+"""
+Бенчмарк повторных попыток HTTPClient под профилями сбоев.
+
+Для каждого профиля фейкового сервера (src.testing.PROFILES) выполняет
+серию build_report_v2 за один день и печатает пропускную способность,
+задержки p50/p99, число неудачных отчетов и лишних запросов (повторов).
+
+Запуск:
+    python -m benchmarks.retry_profiles
+    python -m benchmarks.retry_profiles --profiles healthy throttled --requests 50
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from src import IikoSDK
+from src.client.rate_limiter import reset_rate_limiters
+from src.reports.chunking import DateWindow
+from src.testing import PROFILES, FakeIikoServer, FakeServerConfig
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль q (0..100) по ближайшему рангу."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def run_profile(
+    name: str,
+    count: int,
+    rows_per_day: int,
+    max_retries: int,
+) -> Dict[str, Any]:
+    """
+    Выполнить count отчетов против сервера с профилем name.
+
+    Returns:
+        Dict[str, Any]: Метрики профиля
+    """
+    reset_rate_limiters()
+    config = FakeServerConfig(rows_per_day=rows_per_day, faults=PROFILES[name])
+
+    with tempfile.TemporaryDirectory() as tmp, FakeIikoServer(config) as server:
+        settings = server.make_settings(
+            token_storage_path=Path(tmp) / ".token",
+            max_retries=max_retries,
+            # Лимитер не должен маскировать стоимость повторов
+            rate_limit_per_second=1000,
+            rate_limit_burst=100,
+        )
+        latencies: List[float] = []
+        failures = 0
+
+        with IikoSDK(settings) as sdk:
+            started = time.perf_counter()
+            for i in range(count):
+                day = datetime(2026, 1, 1) + timedelta(days=i)
+                window = DateWindow(day, day + timedelta(days=1))
+                t0 = time.perf_counter()
+                try:
+                    sdk.olap.build_report_v2(
+                        "SALES",
+                        group_by_row_fields=["Department", "PayTypes"],
+                        aggregate_fields=["DishDiscountSumInt", "GuestNum"],
+                        filters={"OpenDate.Typed": window.to_filter()},
+                    )
+                except requests.RequestException:
+                    failures += 1
+                latencies.append(time.perf_counter() - t0)
+            elapsed = time.perf_counter() - started
+
+        sent = server.requests["/v2/reports/olap"]
+        return {
+            "profile": name,
+            "reports": count,
+            "failed": failures,
+            "http_requests": sent,
+            "retries": sent - count,
+            "faults": dict(server.faults),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round((count - failures) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(statistics.median(latencies) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        }
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Точка входа `python -m benchmarks.retry_profiles`."""
+    parser = argparse.ArgumentParser(description="Бенчмарк повторов под профилями сбоев")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES))
+    parser.add_argument("--requests", type=int, default=30, help="Отчетов на профиль")
+    parser.add_argument("--rows-per-day", type=int, default=200)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--json", type=Path, default=None, help="Сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(
+        f"{'profile':<12} {'ok/total':>9} {'retries':>8} {'rps':>8} "
+        f"{'p50, ms':>9} {'p99, ms':>9}  faults"
+    )
+    for name in args.profiles:
+        result = run_profile(name, args.requests, args.rows_per_day, args.max_retries)
+        results.append(result)
+        print(
+            f"{name:<12} {result['reports'] - result['failed']:>4}/{result['reports']:<4} "
+            f"{result['retries']:>8} {result['throughput_rps']:>8} "
+            f"{result['p50_ms']:>9} {result['p99_ms']:>9}  {result['faults']}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Набор бенчмарков SDK с проверкой регрессий.
+
+Команды:
+    python -m benchmarks.suite run --out results.json [--cases ...] [--rows N]
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.15]
+
+run измеряет сценарии из benchmarks.cases и сохраняет JSON. compare
+сравнивает два прогона (по умолчанию по минимальному времени — оно меньше
+всего зависит от шума машины) и завершается с кодом 1, если какой-либо
+сценарий замедлился больше чем на threshold (доля).
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import cases
+from .cases import CASES
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.15
+METRICS = ("min_s", "median_s")
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(name: str, repeat: int) -> Dict[str, Any]:
+    """
+    Измерить сценарий.
+
+    Число вызовов на замер подбирается автоматически (timeit.autorange,
+    не менее 0.2 с на замер); сохраняются медиана и минимум времени
+    одного вызова по repeat замерам.
+
+    Args:
+        name: Имя сценария из CASES
+        repeat: Количество замеров
+
+    Returns:
+        Dict[str, Any]: Метрики сценария
+    """
+    with ExitStack() as stack:
+        func = CASES[name](stack)
+        func()  # прогрев
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(names: List[str], repeat: int) -> Dict[str, Any]:
+    """
+    Выполнить сценарии.
+
+    Returns:
+        Dict[str, Any]: Результаты в формате файла результатов
+    """
+    results = {}
+    for name in names:
+        results[name] = measure(name, repeat)
+        print(
+            f"{name:<22} {results[name]['median_s'] * 1000:>10.3f} ms "
+            f"(min {results[name]['min_s'] * 1000:.3f} ms, n={results[name]['number']})"
+        )
+
+    return {
+        "format": RESULTS_FORMAT_VERSION,
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git": _git_revision(),
+            "synthetic_rows": cases.SYNTHETIC_ROWS,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    metric: str = "min_s",
+) -> bool:
+    """
+    Сравнить два прогона.
+
+    Args:
+        baseline: Базовые результаты
+        current: Новые результаты
+        threshold: Допустимое замедление (0.15 — на 15%)
+        metric: Сравниваемая метрика: "min_s" или "median_s"
+
+    Returns:
+        bool: True если регрессий нет
+    """
+    ok = True
+    rows = (baseline["meta"].get("synthetic_rows"), current["meta"].get("synthetic_rows"))
+    if rows[0] != rows[1]:
+        print(f"Внимание: прогоны с разным --rows ({rows[0]} и {rows[1]})")
+    print(f"{'case':<22} {'baseline, ms':>13} {'current, ms':>12} {'change':>8}")
+    for name, base in baseline["results"].items():
+        cur = current["results"].get(name)
+        if cur is None:
+            print(f"{name:<22} {base[metric] * 1000:>13.3f} {'—':>12} {'пропущен':>8}")
+            continue
+
+        ratio = cur[metric] / base[metric] if base[metric] else 1.0
+        regressed = ratio > 1 + threshold
+        ok = ok and not regressed
+        print(
+            f"{name:<22} {base[metric] * 1000:>13.3f} {cur[metric] * 1000:>12.3f} "
+            f"{(ratio - 1) * 100:>+7.1f}%{'  РЕГРЕССИЯ' if regressed else ''}"
+        )
+    return ok
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("format") != RESULTS_FORMAT_VERSION:
+        raise SystemExit(f"{path}: неподдерживаемый формат результатов")
+    return data
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Точка входа `python -m benchmarks.suite`."""
+    parser = argparse.ArgumentParser(description="Бенчмарки горячих путей SDK")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Выполнить бенчмарки")
+    run_parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    run_parser.add_argument("--repeat", type=int, default=5, help="Замеров на сценарий")
+    run_parser.add_argument("--out", type=Path, default=None, help="Файл результатов (JSON)")
+    run_parser.add_argument(
+        "--rows", type=int, default=cases.SYNTHETIC_ROWS,
+        help="Строк в сценариях *_synthetic (например 10000, 1000000, 10000000)",
+    )
+
+    compare_parser = commands.add_parser("compare", help="Сравнить два прогона")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Допустимое замедление (доля, по умолчанию 0.15)",
+    )
+    compare_parser.add_argument("--metric", choices=METRICS, default="min_s")
+
+    args = parser.parse_args(argv)
+    # Логи SDK искажают замеры
+    logging.disable(logging.INFO)
+
+    if args.command == "run":
+        cases.SYNTHETIC_ROWS = args.rows
+        data = run(args.cases, args.repeat)
+        if args.out:
+            args.out.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        return 0
+
+    ok = compare(_load(args.baseline), _load(args.current), args.threshold, args.metric)
+    if not ok:
+        print(f"Есть регрессии больше {args.threshold:.0%}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
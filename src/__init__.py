@@ -5,12 +5,17 @@ iiko API SDK - Python клиент для работы с API iiko.
 __version__ = "0.1.0"
 
 from .iiko_sdk import IikoSDK
+from .async_iiko_sdk import AsyncIikoSDK
+from .token_pool import TokenPool, Credentials
 from .config import Settings, get_settings
 from .auth import AuthManager
 from .client import HTTPClient
 
 __all__ = [
     "IikoSDK",
+    "AsyncIikoSDK",
+    "TokenPool",
+    "Credentials",
     "Settings",
     "get_settings",
     "AuthManager",
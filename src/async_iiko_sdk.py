@@ -0,0 +1,207 @@
+"""
+Асинхронный SDK клиент для работы с iiko API.
+
+Требует опциональную зависимость httpx (`uv sync --extra async`).
+"""
+
+import logging
+from typing import Optional, Dict, Any
+
+from .config import Settings, get_settings
+from .client.async_http_client import AsyncHTTPClient, _import_httpx
+from .auth.async_auth_manager import AsyncAuthManager
+from .auth.auth_manager import is_token_rejected
+from .reports.async_olap import AsyncOLAPReports
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncIikoSDK:
+    """
+    Асинхронный Python SDK для работы с iiko API.
+
+    Повторяет интерфейс IikoSDK на asyncio. Запросы одного экземпляра
+    выполняются строго последовательно, поэтому в одном event loop можно
+    параллельно работать с несколькими серверами iiko — по экземпляру
+    на сервер.
+
+    Пример использования:
+        >>> from src import AsyncIikoSDK
+        >>>
+        >>> async with AsyncIikoSDK() as sdk:
+        ...     columns = await sdk.olap.get_columns("SALES")
+        ...     report = await sdk.olap.build_report_v2(
+        ...         "SALES",
+        ...         group_by_row_fields=["Department"],
+        ...         aggregate_fields=["DishDiscountSumInt"],
+        ...     )
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Инициализация SDK клиента.
+
+        Args:
+            settings: Экземпляр настроек. Если None, будет создан автоматически.
+        """
+        self.settings = settings or get_settings()
+        self.http_client = AsyncHTTPClient(self.settings)
+        self.auth = AsyncAuthManager(self.settings, self.http_client)
+        self._olap: Optional[AsyncOLAPReports] = None
+
+        logger.info("Асинхронный iiko SDK инициализирован")
+
+    @property
+    def is_authenticated(self) -> bool:
+        """
+        Проверить, авторизован ли клиент.
+
+        Returns:
+            bool: True если есть токен
+        """
+        return self.auth.is_authenticated
+
+    @property
+    def token(self) -> Optional[str]:
+        """
+        Получить текущий токен авторизации.
+
+        Returns:
+            Optional[str]: Токен или None
+        """
+        return self.auth.token
+
+    @property
+    def olap(self) -> AsyncOLAPReports:
+        """
+        Получить интерфейс для работы с OLAP-отчетами.
+
+        Returns:
+            AsyncOLAPReports: Интерфейс OLAP-отчетов
+        """
+        if self._olap is None:
+            self._olap = AsyncOLAPReports(self)
+        return self._olap
+
+    async def authenticate(self, force: bool = False) -> str:
+        """
+        Выполнить авторизацию.
+
+        Args:
+            force: Принудительная авторизация (получить новый токен)
+
+        Returns:
+            str: Токен авторизации
+        """
+        return await self.auth.authenticate(force=force)
+
+    async def logout(self) -> None:
+        """
+        Выполнить выход и освободить лицензию.
+        """
+        await self.auth.logout()
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Any] = None,
+        authenticated: bool = True,
+        **kwargs
+    ):
+        """
+        Выполнить запрос к iiko API.
+
+        Args:
+            method: HTTP метод (GET, POST, PUT, DELETE)
+            endpoint: Конечная точка API (например, "/nomenclature")
+            params: Query параметры
+            data: Данные для отправки
+            authenticated: Требуется ли авторизация (по умолчанию True)
+            **kwargs: Дополнительные параметры
+
+        Returns:
+            httpx.Response: Ответ от сервера
+
+        Raises:
+            httpx.HTTPError: Ошибка при выполнении запроса
+
+        Note:
+            При отказе по токену (401, либо 403 с упоминанием токена)
+            выполняется повторная авторизация и запрос повторяется один раз.
+        """
+        httpx = _import_httpx()
+        url = f"{self.settings.rms_base_url}/{endpoint.lstrip('/')}"
+
+        token: Optional[str] = None
+        if authenticated:
+            token = await self.auth.get_token()
+            self.auth.touch()
+            params = dict(params or {})
+            params["key"] = token
+
+        try:
+            return await self.http_client.request(
+                method=method,
+                url=url,
+                params=params,
+                data=data,
+                **kwargs
+            )
+        except httpx.HTTPStatusError as e:
+            response = e.response
+            if not authenticated or not is_token_rejected(
+                response.status_code, response.text
+            ):
+                raise
+
+        # Токен отклонен: авторизуемся заново и повторяем запрос один раз
+        params["key"] = await self.auth.reauthenticate(stale_token=token)
+        return await self.http_client.request(
+            method=method,
+            url=url,
+            params=params,
+            data=data,
+            **kwargs
+        )
+
+    async def get(self, endpoint: str, **kwargs):
+        """Выполнить GET запрос."""
+        return await self.request("GET", endpoint, **kwargs)
+
+    async def post(self, endpoint: str, data: Optional[Any] = None, **kwargs):
+        """Выполнить POST запрос."""
+        return await self.request("POST", endpoint, data=data, **kwargs)
+
+    async def put(self, endpoint: str, data: Optional[str] = None, **kwargs):
+        """Выполнить PUT запрос (XML данные)."""
+        return await self.request("PUT", endpoint, data=data, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs):
+        """Выполнить DELETE запрос."""
+        return await self.request("DELETE", endpoint, **kwargs)
+
+    async def aclose(self) -> None:
+        """Закрыть все соединения."""
+        await self.http_client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.authenticate()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        try:
+            if self.settings.session_mode == "keep_alive":
+                self.auth.detach()
+            else:
+                await self.logout()
+        finally:
+            await self.aclose()
+
+    def __repr__(self) -> str:
+        """String representation."""
+        auth_status = "authenticated" if self.is_authenticated else "not authenticated"
+        return f"<AsyncIikoSDK({auth_status})>"
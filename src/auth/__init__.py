@@ -1,5 +1,6 @@
 """Модуль авторизации iiko API."""
 
 from .auth_manager import AuthManager
+from .async_auth_manager import AsyncAuthManager
 
-__all__ = ["AuthManager"]
+__all__ = ["AuthManager", "AsyncAuthManager"]
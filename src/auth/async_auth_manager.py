@@ -0,0 +1,381 @@
+"""
+Асинхронный модуль управления авторизацией в iiko API.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from ..client.async_http_client import AsyncHTTPClient, _import_httpx
+from ..config import Settings
+from .auth_manager import TOUCH_INTERVAL, TokenStorage
+from .shared_token import SharedTokenStorage
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAuthManager:
+    """
+    Асинхронный менеджер авторизации для iiko API.
+
+    Повторяет AuthManager поверх AsyncHTTPClient. Токен хранится
+    в том же файле (TokenStorage), поэтому синхронный и асинхронный
+    клиенты могут переиспользовать его между запусками. С token_shared
+    токен берется в аренду через SharedTokenStorage, как у AuthManager,
+    и делится с синхронными клиентами хоста.
+
+    ВАЖНО:
+    При авторизации занимается один слот лицензии.
+    Одновременные вызовы authenticate() из разных задач сериализуются,
+    и токен запрашивается только один раз.
+
+    Токен обновляется незадолго до истечения (token_ttl_seconds) при
+    очередном запросе; фонового обновления у асинхронного клиента нет.
+    """
+
+    def __init__(self, settings: Settings, http_client: AsyncHTTPClient):
+        """
+        Инициализация менеджера авторизации.
+
+        Args:
+            settings: Экземпляр настроек приложения
+            http_client: Асинхронный HTTP клиент
+        """
+        self.settings = settings
+        self.http_client = http_client
+        self.storage = TokenStorage(settings.token_storage_path)
+        self.shared_storage: SharedTokenStorage | None = None
+        if settings.token_shared:
+            self.shared_storage = SharedTokenStorage(settings.token_storage_path)
+        self._token: str | None = None
+        self._token_created_at: datetime | None = None
+        self._lock = asyncio.Lock()
+        self._last_touch = 0.0
+
+        # Попытка загрузить существующий токен. Общий токен берется
+        # только вместе с арендой, при первой авторизации
+        if self.shared_storage is None:
+            saved_token, created_at = self.storage.load_with_created_at()
+            if saved_token:
+                self._token = saved_token
+                self._token_created_at = created_at or datetime.now()
+                logger.info("Загружен сохраненный токен")
+
+    @property
+    def token(self) -> str | None:
+        """
+        Получить текущий токен.
+
+        Returns:
+            Optional[str]: Текущий токен или None
+        """
+        return self._token
+
+    @property
+    def is_authenticated(self) -> bool:
+        """
+        Проверить, авторизован ли пользователь.
+
+        Returns:
+            bool: True если есть токен, иначе False
+        """
+        return self._token is not None
+
+    @property
+    def token_expires_at(self) -> datetime | None:
+        """
+        Ожидаемое время истечения текущего токена.
+
+        Returns:
+            Optional[datetime]: Время истечения или None, если токена нет
+        """
+        if self._token is None or self._token_created_at is None:
+            return None
+        return self._token_created_at + timedelta(seconds=self.settings.token_ttl_seconds)
+
+    def needs_refresh(self) -> bool:
+        """
+        Проверить, подходит ли токен к концу срока жизни.
+
+        Returns:
+            bool: True если токен истекает в пределах token_refresh_margin_seconds
+        """
+        expires_at = self.token_expires_at
+        if expires_at is None:
+            return False
+        margin = timedelta(seconds=self.settings.token_refresh_margin_seconds)
+        return datetime.now() >= expires_at - margin
+
+    async def authenticate(self, force: bool = False) -> str:
+        """
+        Выполнить авторизацию и получить токен.
+
+        ВАЖНО: При авторизации занимается один слот лицензии!
+
+        Args:
+            force: Принудительная авторизация (получить новый токен)
+
+        Returns:
+            str: Токен авторизации
+
+        Raises:
+            httpx.HTTPError: Ошибка при авторизации
+        """
+        async with self._lock:
+            return await self._authenticate(force)
+
+    async def _authenticate(
+        self,
+        force: bool,
+        stale_token: str | None = None,
+        release_stale: bool = False,
+    ) -> str:
+        """
+        Выполнить авторизацию (под блокировкой менеджера).
+
+        Args:
+            force: Получить новый токен, даже если он уже есть
+            stale_token: Заменяемый токен (для общего хранилища)
+            release_stale: Освободить stale_token перед авторизацией
+                (замена по сроку жизни, токен еще действителен)
+        """
+        if self._token and not force:
+            logger.info("Использую существующий токен")
+            return self._token
+
+        if self.shared_storage is not None:
+            token, created_at = await self.shared_storage.acquire_async(
+                self._request_token,
+                stale_token=stale_token,
+                release_token=self._release_token if release_stale else None,
+            )
+        else:
+            token = await self._request_token()
+            created_at = datetime.now()
+            self.storage.save(token, created_at)
+
+        self._token = token
+        self._token_created_at = created_at or datetime.now()
+        return token
+
+    async def _request_token(self) -> str:
+        """Запросить новый токен у сервера (занимает слот лицензии)."""
+        httpx = _import_httpx()
+
+        logger.info("Выполняю авторизацию в iiko API...")
+
+        try:
+            response = await self.http_client.post(
+                url=self.settings.auth_url,
+                params={
+                    "login": self.settings.rms_login,
+                    "pass": self.settings.rms_password,
+                },
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Ошибка авторизации: {e}")
+            raise
+
+        token = response.text.strip()
+
+        if not token:
+            raise ValueError("Получен пустой токен от сервера")
+
+        logger.info("✓ Авторизация успешна")
+        logger.debug(f"Токен: {token[:20]}...")
+
+        return token
+
+    async def logout(self) -> None:
+        """
+        Выполнить выход и освободить лицензию.
+        """
+        async with self._lock:
+            if not self._token:
+                logger.info("Токен отсутствует, выход не требуется")
+                return
+
+            if self.shared_storage is not None:
+                # Лицензия освобождается только последним арендатором
+                try:
+                    await self.shared_storage.release_async(self._release_token)
+                finally:
+                    self._token = None
+                    self._token_created_at = None
+                return
+
+            try:
+                await self._release_token(self._token)
+            finally:
+                # Очищаем токен в любом случае
+                self._token = None
+                self._token_created_at = None
+                self.storage.clear()
+
+    async def _release_token(self, token: str) -> None:
+        """Освободить лицензию, занятую токеном (ошибки только логируются)."""
+        httpx = _import_httpx()
+
+        logger.info("Выполняю выход из iiko API...")
+
+        try:
+            await self.http_client.get(url=self.settings.logout_url, params={"key": token})
+            logger.info("✓ Выход выполнен успешно")
+
+        except httpx.HTTPError as e:
+            logger.warning(f"Ошибка при выходе: {e}")
+
+    async def get_token(self) -> str:
+        """
+        Получить токен авторизации, выполнив авторизацию при необходимости.
+
+        Если токен истекает в пределах token_refresh_margin_seconds,
+        заранее получит новый.
+
+        Returns:
+            str: Токен авторизации
+        """
+        if not self._token:
+            return await self.authenticate()
+        if self.needs_refresh():
+            return await self.refresh_token()
+        return self._token
+
+    async def refresh_token(self) -> str:
+        """
+        Заменить токен новым до истечения срока жизни.
+
+        Старый токен освобождается до авторизации, чтобы при единственной
+        лицензии новый токен мог занять освободившийся слот.
+
+        Returns:
+            str: Новый токен авторизации
+        """
+        async with self._lock:
+            old_token = self._token
+            if old_token and not self.needs_refresh():
+                # Токен уже обновила другая задача
+                return old_token
+
+            logger.info("Срок жизни токена подходит к концу, обновляю токен...")
+            if self.shared_storage is not None:
+                # Токен мог уже обновить другой процесс
+                return await self._authenticate(
+                    force=True, stale_token=old_token, release_stale=True
+                )
+
+            if old_token:
+                await self._release_token(old_token)
+            self._token = None
+            self._token_created_at = None
+            return await self._authenticate(force=True)
+
+    async def reauthenticate(self, stale_token: str | None) -> str:
+        """
+        Заменить токен, отклоненный сервером.
+
+        Отклоненный токен уже недействителен, поэтому logout не выполняется.
+        Если другая задача уже заменила токен, возвращается новый токен.
+
+        Args:
+            stale_token: Токен, с которым запрос получил отказ
+
+        Returns:
+            str: Новый токен авторизации
+        """
+        async with self._lock:
+            if self._token and self._token != stale_token:
+                return self._token
+
+            logger.info("Токен отклонен сервером, выполняю повторную авторизацию...")
+            if self.shared_storage is not None:
+                return await self._authenticate(force=True, stale_token=stale_token)
+
+            self._token = None
+            self._token_created_at = None
+            self.storage.clear()
+            return await self._authenticate(force=True)
+
+    def touch(self, force: bool = False) -> None:
+        """
+        Отметить использование токена в режиме keep-alive (см. AuthManager.touch).
+
+        Args:
+            force: Записать отметку без учета интервала
+        """
+        if self.settings.session_mode != "keep_alive" or not self._token:
+            return
+
+        now = time.monotonic()
+        if not force and now - self._last_touch < TOUCH_INTERVAL:
+            return
+        self._last_touch = now
+
+        if self.shared_storage is not None:
+            self.shared_storage.touch()
+        else:
+            self.storage.touch()
+
+    def detach(self) -> None:
+        """
+        Завершить работу, не освобождая лицензию (режим keep-alive).
+
+        Токен остается в файле для следующего запуска; аренда общего
+        токена (token_shared) завершается.
+        """
+        if not self._token:
+            return
+
+        self.touch(force=True)
+        if self.shared_storage is not None:
+            self.shared_storage.release(None)
+        self._token = None
+        self._token_created_at = None
+        logger.info("Токен сохранен для следующего запуска (keep-alive)")
+
+    async def validate_token(self) -> bool:
+        """
+        Проверить валидность текущего токена.
+
+        Returns:
+            bool: True если токен валиден, иначе False
+        """
+        httpx = _import_httpx()
+
+        if not self._token:
+            return False
+
+        try:
+            response = await self.http_client.get(
+                url=f"{self.settings.rms_base_url}/corporation/organizations",
+                params={"key": self._token},
+            )
+            return response.status_code == 200
+
+        except httpx.HTTPError:
+            logger.debug("Токен невалиден")
+            return False
+
+    async def refresh_if_needed(self) -> str:
+        """
+        Обновить токен если он невалиден.
+
+        Returns:
+            str: Валидный токен
+        """
+        if not await self.validate_token():
+            logger.info("Токен невалиден, выполняю повторную авторизацию...")
+            return await self.reauthenticate(stale_token=self._token)
+
+        return self._token
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.get_token()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.logout()
@@ -4,16 +4,50 @@
 
 import json
 import logging
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import requests
 
 from ..client import HTTPClient
 from ..config import Settings
+from .shared_token import SharedTokenStorage
 
 logger = logging.getLogger(__name__)
 
+# Как часто (в секундах) обновлять отметку last_used_at в режиме keep-alive
+TOUCH_INTERVAL = 30.0
+
+# Признаки в теле ответа 403, по которым отказ считается отказом по токену,
+# а не по правам пользователя. "key"/"ключ" не подходят: ими же сервер
+# называет ключи отчетов и колонок в ошибках доступа
+_TOKEN_ERROR_MARKERS = ("token", "expired", "токен", "авториз")
+
+
+def is_token_rejected(status_code: int, body: str = "") -> bool:
+    """
+    Проверить, что сервер отклонил запрос из-за недействительного токена.
+
+    401 всегда означает проблему с токеном. 403 сервер возвращает и при
+    нехватке прав, поэтому он считается отказом по токену, только если
+    в теле ответа упоминается токен или авторизация.
+
+    Args:
+        status_code: HTTP статус ответа
+        body: Тело ответа
+
+    Returns:
+        bool: True если стоит повторно авторизоваться и повторить запрос
+    """
+    if status_code == 401:
+        return True
+    if status_code == 403:
+        text = body.lower()
+        return any(marker in text for marker in _TOKEN_ERROR_MARKERS)
+    return False
+
 
 class TokenStorage:
     """
@@ -31,16 +65,17 @@ class TokenStorage:
         """
         self.storage_path = storage_path
 
-    def save(self, token: str) -> None:
+    def save(self, token: str, created_at: datetime | None = None) -> None:
         """
         Сохранить токен в файл.
 
         Args:
             token: Токен авторизации
+            created_at: Время получения токена (по умолчанию текущее)
         """
         data = {
             "token": token,
-            "created_at": datetime.now().isoformat(),
+            "created_at": (created_at or datetime.now()).isoformat(),
         }
 
         try:
@@ -57,9 +92,20 @@ class TokenStorage:
         Returns:
             Optional[str]: Токен если найден, иначе None
         """
+        token, _ = self.load_with_created_at()
+        return token
+
+    def load_with_created_at(self) -> tuple[str | None, datetime | None]:
+        """
+        Загрузить токен и время его получения из файла.
+
+        Returns:
+            tuple: (токен, время получения). Время None, если оно не
+                сохранено или не распознано.
+        """
         if not self.storage_path.exists():
             logger.debug("Файл с токеном не найден")
-            return None
+            return None, None
 
         try:
             with open(self.storage_path) as f:
@@ -72,12 +118,46 @@ class TokenStorage:
                 logger.debug(f"Токен загружен из {self.storage_path}")
                 if created_at:
                     logger.debug(f"Токен создан: {created_at}")
-                return token
+                    try:
+                        return token, datetime.fromisoformat(created_at)
+                    except (TypeError, ValueError):
+                        logger.debug("Не удалось разобрать время создания токена")
+                return token, None
 
         except (OSError, json.JSONDecodeError) as e:
             logger.warning(f"Ошибка при загрузке токена: {e}")
 
-        return None
+        return None, None
+
+    def touch(self) -> None:
+        """Отметить использование токена (поле last_used_at)."""
+        try:
+            with open(self.storage_path) as f:
+                data = json.load(f)
+            if not data.get("token"):
+                return
+            data["last_used_at"] = datetime.now().isoformat()
+            with open(self.storage_path, "w") as f:
+                json.dump(data, f, indent=2)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug(f"Не удалось отметить использование токена: {e}")
+
+    def load_last_used_at(self) -> datetime | None:
+        """
+        Загрузить время последнего использования токена.
+
+        Returns:
+            Optional[datetime]: last_used_at, а если его нет — created_at;
+                None если токена нет
+        """
+        try:
+            with open(self.storage_path) as f:
+                data = json.load(f)
+            if not data.get("token"):
+                return None
+            return datetime.fromisoformat(data.get("last_used_at") or data["created_at"])
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
 
     def clear(self) -> None:
         """Удалить сохраненный токен."""
@@ -97,6 +177,11 @@ class AuthManager:
     - Автоматическое получение и сохранение токена
     - Переиспользование токена между запусками
     - Корректное освобождение лицензии при выходе
+    - Обновление токена незадолго до истечения (token_ttl_seconds),
+      по запросу или в фоновом потоке (token_background_refresh)
+    - Общий для процессов хоста токен с учетом аренды (token_shared)
+    - Режим keep-alive (session_mode): токен переживает запуски, лицензию
+      по простою освобождает session_keeper
 
     ВАЖНО:
     При авторизации занимается один слот лицензии.
@@ -114,17 +199,30 @@ class AuthManager:
         self.settings = settings
         self.http_client = http_client
         self.storage = TokenStorage(settings.token_storage_path)
+        self.shared_storage: SharedTokenStorage | None = None
+        if settings.token_shared:
+            self.shared_storage = SharedTokenStorage(settings.token_storage_path)
         self._token: str | None = None
+        self._token_created_at: datetime | None = None
+        self._lock = threading.RLock()
+        self._refresh_timer: threading.Timer | None = None
+        self._last_touch = 0.0
 
-        # Попытка загрузить существующий токен
-        self._load_saved_token()
+        # Попытка загрузить существующий токен. Общий токен берется
+        # только вместе с арендой, при первой авторизации
+        if self.shared_storage is None:
+            self._load_saved_token()
 
     def _load_saved_token(self) -> None:
         """Загрузить сохраненный токен из хранилища."""
-        saved_token = self.storage.load()
+        saved_token, created_at = self.storage.load_with_created_at()
         if saved_token:
             self._token = saved_token
+            # Токен без времени создания считаем свежим: если он уже
+            # истек, сервер ответит 401 и SDK авторизуется заново
+            self._token_created_at = created_at or datetime.now()
             logger.info("Загружен сохраненный токен")
+            self._schedule_refresh()
 
     @property
     def token(self) -> str | None:
@@ -146,6 +244,35 @@ class AuthManager:
         """
         return self._token is not None
 
+    @property
+    def token_expires_at(self) -> datetime | None:
+        """
+        Ожидаемое время истечения текущего токена.
+
+        Returns:
+            Optional[datetime]: Время истечения или None, если токена нет
+        """
+        if self._token is None or self._token_created_at is None:
+            return None
+        return self._token_created_at + timedelta(seconds=self.settings.token_ttl_seconds)
+
+    def _refresh_due_at(self) -> datetime | None:
+        """Время, после которого токен пора обновить."""
+        expires_at = self.token_expires_at
+        if expires_at is None:
+            return None
+        return expires_at - timedelta(seconds=self.settings.token_refresh_margin_seconds)
+
+    def needs_refresh(self) -> bool:
+        """
+        Проверить, подходит ли токен к концу срока жизни.
+
+        Returns:
+            bool: True если токен истекает в пределах token_refresh_margin_seconds
+        """
+        due_at = self._refresh_due_at()
+        return due_at is not None and datetime.now() >= due_at
+
     def authenticate(self, force: bool = False) -> str:
         """
         Выполнить авторизацию и получить токен.
@@ -163,10 +290,46 @@ class AuthManager:
         Raises:
             requests.RequestException: Ошибка при авторизации
         """
+        with self._lock:
+            return self._authenticate(force)
+
+    def _authenticate(
+        self,
+        force: bool,
+        stale_token: str | None = None,
+        release_stale: bool = False,
+    ) -> str:
+        """
+        Выполнить авторизацию (под блокировкой менеджера).
+
+        Args:
+            force: Получить новый токен, даже если он уже есть
+            stale_token: Заменяемый токен (для общего хранилища)
+            release_stale: Освободить stale_token перед авторизацией
+                (замена по сроку жизни, токен еще действителен)
+        """
         if self._token and not force:
             logger.info("Использую существующий токен")
             return self._token
 
+        if self.shared_storage is not None:
+            token, created_at = self.shared_storage.acquire(
+                self._request_token,
+                stale_token=stale_token,
+                release_token=self._release_token if release_stale else None,
+            )
+        else:
+            token = self._request_token()
+            created_at = datetime.now()
+            self.storage.save(token, created_at)
+
+        self._token = token
+        self._token_created_at = created_at or datetime.now()
+        self._schedule_refresh()
+        return token
+
+    def _request_token(self) -> str:
+        """Запросить новый токен у сервера (занимает слот лицензии)."""
         logger.info("Выполняю авторизацию в iiko API...")
 
         try:
@@ -184,9 +347,6 @@ class AuthManager:
             if not token:
                 raise ValueError("Получен пустой токен от сервера")
 
-            self._token = token
-            self.storage.save(token)
-
             logger.info("✓ Авторизация успешна")
             logger.debug(f"Токен: {token[:20]}...")
 
@@ -203,32 +363,69 @@ class AuthManager:
         Рекомендуется вызывать этот метод в конце работы,
         чтобы освободить слот лицензии для других пользователей.
         """
-        if not self._token:
-            logger.info("Токен отсутствует, выход не требуется")
-            return
+        self._cancel_refresh()
+
+        with self._lock:
+            if not self._token:
+                logger.info("Токен отсутствует, выход не требуется")
+                return
+
+            if self.shared_storage is not None:
+                # Лицензия освобождается только последним арендатором
+                try:
+                    self.shared_storage.release(self._release_token)
+                finally:
+                    self._token = None
+                    self._token_created_at = None
+                return
 
+            try:
+                self._release_token(self._token)
+            finally:
+                # Очищаем токен в любом случае
+                self._token = None
+                self._token_created_at = None
+                self.storage.clear()
+
+    def detach(self) -> None:
+        """
+        Завершить работу, не освобождая лицензию (режим keep-alive).
+
+        Токен остается в файле для следующего запуска; аренда общего
+        токена (token_shared) завершается.
+        """
+        self._cancel_refresh()
+
+        with self._lock:
+            if not self._token:
+                return
+
+            self.touch(force=True)
+            if self.shared_storage is not None:
+                self.shared_storage.release(None)
+            self._token = None
+            self._token_created_at = None
+            logger.info("Токен сохранен для следующего запуска (keep-alive)")
+
+    def _release_token(self, token: str) -> None:
+        """Освободить лицензию, занятую токеном (ошибки только логируются)."""
         logger.info("Выполняю выход из iiko API...")
 
         try:
-            self.http_client.get(
-                url=self.settings.logout_url, params={"key": self._token}
-            )
+            self.http_client.get(url=self.settings.logout_url, params={"key": token})
             logger.info("✓ Выход выполнен успешно")
 
         except requests.RequestException as e:
             logger.warning(f"Ошибка при выходе: {e}")
 
-        finally:
-            # Очищаем токен в любом случае
-            self._token = None
-            self.storage.clear()
-
     def get_token(self) -> str:
         """
         Получить токен авторизации.
 
         Если токен уже есть, вернет его.
         Если токена нет, выполнит авторизацию.
+        Если токен истекает в пределах token_refresh_margin_seconds,
+        заранее получит новый.
 
         Returns:
             str: Токен авторизации
@@ -238,8 +435,128 @@ class AuthManager:
         """
         if not self._token:
             return self.authenticate()
+        if self.needs_refresh():
+            return self.refresh_token()
         return self._token
 
+    def refresh_token(self) -> str:
+        """
+        Заменить токен новым до истечения срока жизни.
+
+        Старый токен освобождается до авторизации, чтобы при единственной
+        лицензии новый токен мог занять освободившийся слот.
+
+        Returns:
+            str: Новый токен авторизации
+
+        Raises:
+            requests.RequestException: Ошибка при авторизации
+        """
+        with self._lock:
+            old_token = self._token
+            if old_token and not self.needs_refresh():
+                # Токен уже обновил другой поток
+                return old_token
+
+            logger.info("Срок жизни токена подходит к концу, обновляю токен...")
+            if self.shared_storage is not None:
+                # Токен мог уже обновить другой процесс
+                return self._authenticate(
+                    force=True, stale_token=old_token, release_stale=True
+                )
+
+            if old_token:
+                self._release_token(old_token)
+            self._token = None
+            self._token_created_at = None
+            return self._authenticate(force=True)
+
+    def _schedule_refresh(self) -> None:
+        """Запланировать фоновое обновление токена (token_background_refresh)."""
+        if not self.settings.token_background_refresh:
+            return
+
+        due_at = self._refresh_due_at()
+        if due_at is None:
+            return
+
+        self._cancel_refresh()
+        delay = max(0.0, (due_at - datetime.now()).total_seconds())
+        timer = threading.Timer(delay, self._background_refresh)
+        timer.daemon = True
+        self._refresh_timer = timer
+        timer.start()
+        logger.debug(f"Фоновое обновление токена через {delay:.0f} с")
+
+    def _cancel_refresh(self) -> None:
+        """Отменить запланированное фоновое обновление токена."""
+        timer, self._refresh_timer = self._refresh_timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+
+    def _background_refresh(self) -> None:
+        """Обновить токен из фонового потока."""
+        try:
+            if self._token and self.needs_refresh():
+                self.refresh_token()
+        except (requests.RequestException, ValueError) as e:
+            # Следующий запрос получит 401 и авторизуется заново
+            logger.warning(f"Не удалось обновить токен в фоне: {e}")
+
+    def reauthenticate(self, stale_token: str | None) -> str:
+        """
+        Заменить токен, отклоненный сервером.
+
+        Отклоненный токен уже недействителен, поэтому logout не выполняется.
+        Если другой поток уже заменил токен, возвращается новый токен
+        без повторной авторизации.
+
+        Args:
+            stale_token: Токен, с которым запрос получил отказ
+
+        Returns:
+            str: Новый токен авторизации
+
+        Raises:
+            requests.RequestException: Ошибка при авторизации
+        """
+        with self._lock:
+            if self._token and self._token != stale_token:
+                return self._token
+
+            logger.info("Токен отклонен сервером, выполняю повторную авторизацию...")
+            if self.shared_storage is not None:
+                return self._authenticate(force=True, stale_token=stale_token)
+
+            self._token = None
+            self._token_created_at = None
+            self.storage.clear()
+            return self._authenticate(force=True)
+
+    def touch(self, force: bool = False) -> None:
+        """
+        Отметить использование токена в режиме keep-alive.
+
+        Время последнего использования читает session_keeper, чтобы
+        освободить лицензию после простоя. Запись в файл выполняется
+        не чаще раза в TOUCH_INTERVAL секунд.
+
+        Args:
+            force: Записать отметку без учета интервала
+        """
+        if self.settings.session_mode != "keep_alive" or not self._token:
+            return
+
+        now = time.monotonic()
+        if not force and now - self._last_touch < TOUCH_INTERVAL:
+            return
+        self._last_touch = now
+
+        if self.shared_storage is not None:
+            self.shared_storage.touch()
+        else:
+            self.storage.touch()
+
     def validate_token(self) -> bool:
         """
         Проверить валидность текущего токена.
@@ -277,9 +594,7 @@ class AuthManager:
         """
         if not self.validate_token():
             logger.info("Токен невалиден, выполняю повторную авторизацию...")
-            self._token = None
-            self.storage.clear()
-            return self.authenticate()
+            return self.reauthenticate(stale_token=self._token)
 
         return self._token
 
@@ -0,0 +1,158 @@
+"""
+Хранитель сессии для режима keep-alive.
+
+В режиме session_mode="keep_alive" SDK не выполняет logout при выходе,
+и токен переживает запуски скриптов. Хранитель — небольшой фоновый
+процесс, который следит за отметкой last_used_at в файле токена и
+освобождает лицензию, если токен простаивал дольше
+session_idle_timeout_seconds. При остановке (SIGTERM, SIGINT) хранитель
+освобождает лицензию сразу.
+
+Запуск:
+    python -m src.auth.session_keeper
+"""
+
+import argparse
+import logging
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+import requests
+
+from ..client import HTTPClient
+from ..config import Settings, get_settings
+from .auth_manager import TokenStorage
+from .shared_token import SharedTokenStorage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 30.0
+
+
+class SessionKeeper:
+    """
+    Освобождает лицензию после простоя токена и при остановке.
+
+    Пример использования:
+        >>> keeper = SessionKeeper()
+        >>> keeper.run()  # до SIGTERM/SIGINT
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Инициализация хранителя.
+
+        Args:
+            settings: Экземпляр настроек. Если None, будет создан автоматически.
+            poll_interval: Как часто проверять простой (секунды)
+        """
+        self.settings = settings or get_settings()
+        self.poll_interval = poll_interval
+        self.http_client = HTTPClient(self.settings)
+        self.storage = TokenStorage(self.settings.token_storage_path)
+        self.shared_storage: Optional[SharedTokenStorage] = None
+        if self.settings.token_shared:
+            self.shared_storage = SharedTokenStorage(self.settings.token_storage_path)
+        self._stop = threading.Event()
+
+    def _release_token(self, token: str) -> None:
+        """Выполнить logout (ошибки только логируются)."""
+        try:
+            self.http_client.get(url=self.settings.logout_url, params={"key": token})
+            logger.info("✓ Лицензия освобождена")
+        except requests.RequestException as e:
+            logger.warning(f"Ошибка при выходе: {e}")
+
+    def check(self, idle_timeout: Optional[float] = None) -> bool:
+        """
+        Освободить лицензию, если токен простаивает.
+
+        Args:
+            idle_timeout: Допустимый простой в секундах
+                (по умолчанию session_idle_timeout_seconds; 0 — освободить сразу)
+
+        Returns:
+            bool: True если выполнен logout
+        """
+        if idle_timeout is None:
+            idle_timeout = self.settings.session_idle_timeout_seconds
+        idle_before = datetime.now() - timedelta(seconds=idle_timeout)
+
+        if self.shared_storage is not None:
+            # Токен, арендованный работающими процессами, не трогаем
+            released = self.shared_storage.release_if_idle(idle_before, self._release_token)
+            if released:
+                logger.info("Общий токен простаивал, лицензия освобождена")
+            return released
+
+        token = self.storage.load()
+        if not token:
+            return False
+
+        last_used = self.storage.load_last_used_at()
+        if last_used is not None and last_used >= idle_before:
+            return False
+
+        logger.info(f"Токен простаивает с {last_used}, освобождаю лицензию")
+        try:
+            self._release_token(token)
+        finally:
+            self.storage.clear()
+        return True
+
+    def stop(self, *_args) -> None:
+        """Остановить цикл run() (можно вызывать из обработчика сигнала)."""
+        self._stop.set()
+
+    def run(self) -> None:
+        """
+        Следить за простоем до остановки.
+
+        SIGTERM и SIGINT останавливают цикл; перед выходом лицензия
+        освобождается независимо от времени простоя.
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        logger.info(
+            f"Хранитель сессии запущен: простой до "
+            f"{self.settings.session_idle_timeout_seconds} с, "
+            f"проверка каждые {self.poll_interval:.0f} с"
+        )
+        try:
+            while not self._stop.is_set():
+                self.check()
+                self._stop.wait(self.poll_interval)
+        finally:
+            logger.info("Хранитель сессии останавливается, освобождаю лицензию")
+            self.check(idle_timeout=0)
+            self.http_client.close()
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Точка входа `python -m src.auth.session_keeper`."""
+    parser = argparse.ArgumentParser(description="Хранитель сессии iiko API (keep-alive)")
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Интервал проверки простоя в секундах",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    SessionKeeper(poll_interval=args.poll_interval).run()
+
+
+if __name__ == "__main__":
+    main()
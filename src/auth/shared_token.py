@@ -0,0 +1,333 @@
+"""
+Общий для процессов хоста токен с учетом аренды.
+
+Обычный TokenStorage пишет файл без блокировки: два процесса, стартовавшие
+одновременно, оба не находят токен, оба вызывают /auth и занимают два слота
+лицензии, а первый logout() обрывает работу второго. SharedTokenStorage
+хранит токен в файле под межпроцессной блокировкой вместе со списком
+арендаторов: авторизация выполняется под блокировкой (остальные процессы
+ждут и получают готовый токен), а logout — только когда уходит последний
+арендатор.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..utils.filelock import FileLock
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Проверить, что процесс с таким PID существует."""
+    if pid == os.getpid():
+        return True
+    if sys.platform == "win32":
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class SharedTokenStorage:
+    """
+    Файл токена с блокировкой и счетчиком аренды.
+
+    Формат файла совместим с TokenStorage (поля token и created_at),
+    дополнительно хранится список аренд {"pid", "lease"}. Аренды
+    завершившихся процессов удаляются при каждом обращении.
+
+    Если последний арендатор упал, не вызвав release(), токен остается
+    в файле и переиспользуется следующим процессом.
+
+    Методы acquire_async() и release_async() — то же для асинхронного
+    клиента: блокировка захватывается в отдельном потоке, авторизация
+    и logout выполняются корутинами.
+    """
+
+    def __init__(self, storage_path: Path):
+        """
+        Инициализация хранилища.
+
+        Args:
+            storage_path: Путь к общему файлу токена
+        """
+        self.storage_path = Path(storage_path)
+        self._lock = FileLock(self.storage_path)
+        self.lease_id = uuid.uuid4().hex
+
+    def _read_state(self) -> Dict[str, Any]:
+        """Прочитать состояние (под блокировкой) и убрать мертвые аренды."""
+        try:
+            state = json.loads(self._lock.read() or b"{}")
+        except ValueError:
+            logger.warning(f"Поврежденный файл токена {self.storage_path}, сбрасываю")
+            state = {}
+        if not isinstance(state, dict):
+            state = {}
+
+        leases = [
+            lease for lease in state.get("leases", [])
+            if isinstance(lease, dict) and _pid_alive(int(lease.get("pid", 0)))
+        ]
+        state["leases"] = leases
+        return state
+
+    def _write_state(self, state: Dict[str, Any]) -> None:
+        """Записать состояние (под блокировкой)."""
+        self._lock.write(json.dumps(state, indent=2).encode("utf-8"))
+
+    def _has_lease(self, state: Dict[str, Any]) -> bool:
+        return any(lease.get("lease") == self.lease_id for lease in state["leases"])
+
+    @staticmethod
+    def _created_at(state: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(state["created_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def acquire(
+        self,
+        request_token: Callable[[], str],
+        stale_token: Optional[str] = None,
+        release_token: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[str, Optional[datetime]]:
+        """
+        Получить общий токен и зарегистрировать аренду.
+
+        Если в файле есть токен (и это не stale_token), он переиспользуется
+        без авторизации. Иначе request_token() вызывается под блокировкой,
+        поэтому одновременно стартовавшие процессы авторизуются один раз.
+
+        Args:
+            request_token: Функция авторизации, возвращающая новый токен
+            stale_token: Токен, который нужно заменить (отклонен сервером
+                или истекает)
+            release_token: Функция logout для stale_token. Вызывается перед
+                авторизацией, если токен заменяется по сроку жизни и еще
+                действителен.
+
+        Returns:
+            tuple: (токен, время его получения)
+
+        Raises:
+            requests.RequestException: Ошибка при авторизации
+        """
+        with self._lock:
+            state = self._read_state()
+            token = state.get("token")
+
+            if not token or token == stale_token:
+                if token and release_token is not None:
+                    release_token(token)
+                token = request_token()
+                self._set_token(state, token)
+            else:
+                logger.info("Использую общий токен")
+
+            return self._add_lease(state, token)
+
+    async def acquire_async(
+        self,
+        request_token: Callable[[], Awaitable[str]],
+        stale_token: Optional[str] = None,
+        release_token: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Tuple[str, Optional[datetime]]:
+        """
+        Получить общий токен и зарегистрировать аренду (см. acquire()).
+
+        Args:
+            request_token: Корутина авторизации, возвращающая новый токен
+            stale_token: Токен, который нужно заменить
+            release_token: Корутина logout для stale_token
+
+        Returns:
+            tuple: (токен, время его получения)
+
+        Raises:
+            httpx.HTTPError: Ошибка при авторизации
+        """
+        async with self._locked_async():
+            state = self._read_state()
+            token = state.get("token")
+
+            if not token or token == stale_token:
+                if token and release_token is not None:
+                    await release_token(token)
+                token = await request_token()
+                self._set_token(state, token)
+            else:
+                logger.info("Использую общий токен")
+
+            return self._add_lease(state, token)
+
+    @staticmethod
+    def _set_token(state: Dict[str, Any], token: str) -> None:
+        state["token"] = token
+        state["created_at"] = datetime.now().isoformat()
+
+    def _add_lease(self, state: Dict[str, Any], token: str) -> Tuple[str, Optional[datetime]]:
+        """Зарегистрировать аренду и записать состояние (под блокировкой)."""
+        if not self._has_lease(state):
+            state["leases"].append({"pid": os.getpid(), "lease": self.lease_id})
+        self._write_state(state)
+
+        logger.debug(f"Аренд общего токена: {len(state['leases'])}")
+        return token, self._created_at(state)
+
+    @asynccontextmanager
+    async def _locked_async(self) -> AsyncIterator[None]:
+        """Захватить блокировку файла, не останавливая цикл событий."""
+        # Поток с acquire() нельзя прервать: при отмене ожидающей задачи
+        # блокировка, захваченная позже, освобождается по завершении потока
+        future = asyncio.ensure_future(asyncio.to_thread(self._lock.acquire))
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(self._release_abandoned)
+            raise
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def _release_abandoned(self, future: "asyncio.Future") -> None:
+        """Освободить блокировку, полученную уже после отмены ожидания."""
+        if not future.cancelled() and future.exception() is None:
+            self._lock.release()
+
+    def touch(self) -> None:
+        """Отметить использование токена (поле last_used_at)."""
+        with self._lock:
+            state = self._read_state()
+            if state.get("token"):
+                state["last_used_at"] = datetime.now().isoformat()
+                self._write_state(state)
+
+    def release_if_idle(
+        self,
+        idle_before: datetime,
+        release_token: Callable[[str], None],
+    ) -> bool:
+        """
+        Освободить лицензию, если токен никем не арендован и простаивает.
+
+        Args:
+            idle_before: Токен считается простаивающим, если последний раз
+                использовался раньше этого времени
+            release_token: Функция logout для токена
+
+        Returns:
+            bool: True если выполнен logout
+        """
+        with self._lock:
+            state = self._read_state()
+            token = state.get("token")
+            if not token or state["leases"]:
+                return False
+
+            try:
+                last_used = datetime.fromisoformat(
+                    state.get("last_used_at") or state["created_at"]
+                )
+            except (KeyError, TypeError, ValueError):
+                last_used = None
+            if last_used is not None and last_used >= idle_before:
+                return False
+
+            try:
+                release_token(token)
+            finally:
+                self._write_state({"leases": []})
+            return True
+
+    def release(self, release_token: Optional[Callable[[str], None]]) -> bool:
+        """
+        Завершить аренду; освободить лицензию, если арендаторов не осталось.
+
+        Args:
+            release_token: Функция logout для токена. None — только завершить
+                аренду, оставив токен в файле (режим keep-alive).
+
+        Returns:
+            bool: True если выполнен logout (аренда была последней)
+        """
+        with self._lock:
+            state = self._read_state()
+            token = self._drop_lease(state, release_token is not None)
+            if token is None:
+                return False
+
+            try:
+                release_token(token)
+            finally:
+                # Файл не удаляется: другие процессы могут ждать его блокировку
+                self._write_state({"leases": []})
+            return True
+
+    async def release_async(self, release_token: Optional[Callable[[str], Awaitable[None]]]) -> bool:
+        """
+        Завершить аренду (см. release()).
+
+        Args:
+            release_token: Корутина logout для токена. None — только
+                завершить аренду (режим keep-alive).
+
+        Returns:
+            bool: True если выполнен logout (аренда была последней)
+        """
+        async with self._locked_async():
+            state = self._read_state()
+            token = self._drop_lease(state, release_token is not None)
+            if token is None:
+                return False
+
+            try:
+                await release_token(token)
+            finally:
+                self._write_state({"leases": []})
+            return True
+
+    def _drop_lease(self, state: Dict[str, Any], logout: bool) -> Optional[str]:
+        """
+        Убрать свою аренду (под блокировкой).
+
+        Returns:
+            Optional[str]: Токен, который пора освободить, или None, если
+            аренды остались (состояние при этом уже записано)
+        """
+        state["leases"] = [
+            lease for lease in state["leases"] if lease.get("lease") != self.lease_id
+        ]
+
+        token = state.get("token")
+        if state["leases"] or not token or not logout:
+            self._write_state(state)
+            logger.info(
+                f"Общий токен остается у других процессов "
+                f"(аренд: {len(state['leases'])})"
+            )
+            return None
+        return token
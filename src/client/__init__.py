@@ -1,5 +1,34 @@
 """HTTP клиент для работы с iiko API."""
 
 from .http_client import HTTPClient
+from .async_http_client import AsyncHTTPClient
+from .hooks import HOOK_EVENTS, Hooks, RequestEvent, RequestTiming
+from .metrics import Counter, Histogram, MetricsRegistry, SDKMetrics
+from .rate_limiter import (
+    FixedIntervalLimiter,
+    RateLimiter,
+    TokenBucketLimiter,
+    configure_rate_limit,
+    get_rate_limiter,
+)
+from .process_lock import InterProcessLimiter, get_interprocess_limiter
 
-__all__ = ["HTTPClient"]
+__all__ = [
+    "HTTPClient",
+    "AsyncHTTPClient",
+    "Hooks",
+    "HOOK_EVENTS",
+    "RequestEvent",
+    "RequestTiming",
+    "MetricsRegistry",
+    "SDKMetrics",
+    "Counter",
+    "Histogram",
+    "RateLimiter",
+    "TokenBucketLimiter",
+    "FixedIntervalLimiter",
+    "configure_rate_limit",
+    "get_rate_limiter",
+    "InterProcessLimiter",
+    "get_interprocess_limiter",
+]
@@ -0,0 +1,287 @@
+"""
+Асинхронный HTTP клиент для работы с iiko API.
+
+Требует опциональную зависимость httpx (`uv sync --extra async`).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Dict, Any, Union
+
+from ..config import Settings
+from .rate_limiter import RateLimiter, limiter_from_settings
+from .request_log import LogSampler, body_preview, safe_params
+
+logger = logging.getLogger(__name__)
+
+# Статусы, при которых запрос повторяется (как в HTTPClient)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_METHODS = frozenset({"HEAD", "GET", "OPTIONS", "POST", "PUT"})
+BACKOFF_FACTOR = 1.0
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "Для асинхронного клиента нужен пакет httpx: uv sync --extra async"
+        ) from e
+    return httpx
+
+
+class AsyncHTTPClient:
+    """
+    Асинхронный HTTP клиент для выполнения запросов к iiko API.
+
+    Особенности:
+    - Запросы одного клиента выполняются строго последовательно
+      (asyncio.Lock на все время запроса, при stream=True — до закрытия
+      ответа), разные клиенты — параллельно
+    - Ограничение частоты запросов общим с HTTPClient лимитером сервера
+    - Повторные попытки при 429/5xx и сетевых ошибках с экспоненциальной
+      задержкой, как у HTTPClient
+    - Поддержка потокового чтения ответа (stream=True)
+    """
+
+    def __init__(self, settings: Settings, limiter: Optional[RateLimiter] = None):
+        """
+        Инициализация асинхронного HTTP клиента.
+
+        Args:
+            settings: Экземпляр настроек приложения
+            limiter: Лимитер частоты запросов. Если None, выбирается
+                по настройкам (см. limiter_from_settings).
+        """
+        httpx = _import_httpx()
+        self.settings = settings
+        self.client = httpx.AsyncClient(timeout=settings.request_timeout)
+        self.limiter = limiter or limiter_from_settings(settings)
+        self._log_sampler = LogSampler(settings.log_requests_per_second)
+        self._lock = asyncio.Lock()
+
+    async def _ensure_sequential_requests(self) -> float:
+        """
+        Дождаться разрешения лимитера на очередной запрос.
+
+        Вызывается под блокировкой клиента, поэтому запросы не пересекаются.
+
+        Returns:
+            float: Время ожидания в секундах
+        """
+        return await self.limiter.acquire_async()
+
+    def _release_on_close(self, response) -> None:
+        """
+        Освободить слот лимитера и блокировку клиента при закрытии ответа.
+
+        httpx закрывает потоковый ответ в aclose() — явно или по окончании
+        aiter_bytes()/aread(); повторное закрытие ничего не освобождает.
+        """
+        close = response.aclose
+        released = False
+
+        async def aclose() -> None:
+            nonlocal released
+            try:
+                await close()
+            finally:
+                if not released:
+                    released = True
+                    self.limiter.release()
+                    self._lock.release()
+
+        response.aclose = aclose
+
+    @staticmethod
+    def _retry_delay(attempt: int, response=None) -> float:
+        """Задержка перед повтором: Retry-After или экспоненциальный backoff."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        if attempt <= 1:
+            return 0.0
+        return BACKOFF_FACTOR * (2 ** (attempt - 1))
+
+    def _log_response(self, method: str, url: str, response, elapsed: float) -> None:
+        """Записать ответ в лог (строки INFO ограничены по частоте)."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        allowed, skipped = self._log_sampler.allow()
+        if allowed:
+            logger.info(
+                "%s %s -> %s (%.0f мс)%s",
+                method, url, response.status_code, elapsed * 1000,
+                f" [пропущено записей: {skipped}]" if skipped else "",
+                extra={
+                    "http_method": method,
+                    "http_endpoint": url.removeprefix(self.settings.rms_base_url),
+                    "http_status": response.status_code,
+                    "http_elapsed_ms": round(elapsed * 1000, 1),
+                },
+            )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        **kwargs
+    ):
+        """
+        Выполнить HTTP запрос.
+
+        Args:
+            method: HTTP метод (GET, POST, PUT, DELETE)
+            url: URL для запроса
+            params: Query параметры
+            data: Данные для отправки (dict для form-data, str для XML)
+            headers: Заголовки запроса
+            stream: Не читать тело ответа. Вызывающий обязан закрыть ответ
+                (aclose() или чтение до конца): до этого блокировка клиента
+                и слот лимитера остаются занятыми
+            **kwargs: Дополнительные параметры для httpx (json, timeout и т.д.)
+
+        Returns:
+            httpx.Response: Ответ от сервера
+
+        Raises:
+            httpx.HTTPError: Ошибка при выполнении запроса
+        """
+        httpx = _import_httpx()
+
+        if isinstance(data, str):
+            kwargs["content"] = data
+        elif data is not None:
+            kwargs["data"] = data
+
+        retries = self.settings.max_retries if method.upper() in RETRY_METHODS else 0
+
+        # При stream=True успешный ответ забирает блокировку клиента и слот
+        # лимитера: они освобождаются только при закрытии ответа (aclose),
+        # иначе следующий запрос ушел бы на сервер, пока читается тело
+        await self._lock.acquire()
+        handed_over = False
+        try:
+            attempt = 0
+            while True:
+                if params and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("%s %s params=%s", method, url, safe_params(params))
+
+                response = None
+                acquired = False
+                try:
+                    await self._ensure_sequential_requests()
+                    acquired = True
+                    request = self.client.build_request(
+                        method, url, params=params, headers=headers or {}, **kwargs
+                    )
+                    started = time.perf_counter()
+                    response = await self.client.send(request, stream=stream)
+                    self._log_response(method, url, response, time.perf_counter() - started)
+
+                    if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                        if stream and not response.is_error:
+                            self._release_on_close(response)
+                            handed_over = True
+                        break
+                    logger.warning("Статус %s, повтор запроса", response.status_code)
+                    await response.aclose()
+                except httpx.TransportError as e:
+                    if attempt >= retries:
+                        raise
+                    logger.warning("Сетевая ошибка, повтор запроса: %s", e)
+                finally:
+                    if acquired and not handed_over:
+                        self.limiter.release()
+
+                attempt += 1
+                await asyncio.sleep(self._retry_delay(attempt, response))
+        finally:
+            if not handed_over:
+                self._lock.release()
+
+        if not stream and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response body: %s", body_preview(response.content, response.encoding))
+
+        if response.is_error:
+            if stream:
+                await response.aread()
+                await response.aclose()
+        response.raise_for_status()
+
+        return response
+
+    async def get(self, url: str, **kwargs):
+        """Выполнить GET запрос."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(
+        self,
+        url: str,
+        data: Optional[Union[Dict[str, Any], str]] = None,
+        **kwargs
+    ):
+        """
+        Выполнить POST запрос.
+
+        Args:
+            url: URL для запроса
+            data: Данные (dict для form-urlencoded, str для XML)
+            **kwargs: Дополнительные параметры
+
+        Returns:
+            httpx.Response: Ответ от сервера
+        """
+        headers = kwargs.pop("headers", {})
+
+        # Если data - строка, считаем что это XML
+        if isinstance(data, str):
+            headers["Content-Type"] = "application/xml"
+        elif isinstance(data, dict):
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        return await self.request("POST", url, data=data, headers=headers, **kwargs)
+
+    async def put(
+        self,
+        url: str,
+        data: Optional[str] = None,
+        **kwargs
+    ):
+        """
+        Выполнить PUT запрос (обычно с XML данными).
+
+        Args:
+            url: URL для запроса
+            data: XML данные
+            **kwargs: Дополнительные параметры
+
+        Returns:
+            httpx.Response: Ответ от сервера
+        """
+        headers = kwargs.pop("headers", {})
+        headers["Content-Type"] = "application/xml"
+
+        return await self.request("PUT", url, data=data, headers=headers, **kwargs)
+
+    async def delete(self, url: str, **kwargs):
+        """Выполнить DELETE запрос."""
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Закрыть клиент."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
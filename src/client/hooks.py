@@ -0,0 +1,265 @@
+"""
+Хуки жизненного цикла запросов и разбивка времени запроса по фазам.
+
+Обработчики регистрируются на события:
+
+- on_request_start — перед запросом (до ожидания лимитера)
+- on_throttle — запрос ждал лимитер (status=None) или сервер ответил 429
+- on_retry — urllib3 повторяет запрос (после 5xx/429 или сетевой ошибки)
+- on_response — получен ответ и прочитано тело (при stream=True — только заголовки)
+- on_parse — ответ разобран (OLAP-отчеты), заполнены timing.parse и rows
+- on_error — запрос завершился исключением или статусом ошибки
+
+Каждый обработчик получает RequestEvent; один и тот же объект проходит
+через все события запроса. Пока ни одного обработчика нет, HTTPClient
+не создает событий и не замеряет время.
+
+Пример использования:
+    >>> def slow(event):
+    ...     if event.timing.total > 5:
+    ...         print(event.endpoint, event.timing)
+    >>> sdk.hooks.register("on_parse", slow)
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+HOOK_EVENTS = (
+    "on_request_start",
+    "on_throttle",
+    "on_retry",
+    "on_response",
+    "on_parse",
+    "on_error",
+)
+
+
+@dataclass
+class RequestTiming:
+    """
+    Время фаз запроса в секундах.
+
+    Attributes:
+        throttle: Ожидание лимитера частоты запросов
+        connect: Установка соединений (DNS, TCP, TLS); 0 при переиспользовании
+        ttfb: От отправки запроса до заголовков ответа (без connect,
+            включая паузы повторов)
+        download: Чтение тела ответа (при stream=True — 0, тело читается при разборе)
+        parse: Разбор ответа (при stream=True включает чтение тела)
+    """
+
+    throttle: float = 0.0
+    connect: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    parse: float = 0.0
+
+    @property
+    def total(self) -> float:
+        """Суммарное время всех фаз."""
+        return self.throttle + self.connect + self.ttfb + self.download + self.parse
+
+
+@dataclass
+class RequestEvent:
+    """
+    Состояние запроса, передаваемое обработчикам хуков.
+
+    Attributes:
+        method: HTTP метод
+        url: Полный URL без query-параметров
+        endpoint: Путь относительно rms_base_url (например "/v2/reports/olap")
+        timing: Время фаз запроса
+        status: HTTP статус последнего ответа
+        retries: Количество выполненных повторов
+        delay: Пауза перед повтором или ожидание лимитера (on_retry, on_throttle)
+        bytes: Размер тела ответа в байтах
+        rows: Количество разобранных строк (on_parse)
+        error: Исключение (on_retry, on_error)
+        stream: Тело читается потоком при разборе (bytes заполняется к on_parse)
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    timing: RequestTiming = field(default_factory=RequestTiming)
+    status: Optional[int] = None
+    retries: int = 0
+    delay: Optional[float] = None
+    bytes: Optional[int] = None
+    rows: Optional[int] = None
+    error: Optional[BaseException] = None
+    stream: bool = False
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+class Hooks:
+    """
+    Реестр обработчиков событий запросов.
+
+    Ошибки обработчиков логируются и не прерывают запрос.
+
+    Пример использования:
+        >>> hooks = Hooks()
+        >>> @hooks.register("on_retry")
+        ... def log_retry(event):
+        ...     print(event.endpoint, event.status, event.delay)
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Hook]] = {name: [] for name in HOOK_EVENTS}
+        self._count = 0
+
+    def register(self, event: str, func: Optional[Hook] = None):
+        """
+        Зарегистрировать обработчик события.
+
+        Можно использовать как декоратор: @hooks.register("on_retry").
+
+        Args:
+            event: Имя события из HOOK_EVENTS
+            func: Обработчик
+
+        Returns:
+            Обработчик (или декоратор, если func не передан)
+
+        Raises:
+            ValueError: Неизвестное событие
+        """
+        if event not in self._handlers:
+            raise ValueError(
+                f"Неизвестное событие {event!r}, допустимые: {', '.join(HOOK_EVENTS)}"
+            )
+        if func is None:
+            return lambda f: self.register(event, f)
+
+        self._handlers[event].append(func)
+        self._count += 1
+        return func
+
+    def unregister(self, event: str, func: Hook) -> None:
+        """Удалить обработчик события (если зарегистрирован)."""
+        handlers = self._handlers.get(event, [])
+        if func in handlers:
+            handlers.remove(func)
+            self._count -= 1
+
+    def emit(self, event: str, payload: RequestEvent) -> None:
+        """Вызвать обработчики события."""
+        for func in self._handlers[event]:
+            try:
+                func(payload)
+            except Exception:
+                logger.exception(f"Ошибка в обработчике {event}")
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+
+# Событие запроса, выполняемого в текущем потоке (для HookedRetry и замера connect)
+_context = threading.local()
+
+
+@contextmanager
+def tracking(event: RequestEvent) -> Iterator[RequestEvent]:
+    """Сделать event текущим событием потока на время запроса."""
+    previous = getattr(_context, "event", None)
+    _context.event = event
+    try:
+        yield event
+    finally:
+        _context.event = previous
+
+
+def current_event() -> Optional[RequestEvent]:
+    """Событие запроса, выполняемого в текущем потоке."""
+    return getattr(_context, "event", None)
+
+
+class HookedRetry(Retry):
+    """Retry, сообщающий о повторах и ответах 429 через хуки."""
+
+    def __init__(self, *args, hooks: Optional[Hooks] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hooks = hooks
+
+    def new(self, **kw) -> "HookedRetry":
+        retry = super().new(**kw)
+        retry.hooks = self.hooks
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None,
+                  _pool=None, _stacktrace=None) -> "HookedRetry":
+        retry = super().increment(
+            method, url, response=response, error=error,
+            _pool=_pool, _stacktrace=_stacktrace,
+        )
+        event = current_event() if self.hooks else None
+        if event is None:
+            return retry
+
+        event.retries += 1
+        event.status = response.status if response is not None else None
+        event.error = error
+        retry_after = retry.get_retry_after(response) if response is not None else None
+        event.delay = retry_after if retry_after is not None else retry.get_backoff_time()
+
+        if event.status == 429:
+            self.hooks.emit("on_throttle", event)
+        self.hooks.emit("on_retry", event)
+        return retry
+
+
+class _TimedConnectionMixin:
+    """Добавляет время установки соединения к текущему событию потока."""
+
+    def connect(self) -> None:
+        event = getattr(_context, "event", None)
+        if event is None:
+            super().connect()
+            return
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            event.timing.connect += time.perf_counter() - started
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter, замеряющий установку соединений для RequestTiming.connect."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
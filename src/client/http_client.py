@@ -2,16 +2,18 @@
 Базовый HTTP клиент для работы с iiko API.
 """
 
-import time
 import logging
+import threading
+import time
 from typing import Optional, Dict, Any, Union
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from ..config import Settings
+from .hooks import Hooks, HookedRetry, RequestEvent, TimedHTTPAdapter, tracking
+from .rate_limiter import RateLimiter, limiter_from_settings
+from .request_log import LogSampler, body_preview, safe_params
 
 logger = logging.getLogger(__name__)
 
@@ -22,21 +24,34 @@ class HTTPClient:
 
     Особенности:
     - Автоматические повторные попытки при ошибках
-    - Логирование всех запросов
+    - Ленивое логирование запросов (ограничено по частоте, см. request_log)
     - Поддержка различных типов контента (form-data, XML)
     - Соблюдение рекомендаций iiko API (последовательные запросы)
+    - Ограничение частоты запросов (token bucket, общий на сервер)
+    - Хуки жизненного цикла запросов с разбивкой времени по фазам (hooks)
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        limiter: Optional[RateLimiter] = None,
+        hooks: Optional[Hooks] = None,
+    ):
         """
         Инициализация HTTP клиента.
 
         Args:
             settings: Экземпляр настроек приложения
+            limiter: Лимитер частоты запросов. Если None, выбирается
+                по настройкам (см. limiter_from_settings).
+            hooks: Реестр хуков запросов. Если None, создается пустой.
         """
         self.settings = settings
+        self.hooks = hooks if hooks is not None else Hooks()
         self.session = self._create_session()
-        self._last_request_time: Optional[float] = None
+        self.limiter = limiter or limiter_from_settings(settings)
+        self._request_lock = threading.Lock()
+        self._log_sampler = LogSampler(settings.log_requests_per_second)
 
     def _create_session(self) -> requests.Session:
         """
@@ -48,32 +63,90 @@ class HTTPClient:
         session = requests.Session()
 
         # Настройка повторных попыток
-        retry_strategy = Retry(
+        retry_strategy = HookedRetry(
             total=self.settings.max_retries,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PUT"]
+            allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PUT"],
+            hooks=self.hooks,
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = TimedHTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
         return session
 
-    def _ensure_sequential_requests(self) -> None:
+    @property
+    def throttled_time(self) -> float:
+        """Суммарное время ожидания лимитера в секундах."""
+        return self.limiter.throttled_time
+
+    def _ensure_sequential_requests(self) -> float:
         """
-        Гарантировать последовательное выполнение запросов.
+        Дождаться разрешения лимитера на очередной запрос.
 
         Согласно рекомендациям iiko API, запросы должны выполняться
-        последовательно друг за другом.
+        последовательно друг за другом; сам запрос дополнительно
+        выполняется под блокировкой клиента.
+
+        Returns:
+            float: Время ожидания в секундах
         """
-        if self._last_request_time is not None:
-            elapsed = time.time() - self._last_request_time
-            # Минимальная задержка между запросами 100ms
-            min_delay = 0.1
-            if elapsed < min_delay:
-                time.sleep(min_delay - elapsed)
+        wait = self.limiter.acquire()
+        if wait > 0:
+            logger.debug("Ожидание лимитера: %.0f мс", wait * 1000)
+        return wait
+
+    def _endpoint(self, url: str) -> str:
+        """Путь запроса относительно rms_base_url (для хуков и метрик)."""
+        base = self.settings.rms_base_url
+        if url.startswith(base):
+            return url[len(base):].split("?", 1)[0] or "/"
+        return urlsplit(url).path
+
+    def _new_event(self, method: str, url: str) -> Optional[RequestEvent]:
+        """Создать событие запроса, если зарегистрирован хотя бы один хук."""
+        if not self.hooks:
+            return None
+        event = RequestEvent(method=method, url=url.split("?", 1)[0], endpoint=self._endpoint(url))
+        self.hooks.emit("on_request_start", event)
+        return event
+
+    def _log_response(
+        self,
+        method: str,
+        url: str,
+        response: requests.Response,
+        stream: bool,
+    ) -> None:
+        """
+        Записать ответ в лог.
+
+        Строка INFO проходит через LogSampler; превью тела строится
+        только при включенном DEBUG и не больше BODY_PREVIEW_BYTES байт.
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        allowed, skipped = self._log_sampler.allow()
+        if allowed:
+            elapsed_ms = response.elapsed.total_seconds() * 1000
+            logger.info(
+                "%s %s -> %s (%.0f мс)%s",
+                method, url, response.status_code, elapsed_ms,
+                f" [пропущено записей: {skipped}]" if skipped else "",
+                extra={
+                    "http_method": method,
+                    "http_endpoint": self._endpoint(url),
+                    "http_status": response.status_code,
+                    "http_elapsed_ms": round(elapsed_ms, 1),
+                },
+            )
+
+        # При stream=True тело еще не прочитано: не трогаем его ради лога
+        if not stream and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response body: %s", body_preview(response.content, response.encoding))
 
     def request(
         self,
@@ -93,17 +166,17 @@ class HTTPClient:
             params: Query параметры
             data: Данные для отправки (dict для form-data, str для XML)
             headers: Заголовки запроса
-            **kwargs: Дополнительные параметры для requests
+            **kwargs: Дополнительные параметры для requests. При stream=True
+                ответ нужно закрыть (response.close()): до этого следующие
+                запросы клиента и канала ждут
 
         Returns:
-            requests.Response: Ответ от сервера
+            requests.Response: Ответ от сервера. Если зарегистрированы хуки,
+                в атрибуте request_event — событие запроса (для on_parse).
 
         Raises:
             requests.RequestException: Ошибка при выполнении запроса
         """
-        # Гарантируем последовательность запросов
-        self._ensure_sequential_requests()
-
         # Устанавливаем таймаут если не указан
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.settings.request_timeout
@@ -112,12 +185,101 @@ class HTTPClient:
         if headers is None:
             headers = {}
 
-        # Логирование запроса
-        logger.info(f"{method} {url}")
-        if params:
-            logger.debug(f"Params: {params}")
+        if params and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s %s params=%s", method, url, safe_params(params))
 
+        event = self._new_event(method, url)
+        stream = bool(kwargs.get("stream"))
+
+        # Слот лимитера и блокировка клиента освобождаются в finally; при
+        # stream=True успешный ответ забирает их до своего закрытия
+        acquired = locked = handed_over = False
         try:
+            # Гарантируем последовательность запросов
+            wait = self._ensure_sequential_requests()
+            acquired = True
+            if event is not None and wait > 0:
+                event.timing.throttle = event.delay = wait
+                self.hooks.emit("on_throttle", event)
+
+            self._request_lock.acquire()
+            locked = True
+
+            if event is None:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    data=data,
+                    headers=headers,
+                    **kwargs
+                )
+            else:
+                response = self._timed_request(
+                    event, method, url, params, data, headers, **kwargs
+                )
+
+            self._log_response(method, url, response, stream)
+
+            # Проверка статуса
+            response.raise_for_status()
+
+            if stream:
+                self._release_on_close(response)
+                handed_over = True
+            return response
+
+        except requests.RequestException as e:
+            if event is not None:
+                event.error = e
+                if e.response is not None:
+                    event.status = e.response.status_code
+                self.hooks.emit("on_error", event)
+            raise
+
+        finally:
+            if not handed_over:
+                if locked:
+                    self._request_lock.release()
+                if acquired:
+                    self.limiter.release()
+
+    def _release_on_close(self, response: requests.Response) -> None:
+        """
+        Освободить блокировку клиента и слот лимитера при закрытии ответа.
+
+        Потоковый ответ держит их, пока читается тело: вызывающий обязан
+        закрыть его (response.close() или with response). Повторное
+        закрытие ничего не освобождает.
+        """
+        close = response.close
+        released = False
+
+        def close_and_release() -> None:
+            nonlocal released
+            try:
+                close()
+            finally:
+                if not released:
+                    released = True
+                    self._request_lock.release()
+                    self.limiter.release()
+
+        response.close = close_and_release
+
+    def _timed_request(
+        self,
+        event: RequestEvent,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Union[Dict[str, Any], str]],
+        headers: Dict[str, str],
+        **kwargs
+    ) -> requests.Response:
+        """Выполнить запрос с замером фаз и вызовом on_response."""
+        with tracking(event):
+            started = time.perf_counter()
             response = self.session.request(
                 method=method,
                 url=url,
@@ -126,19 +288,20 @@ class HTTPClient:
                 headers=headers,
                 **kwargs
             )
-
-            # Логирование ответа
-            logger.info(f"Response: {response.status_code}")
-            logger.debug(f"Response body: {response.text[:200]}...")
-
-            # Проверка статуса
-            response.raise_for_status()
-
-            return response
-
-        finally:
-            # Запоминаем время последнего запроса
-            self._last_request_time = time.time()
+            finished = time.perf_counter()
+
+        # elapsed у requests — от отправки до заголовков ответа
+        elapsed = response.elapsed.total_seconds()
+        timing = event.timing
+        timing.ttfb = max(0.0, elapsed - timing.connect)
+        event.stream = bool(kwargs.get("stream"))
+        if not event.stream:
+            timing.download = max(0.0, finished - started - elapsed)
+            event.bytes = len(response.content)
+        event.status = response.status_code
+        response.request_event = event
+        self.hooks.emit("on_response", event)
+        return response
 
     def get(self, url: str, **kwargs) -> requests.Response:
         """Выполнить GET запрос."""
@@ -0,0 +1,406 @@
+"""
+Метрики трафика SDK в процессе.
+
+MetricsRegistry хранит счетчики и гистограммы с метками и отдает их
+в текстовом формате Prometheus (render_prometheus) или в JSON
+(to_dict, dump_json) — например, в конце ночного задания.
+
+SDKMetrics подключается к хукам HTTPClient (см. hooks) и считает:
+
+- iiko_requests_total{endpoint, method, status} — полученные ответы
+- iiko_request_duration_seconds{endpoint} — время запроса до разбора
+- iiko_request_phase_seconds{endpoint, phase} — фазы RequestTiming
+- iiko_retries_total{endpoint, status} — повторы urllib3
+- iiko_throttled_total{endpoint, source} — ожидание лимитера или 429
+- iiko_errors_total{endpoint, status} — ошибки (status="" для сетевых)
+- iiko_response_bytes_total{endpoint} — байты тела ответов
+- iiko_rows_parsed_total{endpoint} — разобранные строки отчетов
+- iiko_licence_acquisitions_total, iiko_licence_releases_total — /auth и /logout
+
+Пример использования:
+    >>> metrics = SDKMetrics()
+    >>> metrics.install(sdk.hooks)
+    >>> ...
+    >>> print(metrics.registry.render_prometheus())
+    >>> metrics.registry.dump_json("metrics.json")
+"""
+
+import json
+import math
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .hooks import Hooks, RequestEvent
+
+# Границы гистограмм длительности по умолчанию (секунды): от быстрых
+# справочных запросов до многоминутных OLAP-отчетов
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Общая часть метрик: имя, описание, метки, блокировка."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Метрика {self.name} ожидает метки {self.labelnames}, получено {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """
+    Монотонный счетчик с метками.
+
+    Пример использования:
+        >>> requests_total = Counter("requests_total", "Запросы", ["status"])
+        >>> requests_total.inc(status=200)
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """
+        Увеличить счетчик.
+
+        Args:
+            amount: Прирост (неотрицательный)
+            **labels: Значения меток
+
+        Raises:
+            ValueError: Отрицательный прирост или неверный набор меток
+        """
+        if amount < 0:
+            raise ValueError("Счетчик не может уменьшаться")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Текущее значение для набора меток."""
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return {
+            "type": self.kind,
+            "help": self.help,
+            "samples": [
+                {"labels": dict(zip(self.labelnames, key)), "value": v} for key, v in items
+            ],
+        }
+
+
+class Histogram(_Metric):
+    """
+    Гистограмма наблюдений с метками (кумулятивные бакеты, как в Prometheus).
+
+    Пример использования:
+        >>> latency = Histogram("latency_seconds", "Время запроса", ["endpoint"])
+        >>> latency.observe(0.42, endpoint="/auth")
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # метки -> [счетчики по бакетам (не кумулятивные) + +Inf, сумма, количество]
+        self._values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Добавить наблюдение.
+
+        Args:
+            value: Значение (например, секунды)
+            **labels: Значения меток
+        """
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _snapshot(self) -> List[Tuple[LabelValues, List[int], float, int]]:
+        with self._lock:
+            return [
+                (key, list(counts), total, count)
+                for key, (counts, total, count) in sorted(self._values.items())
+            ]
+
+    def _cumulative(self, counts: List[int]) -> List[Tuple[float, int]]:
+        out = []
+        running = 0
+        for bound, n in zip(self.buckets + (math.inf,), counts):
+            running += n
+            out.append((bound, running))
+        return out
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, counts, total, count in self._snapshot():
+            for bound, running in self._cumulative(counts):
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {running}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.kind,
+            "help": self.help,
+            "samples": [
+                {
+                    "labels": dict(zip(self.labelnames, key)),
+                    "buckets": {
+                        _format_value(bound): running
+                        for bound, running in self._cumulative(counts)
+                    },
+                    "sum": total,
+                    "count": count,
+                }
+                for key, counts, total, count in self._snapshot()
+            ],
+        }
+
+
+Metric = Union[Counter, Histogram]
+
+
+class MetricsRegistry:
+    """Набор метрик с выводом в формате Prometheus и JSON."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Метрика {name} уже зарегистрирована как {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Получить (или создать) счетчик name."""
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Получить (или создать) гистограмму name."""
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Метрика по имени."""
+        return self._metrics.get(name)
+
+    def render_prometheus(self) -> str:
+        """
+        Вывести метрики в текстовом формате Prometheus (exposition format 0.0.4).
+
+        Returns:
+            str: Текст для ответа на /metrics
+        """
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Снимок метрик в виде словаря.
+
+        Returns:
+            Dict[str, Any]: {"created_at": ..., "metrics": {имя: {...}}}
+        """
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "metrics": {name: m.to_dict() for name, m in list(self._metrics.items())},
+        }
+
+    def dump_json(self, path: Union[str, Path]) -> None:
+        """Сохранить снимок метрик в JSON-файл."""
+        Path(path).write_text(
+            json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+
+
+class SDKMetrics:
+    """
+    Метрики трафика SDK, собираемые через хуки запросов.
+
+    Один экземпляр можно подключить к нескольким клиентам (например,
+    ко всем полосам TokenPool через общий Hooks).
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        Инициализация метрик.
+
+        Args:
+            registry: Реестр для метрик. Если None, создается новый.
+        """
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.requests = r.counter(
+            "iiko_requests_total", "Ответы iiko API", ["endpoint", "method", "status"]
+        )
+        self.duration = r.histogram(
+            "iiko_request_duration_seconds", "Время запроса без разбора ответа", ["endpoint"]
+        )
+        self.phases = r.histogram(
+            "iiko_request_phase_seconds", "Время фаз запроса", ["endpoint", "phase"]
+        )
+        self.retries = r.counter(
+            "iiko_retries_total", "Повторные попытки запросов", ["endpoint", "status"]
+        )
+        self.throttled = r.counter(
+            "iiko_throttled_total",
+            "Ожидания лимитера (source=limiter) и ответы 429 (source=server)",
+            ["endpoint", "source"],
+        )
+        self.errors = r.counter(
+            "iiko_errors_total", "Запросы, завершившиеся ошибкой", ["endpoint", "status"]
+        )
+        self.bytes = r.counter(
+            "iiko_response_bytes_total", "Байты тела ответов", ["endpoint"]
+        )
+        self.rows = r.counter(
+            "iiko_rows_parsed_total", "Разобранные строки отчетов", ["endpoint"]
+        )
+        self.licence_acquisitions = r.counter(
+            "iiko_licence_acquisitions_total", "Полученные токены (занятые слоты лицензии)"
+        )
+        self.licence_releases = r.counter(
+            "iiko_licence_releases_total", "Освобожденные токены (logout)"
+        )
+
+        self._handlers = {
+            "on_throttle": self._on_throttle,
+            "on_retry": self._on_retry,
+            "on_response": self._on_response,
+            "on_parse": self._on_parse,
+            "on_error": self._on_error,
+        }
+
+    def install(self, hooks: Hooks) -> "SDKMetrics":
+        """Подключить метрики к хукам клиента (sdk.hooks)."""
+        for event, handler in self._handlers.items():
+            hooks.register(event, handler)
+        return self
+
+    def uninstall(self, hooks: Hooks) -> None:
+        """Отключить метрики от хуков клиента."""
+        for event, handler in self._handlers.items():
+            hooks.unregister(event, handler)
+
+    def _on_throttle(self, event: RequestEvent) -> None:
+        source = "limiter" if event.status is None else "server"
+        self.throttled.inc(endpoint=event.endpoint, source=source)
+
+    def _on_retry(self, event: RequestEvent) -> None:
+        status = "" if event.status is None else event.status
+        self.retries.inc(endpoint=event.endpoint, status=status)
+
+    def _on_response(self, event: RequestEvent) -> None:
+        endpoint = event.endpoint
+        timing = event.timing
+        self.requests.inc(endpoint=endpoint, method=event.method, status=event.status)
+        self.duration.observe(
+            timing.throttle + timing.connect + timing.ttfb + timing.download,
+            endpoint=endpoint,
+        )
+        for phase in ("throttle", "connect", "ttfb", "download"):
+            self.phases.observe(getattr(timing, phase), endpoint=endpoint, phase=phase)
+        if event.bytes is not None and not event.stream:
+            self.bytes.inc(event.bytes, endpoint=endpoint)
+
+        if event.status == 200:
+            if endpoint == "/auth":
+                self.licence_acquisitions.inc()
+            elif endpoint == "/logout":
+                self.licence_releases.inc()
+
+    def _on_parse(self, event: RequestEvent) -> None:
+        self.phases.observe(event.timing.parse, endpoint=event.endpoint, phase="parse")
+        if event.rows is not None:
+            self.rows.inc(event.rows, endpoint=event.endpoint)
+        if event.stream and event.bytes is not None:
+            self.bytes.inc(event.bytes, endpoint=event.endpoint)
+
+    def _on_error(self, event: RequestEvent) -> None:
+        status = "" if event.status is None else event.status
+        self.errors.inc(endpoint=event.endpoint, status=status)
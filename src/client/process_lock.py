@@ -0,0 +1,187 @@
+"""
+Межпроцессная сериализация запросов к одному серверу iiko.
+
+Несколько процессов (например, cron-воркеры) на одной машине работают
+с одним сервером. У каждого процесса свой HTTPClient и свой лимитер,
+поэтому запросы разных процессов пересекаются, сервер отвечает 429/500,
+и urllib3 уходит в повторы с backoff. InterProcessLimiter держит
+файловую блокировку, общую для всех процессов хоста, на все время
+запроса, а состояние token bucket хранит в самом файле блокировки.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from ..utils.filelock import FileLock
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCK_DIR = Path(tempfile.gettempdir()) / "iiko-sdk-locks"
+
+
+def lock_path_for(key: str, lock_dir: Optional[Path] = None) -> Path:
+    """
+    Путь к файлу блокировки для ключа (обычно rms_base_url).
+
+    Args:
+        key: Ключ канала
+        lock_dir: Каталог блокировок (по умолчанию во временном каталоге)
+
+    Returns:
+        Path: Путь к файлу блокировки
+    """
+    digest = hashlib.sha256(key.rstrip("/").encode("utf-8")).hexdigest()[:16]
+    return Path(lock_dir or DEFAULT_LOCK_DIR) / f"iiko-{digest}.lock"
+
+
+class InterProcessLimiter(RateLimiter):
+    """
+    Лимитер, общий для всех процессов хоста.
+
+    acquire() захватывает файловую блокировку и ждет токен в общем ведре,
+    release() освобождает блокировку после завершения запроса (включая
+    повторные попытки urllib3). Так запросы к серверу идут строго
+    последовательно между всеми процессами и потоками.
+
+    reserve() только забирает токен из общего ведра, не сериализуя
+    запросы (для кода, которому нужно лишь ограничение частоты).
+
+    Состояние ведра хранится в файле по настенным часам (time.time),
+    так как монотонные часы разных процессов несравнимы.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        rate: float,
+        burst: int = 1,
+        lock_dir: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Инициализация лимитера.
+
+        Args:
+            key: Ключ канала (rms_base_url)
+            rate: Запросов в секунду
+            burst: Емкость ведра
+            lock_dir: Каталог файлов блокировки
+            clock: Настенные часы (секунды)
+        """
+        super().__init__(clock)
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        self._file_lock = FileLock(lock_path_for(key, lock_dir))
+        # Потоки одного процесса делят один файловый дескриптор
+        self._hold = threading.Lock()
+
+    def _take_token(self) -> float:
+        """Забрать токен из общего ведра (под файловой блокировкой)."""
+        now = self._clock()
+        tokens, updated = float(self.burst), now
+        try:
+            state = json.loads(self._file_lock.read() or b"{}")
+            tokens = float(state.get("tokens", tokens))
+            updated = float(state.get("updated", updated))
+        except (ValueError, TypeError):
+            logger.debug("Поврежденное состояние лимитера, сбрасываю")
+
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+        tokens = tokens + wait * self.rate - 1
+
+        self._file_lock.write(
+            json.dumps({"tokens": tokens, "updated": now + wait}).encode("utf-8")
+        )
+        return wait
+
+    def reserve(self) -> float:
+        """
+        Забрать токен из общего ведра, не удерживая блокировку.
+
+        В отличие от acquire(), запросы не сериализуются: ограничивается
+        только их частота между процессами. release() после reserve()
+        не вызывается.
+
+        Returns:
+            float: Сколько секунд нужно подождать перед запросом
+        """
+        with self._hold, self._file_lock:
+            return self._take_token()
+
+    def acquire(self) -> float:
+        self._hold.acquire()
+        try:
+            self._file_lock.acquire()
+            try:
+                wait = self._take_token()
+                if wait > 0:
+                    time.sleep(wait)
+            except BaseException:
+                self._file_lock.release()
+                raise
+        except BaseException:
+            self._hold.release()
+            raise
+        self._record(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        # Поток с acquire() нельзя прервать: при отмене ожидающей задачи
+        # блокировка, захваченная позже, освобождается по завершении потока
+        future = asyncio.ensure_future(asyncio.to_thread(self.acquire))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(self._release_abandoned)
+            raise
+
+    def _release_abandoned(self, future: "asyncio.Future") -> None:
+        """Освободить блокировку, полученную уже после отмены acquire_async()."""
+        if not future.cancelled() and future.exception() is None:
+            self.release()
+
+    def release(self) -> None:
+        if self._file_lock.is_locked:
+            self._file_lock.release()
+            self._hold.release()
+
+
+_limiters: Dict[str, InterProcessLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_interprocess_limiter(
+    key: str,
+    rate: float,
+    burst: int = 1,
+    lock_dir: Optional[Path] = None,
+) -> InterProcessLimiter:
+    """
+    Получить межпроцессный лимитер канала (один на процесс).
+
+    Args:
+        key: Ключ канала (rms_base_url)
+        rate: Запросов в секунду
+        burst: Емкость ведра
+        lock_dir: Каталог файлов блокировки
+
+    Returns:
+        InterProcessLimiter: Лимитер канала
+    """
+    path_key = str(lock_path_for(key, lock_dir))
+    with _registry_lock:
+        limiter = _limiters.get(path_key)
+        if limiter is None:
+            limiter = InterProcessLimiter(key, rate, burst, lock_dir=lock_dir)
+            _limiters[path_key] = limiter
+        return limiter
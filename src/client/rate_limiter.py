@@ -0,0 +1,259 @@
+"""
+Ограничение частоты запросов к iiko API.
+
+Лимитер выдает разрешение на запрос и сообщает, сколько нужно подождать.
+Само ожидание выполняет вызывающий код (time.sleep или asyncio.sleep),
+поэтому один и тот же лимитер подходит и синхронному, и асинхронному
+клиенту. Все лимитеры потокобезопасны и используют монотонные часы.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class RateLimiter:
+    """
+    Базовый класс лимитера.
+
+    Наследники реализуют reserve(); release() вызывается после
+    завершения запроса и нужен политикам, которые отсчитывают паузу
+    от конца предыдущего запроса.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Инициализация лимитера.
+
+        Args:
+            clock: Монотонные часы (секунды)
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.throttled_time = 0.0
+        self.throttled_count = 0
+
+    def reserve(self) -> float:
+        """
+        Занять разрешение на запрос.
+
+        Returns:
+            float: Сколько секунд нужно подождать перед запросом
+        """
+        raise NotImplementedError
+
+    def release(self) -> None:
+        """Отметить завершение запроса."""
+
+    def _record(self, wait: float) -> None:
+        if wait > 0:
+            with self._lock:
+                self.throttled_time += wait
+                self.throttled_count += 1
+
+    def acquire(self) -> float:
+        """
+        Дождаться разрешения на запрос (блокирующе).
+
+        Returns:
+            float: Время ожидания в секундах
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        self._record(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Дождаться разрешения на запрос (в event loop).
+
+        Returns:
+            float: Время ожидания в секундах
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record(wait)
+        return wait
+
+
+class TokenBucketLimiter(RateLimiter):
+    """
+    Лимитер "token bucket".
+
+    Ведро вмещает burst токенов и пополняется со скоростью rate токенов
+    в секунду. Каждый запрос забирает один токен; если ведро пусто,
+    запрос ждет появления токена. Пока идет долгий запрос, ведро
+    наполняется, поэтому следующий запрос не ждет зря, а серия быстрых
+    запросов проходит без пауз в пределах burst.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Инициализация лимитера.
+
+        Args:
+            rate: Скорость пополнения, запросов в секунду
+            burst: Емкость ведра (сколько запросов можно выполнить подряд)
+            clock: Монотонные часы (секунды)
+
+        Raises:
+            ValueError: Если rate <= 0 или burst < 1
+        """
+        if rate <= 0:
+            raise ValueError("rate должен быть больше 0")
+        if burst < 1:
+            raise ValueError("burst должен быть не меньше 1")
+        super().__init__(clock)
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Токены могут уйти в минус: так ожидающие запросы
+            # выстраиваются в очередь, а не получают одно и то же окно
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class FixedIntervalLimiter(RateLimiter):
+    """
+    Фиксированная пауза между концом предыдущего и началом следующего запроса.
+
+    Прежнее поведение HTTPClient (100 мс); оставлено для совместимости.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Инициализация лимитера.
+
+        Args:
+            min_interval: Минимальная пауза между запросами в секундах
+            clock: Монотонные часы (секунды)
+        """
+        super().__init__(clock)
+        self.min_interval = min_interval
+        self._last_end: Optional[float] = None
+        self._next_start = 0.0
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            start = now
+            if self._last_end is not None:
+                start = max(start, self._last_end + self.min_interval)
+            start = max(start, self._next_start)
+            self._next_start = start + self.min_interval
+            return start - now
+
+    def release(self) -> None:
+        with self._lock:
+            self._last_end = self._clock()
+
+
+# Политики и лимитеры по базовому URL
+_policies: Dict[str, Tuple[float, int]] = {}
+_limiters: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_rate_limit(base_url: str, rate: float, burst: int = 1) -> None:
+    """
+    Задать политику ограничения частоты для сервера.
+
+    Политика применяется к лимитерам, созданным после вызова;
+    существующий лимитер сервера пересоздается.
+
+    Args:
+        base_url: Базовый URL сервера iiko (rms_base_url)
+        rate: Запросов в секунду
+        burst: Сколько запросов можно выполнить подряд без паузы
+    """
+    key = base_url.rstrip("/")
+    with _registry_lock:
+        _policies[key] = (rate, burst)
+        _limiters.pop(key, None)
+
+
+def get_rate_limiter(base_url: str, rate: float, burst: int = 1) -> RateLimiter:
+    """
+    Получить общий для процесса лимитер сервера.
+
+    Все клиенты одного сервера (в том числе асинхронные) делят один лимитер.
+    Политика, заданная через configure_rate_limit, имеет приоритет над
+    переданными rate и burst.
+
+    Args:
+        base_url: Базовый URL сервера iiko (или другой ключ канала)
+        rate: Запросов в секунду по умолчанию
+        burst: Емкость ведра по умолчанию
+
+    Returns:
+        RateLimiter: Лимитер сервера
+    """
+    key = base_url.rstrip("/")
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rate, burst = _policies.get(key, (rate, burst))
+            limiter = TokenBucketLimiter(rate, burst)
+            _limiters[key] = limiter
+        return limiter
+
+
+def limiter_from_settings(settings, key: Optional[str] = None) -> RateLimiter:
+    """
+    Выбрать лимитер канала по настройкам приложения.
+
+    При cross_process_lock=True возвращается межпроцессный лимитер,
+    общий для всех процессов хоста, иначе — общий для процесса.
+
+    Args:
+        settings: Экземпляр Settings
+        key: Ключ канала (по умолчанию settings.rms_base_url)
+
+    Returns:
+        RateLimiter: Лимитер канала
+    """
+    key = key or settings.rms_base_url
+    if settings.cross_process_lock:
+        from .process_lock import get_interprocess_limiter
+
+        return get_interprocess_limiter(
+            key,
+            rate=settings.rate_limit_per_second,
+            burst=settings.rate_limit_burst,
+            lock_dir=settings.cross_process_lock_dir,
+        )
+    return get_rate_limiter(
+        key,
+        rate=settings.rate_limit_per_second,
+        burst=settings.rate_limit_burst,
+    )
+
+
+def reset_rate_limiters() -> None:
+    """Сбросить все лимитеры и политики (для тестирования)."""
+    with _registry_lock:
+        _policies.clear()
+        _limiters.clear()
@@ -0,0 +1,96 @@
+"""
+Логирование HTTP-запросов без лишней работы на горячем пути.
+
+- Аргументы сообщений передаются в %-стиле и форматируются, только если
+  запись будет выведена.
+- Превью тела декодирует не больше BODY_PREVIEW_BYTES байт и строится
+  только при включенном DEBUG — размер ответа не влияет на стоимость лога.
+- Строки INFO о запросах ограничены по частоте (LogSampler): под высокой
+  нагрузкой лишние записи пропускаются, а их количество сообщается в
+  следующей выведенной записи.
+- Поля запроса передаются в extra (http_method, http_endpoint,
+  http_status, http_elapsed_ms) для структурированных обработчиков.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Сколько байт тела показывать в DEBUG-логе
+BODY_PREVIEW_BYTES = 200
+
+# Параметры, значения которых не попадают в лог
+SECRET_PARAMS = frozenset({"key", "pass", "password"})
+
+
+def body_preview(content: Optional[bytes], encoding: Optional[str]) -> str:
+    """
+    Начало тела ответа для лога.
+
+    Args:
+        content: Тело ответа
+        encoding: Кодировка из заголовков (если не указана — UTF-8)
+
+    Returns:
+        str: Не больше BODY_PREVIEW_BYTES байт тела, декодированные с заменой ошибок
+    """
+    if not content:
+        return ""
+    preview = content[:BODY_PREVIEW_BYTES].decode(encoding or "utf-8", errors="replace")
+    if len(content) > BODY_PREVIEW_BYTES:
+        preview += f"... ({len(content)} байт)"
+    return preview
+
+
+def safe_params(params: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Параметры запроса со скрытыми токеном и паролем."""
+    if not params:
+        return {}
+    return {k: "***" if k in SECRET_PARAMS else v for k, v in params.items()}
+
+
+class LogSampler:
+    """
+    Ограничение числа записей в секунду.
+
+    Пример использования:
+        >>> sampler = LogSampler(20)
+        >>> allowed, skipped = sampler.allow()
+    """
+
+    def __init__(self, max_per_second: int):
+        """
+        Инициализация.
+
+        Args:
+            max_per_second: Сколько записей выводить в секунду (0 — без ограничения)
+        """
+        self.max_per_second = max_per_second
+        self._window = 0.0
+        self._count = 0
+        self._skipped = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> Tuple[bool, int]:
+        """
+        Можно ли вывести очередную запись.
+
+        Returns:
+            Tuple[bool, int]: Разрешение и количество записей, пропущенных
+                в предыдущих секундах (сообщается один раз)
+        """
+        if self.max_per_second <= 0:
+            return True, 0
+
+        now = time.monotonic()
+        with self._lock:
+            skipped = 0
+            if now - self._window >= 1.0:
+                skipped, self._skipped = self._skipped, 0
+                self._window = now
+                self._count = 0
+            if self._count < self.max_per_second:
+                self._count += 1
+                return True, skipped
+            self._skipped += 1
+            return False, 0
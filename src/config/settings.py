@@ -4,6 +4,7 @@
 """
 
 from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,6 +31,41 @@ class Settings(BaseSettings):
         description="Путь к файлу для хранения токена авторизации",
     )
 
+    token_ttl_seconds: int = Field(
+        default=3600,
+        description="Время жизни токена на сервере iiko в секундах",
+        ge=60,
+    )
+
+    token_refresh_margin_seconds: int = Field(
+        default=300,
+        description="За сколько секунд до истечения токена получать новый",
+        ge=0,
+    )
+
+    token_background_refresh: bool = Field(
+        default=False,
+        description="Обновлять токен в фоновом потоке, не дожидаясь следующего запроса",
+    )
+
+    token_shared: bool = Field(
+        default=False,
+        description="Делить токен между процессами хоста: авторизация под блокировкой, "
+        "logout при выходе последнего процесса",
+    )
+
+    session_mode: Literal["per_run", "keep_alive"] = Field(
+        default="per_run",
+        description="per_run — logout при выходе из SDK; keep_alive — токен сохраняется "
+        "между запусками, лицензию по простою освобождает session_keeper",
+    )
+
+    session_idle_timeout_seconds: int = Field(
+        default=900,
+        description="Через сколько секунд простоя session_keeper освобождает лицензию",
+        ge=1,
+    )
+
     # Настройки запросов
     request_timeout: int = Field(
         default=30, description="Таймаут для HTTP запросов в секундах", ge=1, le=300
@@ -42,6 +78,79 @@ class Settings(BaseSettings):
         le=10,
     )
 
+    rate_limit_per_second: float = Field(
+        default=10.0,
+        description="Средняя частота запросов к серверу (запросов в секунду)",
+        gt=0,
+    )
+
+    rate_limit_burst: int = Field(
+        default=5,
+        description="Сколько запросов подряд можно выполнить без паузы",
+        ge=1,
+    )
+
+    log_requests_per_second: int = Field(
+        default=20,
+        description="Сколько INFO-записей о запросах выводить в секунду (0 — без ограничения)",
+        ge=0,
+    )
+
+    cross_process_lock: bool = Field(
+        default=False,
+        description="Сериализовать запросы к серверу между всеми процессами хоста",
+    )
+
+    cross_process_lock_dir: Optional[Path] = Field(
+        default=None,
+        description="Каталог файлов межпроцессной блокировки (по умолчанию во временном каталоге)",
+    )
+
+    # Настройки кэша OLAP-отчетов
+    olap_cache_dir: Optional[Path] = Field(
+        default=None,
+        description="Каталог дискового кэша окон OLAP-отчетов (None — кэш выключен)",
+    )
+
+    olap_cache_max_mb: int = Field(
+        default=512,
+        description="Максимальный размер дискового кэша OLAP-отчетов в мегабайтах",
+        ge=1,
+    )
+
+    olap_cache_mutable_days: int = Field(
+        default=3,
+        description="Сколько последних дней всегда запрашиваются заново, минуя кэш",
+        ge=0,
+    )
+
+    olap_columns_cache_ttl_seconds: int = Field(
+        default=86400,
+        description="Время жизни кэша списка колонок OLAP в секундах (0 — кэш выключен)",
+        ge=0,
+    )
+
+    olap_columns_cache_dir: Optional[Path] = Field(
+        default=None,
+        description="Каталог кэша колонок (по умолчанию olap_cache_dir/columns "
+        "или .iiko-columns рядом с файлом токена)",
+    )
+
+    olap_validate_specs: bool = Field(
+        default=True,
+        description="Проверять поля OLAP-отчета по метаданным колонок до запроса",
+    )
+
+    olap_local_summary: bool = Field(
+        default=True,
+        description="Считать итоги отчетов по частям по строкам, запрашивая окна с summary=false",
+    )
+
+    olap_stream_responses: bool = Field(
+        default=False,
+        description="Разбирать ответы OLAP-отчетов потоком, не загружая тело целиком",
+    )
+
     @field_validator("rms_base_url")
     @classmethod
     def validate_base_url(cls, v: str) -> str:
@@ -8,8 +8,9 @@ from typing import Optional, Dict, Any
 import requests
 
 from .config import Settings, get_settings
-from .client import HTTPClient
+from .client import HTTPClient, Hooks, RateLimiter
 from .auth import AuthManager
+from .auth.auth_manager import is_token_rejected
 from .reports import OLAPReports
 
 logger = logging.getLogger(__name__)
@@ -38,17 +39,30 @@ class IikoSDK:
         >>> # Или с помощью context manager (автоматический logout)
         >>> with IikoSDK() as sdk:
         ...     response = sdk.request("GET", "/nomenclature")
+
+    В режиме session_mode="keep_alive" выход из context manager не
+    выполняет logout: токен переиспользуется следующим запуском, а
+    лицензию после простоя освобождает `python -m src.auth.session_keeper`.
     """
 
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        limiter: Optional[RateLimiter] = None,
+        hooks: Optional[Hooks] = None,
+    ):
         """
         Инициализация SDK клиента.
 
         Args:
             settings: Экземпляр настроек. Если None, будет создан автоматически.
+            limiter: Лимитер частоты запросов. Если None, используется
+                общий лимитер сервера (см. limiter_from_settings).
+            hooks: Реестр хуков запросов (можно разделять между клиентами).
+                Если None, создается пустой — см. свойство hooks.
         """
         self.settings = settings or get_settings()
-        self.http_client = HTTPClient(self.settings)
+        self.http_client = HTTPClient(self.settings, limiter=limiter, hooks=hooks)
         self.auth = AuthManager(self.settings, self.http_client)
         self._olap: Optional[OLAPReports] = None
 
@@ -74,6 +88,19 @@ class IikoSDK:
         """
         return self.auth.token
 
+    @property
+    def hooks(self) -> Hooks:
+        """
+        Получить реестр хуков запросов.
+
+        Пример:
+            >>> sdk.hooks.register("on_parse", lambda e: print(e.endpoint, e.timing))
+
+        Returns:
+            Hooks: Хуки HTTP клиента
+        """
+        return self.http_client.hooks
+
     @property
     def olap(self) -> OLAPReports:
         """
@@ -121,6 +148,11 @@ class IikoSDK:
         """
         Выполнить запрос к iiko API.
 
+        Если сервер отклоняет токен (401, либо 403 с упоминанием токена),
+        SDK один раз авторизуется заново и повторяет запрос. Поэтому
+        устаревший токен из файла не требует предварительной проверки
+        через validate_token().
+
         Args:
             method: HTTP метод (GET, POST, PUT, DELETE)
             endpoint: Конечная точка API (например, "/nomenclature")
@@ -139,13 +171,33 @@ class IikoSDK:
         url = f"{self.settings.rms_base_url}/{endpoint.lstrip('/')}"
 
         # Добавляем токен если требуется авторизация
+        token: Optional[str] = None
         if authenticated:
             token = self.auth.get_token()
-            if params is None:
-                params = {}
+            self.auth.touch()
+            params = dict(params or {})
             params["key"] = token
 
         # Выполняем запрос
+        try:
+            return self.http_client.request(
+                method=method,
+                url=url,
+                params=params,
+                data=data,
+                **kwargs
+            )
+        except requests.HTTPError as e:
+            response = e.response
+            if (
+                not authenticated
+                or response is None
+                or not is_token_rejected(response.status_code, response.text)
+            ):
+                raise
+
+        # Токен отклонен: авторизуемся заново и повторяем запрос один раз
+        params["key"] = self.auth.reauthenticate(stale_token=token)
         return self.http_client.request(
             method=method,
             url=url,
@@ -229,7 +281,10 @@ class IikoSDK:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.logout()
+        if self.settings.session_mode == "keep_alive":
+            self.auth.detach()
+        else:
+            self.logout()
         self.close()
 
     def __repr__(self) -> str:
@@ -1,5 +1,37 @@
 """Модуль для работы с отчетами iiko API."""
 
-from .olap import OLAPReports
+from .cache import OLAPCache
+from .chunking import DateWindow, plan_windows
+from .columns import ColumnCache, ColumnCatalog, ColumnInfo
+from .merge import MergeRule, MetricMerger, infer_rule
+from .olap import OLAPReport, OLAPReports, ReportSpec, coalesce_windows, merge_windows, plan_chunked
+from .async_olap import AsyncOLAPReports
+from .planner import MAX_REPORT_FIELDS, join_reports, plan_report
+from .store import OLAPStore, SyncResult
+from .validation import OLAPSpecError, validate_spec
 
-__all__ = ["OLAPReports"]
+__all__ = [
+    "OLAPReports",
+    "AsyncOLAPReports",
+    "OLAPReport",
+    "ReportSpec",
+    "DateWindow",
+    "plan_windows",
+    "plan_chunked",
+    "merge_windows",
+    "coalesce_windows",
+    "plan_report",
+    "join_reports",
+    "MAX_REPORT_FIELDS",
+    "OLAPCache",
+    "ColumnCache",
+    "ColumnCatalog",
+    "ColumnInfo",
+    "MergeRule",
+    "MetricMerger",
+    "infer_rule",
+    "OLAPStore",
+    "SyncResult",
+    "OLAPSpecError",
+    "validate_spec",
+]
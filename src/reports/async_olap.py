@@ -0,0 +1,211 @@
+"""
+Асинхронный модуль для работы с OLAP-отчетами iiko API.
+"""
+
+import logging
+from typing import Optional, Dict, Any, List
+
+from ..client.async_http_client import _import_httpx
+from .columns import ColumnCache, ColumnCatalog
+from .olap import (
+    STREAM_CHUNK_SIZE,
+    OLAPReport,
+    OLAPReports,
+    _build_v2_request,
+    _finish_v2_report,
+)
+from .streaming import OLAPStreamParser
+from .validation import validate_spec
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOLAPReports:
+    """
+    Асинхронный аналог OLAPReports.
+
+    Формирование запросов и разбор ответов общие с OLAPReports,
+    отличается только транспорт.
+    """
+
+    def __init__(self, sdk):
+        """
+        Инициализация модуля OLAP-отчетов.
+
+        Args:
+            sdk: Экземпляр AsyncIikoSDK
+        """
+        self.sdk = sdk
+        self.columns_cache: Optional[ColumnCache] = ColumnCache.from_settings(sdk.settings)
+        self.stream_responses: bool = sdk.settings.olap_stream_responses
+        self.validate_specs: bool = sdk.settings.olap_validate_specs
+        self._server_version: Optional[str] = None
+        self._server_version_checked = False
+
+    async def get_server_version(self) -> Optional[str]:
+        """
+        Версия сервера iiko (см. OLAPReports.get_server_version).
+
+        Returns:
+            Optional[str]: Версия сервера или None
+        """
+        if not self._server_version_checked:
+            httpx = _import_httpx()
+            try:
+                response = await self.sdk.get("/version")
+                self._server_version = response.text.strip() or None
+            except httpx.HTTPError as e:
+                logger.warning(f"Не удалось получить версию сервера: {e}")
+            self._server_version_checked = True
+        return self._server_version
+
+    async def get_columns(self, report_type: str = "SALES", refresh: bool = False) -> List[Dict[str, str]]:
+        """
+        Получить список доступных колонок для OLAP-отчетов.
+
+        Эндпоинт: GET /resto/api/v2/reports/olap/columns
+
+        Args:
+            report_type: Тип отчета (например, "SALES", "DELIVERIES", "TRANSACTIONS", "ORDERS")
+            refresh: Запросить список у сервера, минуя кэш
+
+        Returns:
+            List[Dict[str, str]]: Список колонок с их атрибутами
+
+        Raises:
+            httpx.HTTPError: Ошибка при выполнении запроса
+        """
+        catalog = await self.get_column_catalog(report_type, refresh=refresh)
+        return [dict(c) for c in catalog.columns]
+
+    async def get_column_catalog(self, report_type: str = "SALES", refresh: bool = False) -> ColumnCatalog:
+        """
+        Получить колонки отчета с индексами (см. OLAPReports.get_column_catalog).
+
+        Args:
+            report_type: Тип отчета
+            refresh: Запросить список у сервера, минуя кэш
+
+        Returns:
+            ColumnCatalog: Каталог колонок
+
+        Raises:
+            httpx.HTTPError: Ошибка при выполнении запроса
+        """
+        server = self.sdk.settings.rms_base_url
+        version = await self.get_server_version() if self.columns_cache is not None else None
+        if self.columns_cache is not None and not refresh:
+            catalog = self.columns_cache.get(server, report_type, version)
+            if catalog is not None:
+                return catalog
+
+        logger.info(f"Получение списка колонок OLAP для типа отчета: {report_type}")
+
+        response = await self.sdk.get(
+            "/v2/reports/olap/columns",
+            params={"reportType": report_type}
+        )
+
+        columns = OLAPReports._parse_columns(
+            response.text, response.headers.get('Content-Type', '')
+        )
+
+        logger.info(f"Получено колонок: {len(columns)}")
+        catalog = ColumnCatalog(report_type, columns)
+        if self.columns_cache is not None:
+            self.columns_cache.put(server, report_type, catalog, version)
+        return catalog
+
+    async def validate_spec(
+            self,
+            report_type: str,
+            group_by_row_fields: Optional[List[str]] = None,
+            aggregate_fields: Optional[List[str]] = None,
+            filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[ColumnCatalog]:
+        """
+        Проверить поля отчета по метаданным колонок (см. OLAPReports.validate_spec).
+
+        Returns:
+            Optional[ColumnCatalog]: Каталог, по которому проверен отчет
+            (None — проверка пропущена)
+
+        Raises:
+            OLAPSpecError: Поле не существует или недоступно для своей роли
+        """
+        httpx = _import_httpx()
+        try:
+            catalog = await self.get_column_catalog(report_type)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Не удалось получить колонки {report_type}, проверка пропущена: {e}")
+            return None
+        validate_spec(catalog, group_by_row_fields, aggregate_fields, filters)
+        return catalog
+
+    async def build_report_v2(
+            self,
+            report_type: str,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            group_by_row_fields: Optional[List[str]] = None,
+            aggregate_fields: Optional[List[str]] = None,
+            filters: Optional[Dict[str, Any]] = None,
+            summary: bool = True,
+            stream: Optional[bool] = None,
+            validate: Optional[bool] = None,
+    ) -> OLAPReport:
+        """
+        Построить OLAP-отчет (версия API v2).
+
+        Эндпоинт: POST /resto/api/v2/reports/olap
+
+        Параметры совпадают с OLAPReports.build_report_v2.
+
+        Returns:
+            OLAPReport: Отчет с колонками group_by_row_fields + aggregate_fields
+
+        Raises:
+            OLAPSpecError: Поля не прошли проверку по колонкам
+            httpx.HTTPError: Ошибка при выполнении запроса
+        """
+        if validate is None:
+            validate = self.validate_specs
+        if validate:
+            await self.validate_spec(report_type, group_by_row_fields, aggregate_fields, filters)
+
+        params, payload = _build_v2_request(
+            report_type, date_from, date_to,
+            group_by_row_fields, aggregate_fields, filters, summary,
+        )
+
+        if stream is None:
+            stream = self.stream_responses
+
+        response = await self.sdk.post(
+            "/v2/reports/olap",
+            params=params,
+            json=payload,
+            stream=stream,
+        )
+
+        group_by_row_fields = group_by_row_fields or []
+        aggregate_fields = aggregate_fields or []
+
+        if stream:
+            report = OLAPReport(group_by_row_fields, aggregate_fields)
+            parser = OLAPStreamParser(on_row=report.append_record)
+            try:
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    parser.feed(chunk)
+            finally:
+                await response.aclose()
+            data = parser.close()
+        else:
+            data = response.json()
+            report = OLAPReport.from_records(
+                group_by_row_fields,
+                aggregate_fields,
+                data.pop("data", None) or [],
+            )
+
+        return _finish_v2_report(report, data)
@@ -0,0 +1,218 @@
+"""
+Дисковый кэш частей OLAP-отчетов за закрытые периоды.
+
+Данные за прошедшие недели практически не меняются, поэтому окна,
+закончившиеся раньше "изменяемого горизонта", сохраняются на диск
+и при следующих запусках не запрашиваются у сервера повторно.
+Последние дни (горизонт) всегда запрашиваются заново: в них еще
+могут закрываться заказы.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ..utils import fingerprint, read_json_gz, write_json_gz
+from .chunking import DateWindow, format_datetime
+
+logger = logging.getLogger(__name__)
+
+# Версия формата записей; при изменении формата старые записи игнорируются
+CACHE_FORMAT_VERSION = 1
+
+
+class OLAPCache:
+    """
+    Контентно-адресуемый кэш окон OLAP-отчетов на диске.
+
+    Особенности:
+    - Ключ — SHA-256 от (сервер, тип отчета, группировки, агрегаты,
+      фильтры, окно, summary)
+    - Записи хранятся как JSON, сжатый gzip
+    - Вытеснение по LRU при превышении max_bytes (время доступа — mtime файла)
+    - Окна, пересекающие изменяемый горизонт, не кэшируются
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 512 * 1024 * 1024,
+        mutable_horizon: timedelta = timedelta(days=3),
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Инициализация кэша.
+
+        Args:
+            cache_dir: Каталог для хранения записей
+            max_bytes: Максимальный суммарный размер записей в байтах
+            mutable_horizon: Сколько последних дней (от начала текущих суток)
+                считаются изменяемыми и всегда запрашиваются заново
+            clock: Источник текущего времени
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.mutable_horizon = mutable_horizon
+        self._clock = clock
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["OLAPCache"]:
+        """
+        Создать кэш по настройкам приложения.
+
+        Args:
+            settings: Экземпляр Settings
+
+        Returns:
+            Optional[OLAPCache]: Кэш или None, если olap_cache_dir не задан
+        """
+        if settings.olap_cache_dir is None:
+            return None
+        return cls(
+            cache_dir=settings.olap_cache_dir,
+            max_bytes=settings.olap_cache_max_mb * 1024 * 1024,
+            mutable_horizon=timedelta(days=settings.olap_cache_mutable_days),
+        )
+
+    @property
+    def closed_before(self) -> datetime:
+        """Граница изменяемого горизонта: окна, закончившиеся до нее, закрыты."""
+        today = self._clock().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - self.mutable_horizon
+
+    def is_cacheable(self, window: DateWindow) -> bool:
+        """
+        Проверить, что окно целиком лежит в закрытом периоде.
+
+        Args:
+            window: Окно отчета
+
+        Returns:
+            bool: True если окно можно брать из кэша и сохранять в него
+        """
+        return window.end <= self.closed_before
+
+    @staticmethod
+    def make_key(
+        server: str,
+        report_type: str,
+        group_by_row_fields: list,
+        aggregate_fields: list,
+        filters: Dict[str, Any],
+        window: DateWindow,
+        summary: bool,
+    ) -> str:
+        """
+        Вычислить ключ записи.
+
+        Args:
+            server: Базовый URL сервера iiko
+            report_type: Тип отчета
+            group_by_row_fields: Поля группировки
+            aggregate_fields: Агрегируемые поля
+            filters: Фильтры отчета
+            window: Окно отчета
+            summary: Запрашивались ли итоги
+
+        Returns:
+            str: Hex-строка SHA-256
+        """
+        return fingerprint({
+            "version": CACHE_FORMAT_VERSION,
+            "server": server,
+            "reportType": report_type,
+            "groupByRowFields": list(group_by_row_fields),
+            "aggregateFields": list(aggregate_fields),
+            "filters": filters,
+            "window": [format_datetime(window.start), format_datetime(window.end)],
+            "summary": summary,
+        })
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Получить запись из кэша.
+
+        Args:
+            key: Ключ записи
+
+        Returns:
+            Optional[Dict[str, Any]]: Запись или None, если ее нет
+        """
+        path = self._path(key)
+        try:
+            entry = read_json_gz(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            logger.warning(f"Поврежденная запись кэша {path.name}, удаляю: {e}")
+            self._remove(path)
+            return None
+
+        if entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+
+        # Отмечаем использование для LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        logger.debug(f"Кэш: попадание {key[:12]}")
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Сохранить запись в кэш и при необходимости вытеснить старые.
+
+        Args:
+            key: Ключ записи
+            entry: Данные записи (JSON-сериализуемые)
+        """
+        entry = dict(entry, version=CACHE_FORMAT_VERSION)
+        try:
+            size = write_json_gz(self._path(key), entry)
+            logger.debug(f"Кэш: сохранено {key[:12]} ({size} байт)")
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить запись кэша: {e}")
+            return
+
+        self._evict()
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Удалить давно не использованные записи, пока размер кэша больше max_bytes."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logger.debug(f"Кэш: вытеснено {path.name}")
+
+    def clear(self) -> None:
+        """Удалить все записи кэша."""
+        for path in self.cache_dir.glob("*/*.json.gz"):
+            self._remove(path)
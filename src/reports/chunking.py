@@ -0,0 +1,185 @@
+"""
+Планирование временных окон для построения OLAP-отчетов по частям.
+
+iiko рекомендует запрашивать данные за период не длиннее одного месяца,
+а сервер обрабатывает запросы строго последовательно. Поэтому длинные
+периоды разбиваются на непересекающиеся полуинтервалы [from, to),
+каждый из которых запрашивается отдельным отчетом.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Union
+
+# Формат дат, который iiko ожидает в фильтре DateRange: "2026-01-01T00:00:00.000"
+ISO_MS = "%Y-%m-%dT%H:%M:%S.%f"
+
+CHUNK_SIZES = ("day", "week", "month")
+
+DateLike = Union[str, date, datetime]
+
+_INPUT_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+)
+
+
+def parse_datetime(value: DateLike) -> datetime:
+    """
+    Привести дату к datetime.
+
+    Args:
+        value: datetime, date или строка в одном из форматов
+            "yyyy-MM-ddTHH:mm:ss.SSS", "yyyy-MM-ddTHH:mm:ss",
+            "yyyy-MM-dd HH:mm:ss", "yyyy-MM-dd"
+
+    Returns:
+        datetime: Дата и время
+
+    Raises:
+        ValueError: Если строку не удалось распознать
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+
+    for fmt in _INPUT_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+    raise ValueError(f"Не удалось распознать дату: {value!r}")
+
+
+def format_datetime(dt: datetime) -> str:
+    """
+    Отформатировать дату для фильтра DateRange.
+
+    Args:
+        dt: Дата и время
+
+    Returns:
+        str: Строка вида "2026-01-01T00:00:00.000"
+    """
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{dt.microsecond // 1000:03d}"
+
+
+def floor_boundary(dt: DateLike, chunk: str) -> datetime:
+    """
+    Начало дня/недели (понедельник)/месяца, в котором лежит dt.
+
+    Это та же календарная сетка, по которой plan_windows режет период.
+
+    Args:
+        dt: Дата и время
+        chunk: Размер окна: "day", "week" или "month"
+
+    Returns:
+        datetime: Граница окна, содержащего dt
+    """
+    day = parse_datetime(dt).replace(hour=0, minute=0, second=0, microsecond=0)
+    if chunk == "week":
+        return day - timedelta(days=day.weekday())
+    if chunk == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_boundary(dt: datetime, chunk: str) -> datetime:
+    """Начало следующего дня/недели/месяца после dt (граница календарная)."""
+    start = floor_boundary(dt, chunk)
+
+    if chunk == "day":
+        return start + timedelta(days=1)
+
+    if chunk == "week":
+        return start + timedelta(days=7)
+
+    # month
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+@dataclass(frozen=True)
+class DateWindow:
+    """
+    Временное окно отчета — полуинтервал [start, end).
+    """
+
+    start: datetime
+    end: datetime
+
+    def to_filter(self) -> Dict[str, Any]:
+        """
+        Сформировать фильтр DateRange для этого окна.
+
+        Returns:
+            Dict[str, Any]: Фильтр в формате iiko API (includeHigh=False)
+        """
+        return {
+            "filterType": "DateRange",
+            "periodType": "CUSTOM",
+            "includeLow": True,
+            "includeHigh": False,
+            "from": format_datetime(self.start),
+            "to": format_datetime(self.end),
+        }
+
+    def __str__(self) -> str:
+        return f"[{format_datetime(self.start)}, {format_datetime(self.end)})"
+
+
+def plan_windows(
+    date_from: DateLike,
+    date_to: DateLike,
+    chunk: str = "week",
+) -> List[DateWindow]:
+    """
+    Разбить период [date_from, date_to) на окна по календарным границам.
+
+    Окна не пересекаются и покрывают период целиком: конец каждого окна
+    совпадает с началом следующего. Первое и последнее окна могут быть
+    неполными.
+
+    Args:
+        date_from: Начало периода (включительно)
+        date_to: Конец периода (не включительно)
+        chunk: Размер окна: "day", "week" (с понедельника) или "month"
+
+    Returns:
+        List[DateWindow]: Список окон в хронологическом порядке
+
+    Raises:
+        ValueError: Неизвестный размер окна или пустой период
+
+    Example:
+        >>> for window in plan_windows("2026-01-01", "2026-01-15", chunk="week"):
+        ...     print(window)
+        [2026-01-01T00:00:00.000, 2026-01-05T00:00:00.000)
+        [2026-01-05T00:00:00.000, 2026-01-12T00:00:00.000)
+        [2026-01-12T00:00:00.000, 2026-01-15T00:00:00.000)
+    """
+    if chunk not in CHUNK_SIZES:
+        raise ValueError(
+            f"Неизвестный размер окна: {chunk!r}. Допустимые значения: {', '.join(CHUNK_SIZES)}"
+        )
+
+    start = parse_datetime(date_from)
+    end = parse_datetime(date_to)
+
+    if start >= end:
+        raise ValueError(f"Пустой период: {format_datetime(start)} >= {format_datetime(end)}")
+
+    windows: List[DateWindow] = []
+    cur = start
+    while cur < end:
+        nxt = min(_next_boundary(cur, chunk), end)
+        windows.append(DateWindow(cur, nxt))
+        cur = nxt
+
+    return windows
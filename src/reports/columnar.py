@@ -0,0 +1,190 @@
+"""
+Колоночное хранение строк OLAP-отчета.
+
+Агрегаты хранятся в типизированных буферах array ("q" для целых,
+"d" для дробных), поля группировки — словарным кодированием:
+список уникальных значений плюс буфер кодов. Для отчетов в сотни тысяч
+строк это в разы компактнее списка списков Python-объектов и позволяет
+строить pandas.DataFrame без копирования буферов агрегатов.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Код отсутствующего значения измерения (совпадает с соглашением pandas.Categorical)
+MISSING_CODE = -1
+
+_NAN = float("nan")
+
+
+class DimensionColumn:
+    """
+    Словарно-кодированная колонка поля группировки.
+
+    Attributes:
+        values: Уникальные значения в порядке первого появления
+        codes: Код (индекс в values) для каждой строки, -1 для None
+    """
+
+    __slots__ = ("values", "codes", "_index")
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.codes = array("i")
+        self._index: Dict[Any, int] = {}
+
+    def encode(self, value: Any) -> int:
+        """
+        Получить код значения, добавив его в словарь при необходимости.
+
+        Args:
+            value: Значение измерения
+
+        Returns:
+            int: Код значения
+        """
+        if value is None:
+            return MISSING_CODE
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: Any) -> None:
+        """Добавить значение в конец колонки."""
+        self.codes.append(self.encode(value))
+
+    def extend(self, other: "DimensionColumn") -> None:
+        """
+        Дописать в конец колонки значения другой колонки.
+
+        Коды другой колонки перекодируются через словарь этой колонки
+        за один проход без раскодирования строк.
+        """
+        remap = [self.encode(v) for v in other.values]
+        self.codes.extend(
+            remap[code] if code != MISSING_CODE else MISSING_CODE
+            for code in other.codes
+        )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> Any:
+        code = self.codes[i]
+        return None if code == MISSING_CODE else self.values[code]
+
+    def __iter__(self) -> Iterator[Any]:
+        values = self.values
+        for code in self.codes:
+            yield None if code == MISSING_CODE else values[code]
+
+
+class MeasureColumn:
+    """
+    Колонка агрегируемого поля в типизированном буфере.
+
+    Пока приходят только целые числа, буфер имеет тип "q" (int64);
+    отсутствующие значения (None) отмечаются в маске valid, а сами числа
+    остаются целыми. При первом дробном значении буфер переводится
+    в "d" (float64), где None хранится как NaN. Если приходит нечисловое
+    значение, колонка переходит на обычный список Python-объектов.
+
+    Attributes:
+        data: Буфер значений
+        valid: Маска присутствия для буфера "q" (1 — значение есть, 0 — None)
+            или None, если пропусков нет
+    """
+
+    __slots__ = ("data", "valid")
+
+    def __init__(self):
+        self.data: Union[array, List[Any]] = array("q")
+        self.valid: Optional[bytearray] = None
+
+    @property
+    def typecode(self) -> str:
+        """Тип буфера: "q", "d" или "O" для списка объектов."""
+        data = self.data
+        return data.typecode if isinstance(data, array) else "O"
+
+    def _promote(self, value: Any) -> None:
+        """Перевести буфер в более общий тип, способный хранить value."""
+        data = self.data
+        if data.typecode == "q" and isinstance(value, (int, float)):
+            self.data = array("d", (_NAN if v is None else v for v in self))
+        else:
+            self.data = list(self)
+        self.valid = None
+
+    def append(self, value: Any) -> None:
+        """Добавить значение в конец колонки."""
+        data = self.data
+        if isinstance(data, list):
+            data.append(value)
+            return
+
+        try:
+            if data.typecode == "q":
+                if type(value) is int:
+                    data.append(value)
+                    if self.valid is not None:
+                        self.valid.append(1)
+                    return
+                if value is None:
+                    if self.valid is None:
+                        self.valid = bytearray(b"\x01") * len(data)
+                    data.append(0)
+                    self.valid.append(0)
+                    return
+            elif value is None:
+                data.append(_NAN)
+                return
+            elif isinstance(value, (int, float)):
+                data.append(value)
+                return
+        except OverflowError:
+            pass
+
+        self._promote(value)
+        self.append(value)
+
+    def extend(self, other: "MeasureColumn") -> None:
+        """Дописать в конец колонки значения другой колонки."""
+        if self.typecode != other.typecode:
+            for value in other:
+                self.append(value)
+            return
+
+        if self.valid is not None or other.valid is not None:
+            valid = self.valid if self.valid is not None else bytearray(b"\x01") * len(self.data)
+            valid.extend(other.valid if other.valid is not None else b"\x01" * len(other.data))
+            self.valid = valid
+        self.data.extend(other.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, i: int) -> Any:
+        if self.valid is not None and not self.valid[i]:
+            return None
+        value = self.data[i]
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        typecode = self.typecode
+        if typecode == "q" and self.valid is not None:
+            for value, present in zip(self.data, self.valid):
+                yield value if present else None
+            return
+        if typecode != "d":
+            yield from self.data
+            return
+        for value in self.data:
+            # NaN != NaN: так хранится отсутствующее значение
+            yield None if value != value else value
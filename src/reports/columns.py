@@ -0,0 +1,343 @@
+"""
+Метаданные колонок OLAP-отчетов: каталог с индексами и кэш.
+
+Список колонок (/v2/reports/olap/columns) меняется только при обновлении
+сервера, а скачивается и разбирается в начале каждого задания. Кэш
+хранит его в памяти процесса и на диске — по серверу, версии сервера
+и типу отчета, с временем жизни и версией формата записи.
+
+ColumnCatalog строит индексы по типу, тегам и признакам
+groupingAllowed/aggregationAllowed/filteringAllowed, поэтому выборки
+вида «все колонки типа AMOUNT» не требуют прохода по списку.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..utils import fingerprint, read_json_gz, write_json_gz
+
+logger = logging.getLogger(__name__)
+
+# Версия формата записей; при изменении формата старые записи игнорируются
+COLUMNS_CACHE_FORMAT_VERSION = 2
+
+# Каталог по умолчанию создается рядом с файлом токена (token_storage_path)
+DEFAULT_COLUMNS_CACHE_DIR_NAME = ".iiko-columns"
+
+
+def _flag(value: Any) -> bool:
+    """Признак колонки: в JSON-ответе "True"/"False", в XML — "true"/"false"."""
+    return str(value).strip().lower() == "true"
+
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    """
+    Описание колонки OLAP-отчета.
+
+    Attributes:
+        id: Имя поля для groupByRowFields/aggregateFields/filters
+        caption: Название колонки в интерфейсе iiko
+        type: Тип значения (STRING, DATE, MONEY, AMOUNT, ...)
+        tags: Теги (группы колонок)
+        grouping_allowed: Поле можно использовать в группировке
+        aggregation_allowed: Поле можно агрегировать
+        filtering_allowed: По полю можно фильтровать
+    """
+
+    id: str
+    caption: str
+    type: str
+    tags: Tuple[str, ...]
+    grouping_allowed: bool
+    aggregation_allowed: bool
+    filtering_allowed: bool
+
+    @classmethod
+    def from_column(cls, column: Dict[str, str]) -> "ColumnInfo":
+        """
+        Построить описание из элемента get_columns().
+
+        В JSON-ответе имя поля лежит в "id", а "name" — название;
+        в XML-ответе имя поля лежит в "name".
+        """
+        column_id = column.get("id") or column.get("name", "")
+        tags = column.get("tags") or ""
+        return cls(
+            id=column_id,
+            caption=column.get("caption") or column.get("name", column_id),
+            type=column.get("type", ""),
+            tags=tuple(t.strip() for t in tags.split(",") if t.strip()),
+            grouping_allowed=_flag(column.get("groupingAllowed")),
+            aggregation_allowed=_flag(column.get("aggregationAllowed")),
+            filtering_allowed=_flag(column.get("filteringAllowed")),
+        )
+
+
+class ColumnCatalog:
+    """
+    Колонки отчета с индексами.
+
+    Пример использования:
+        >>> catalog = sdk.olap.get_column_catalog("SALES")
+        >>> catalog["DishDiscountSumInt"].type
+        'MONEY'
+        >>> amounts = catalog.of_type("AMOUNT")
+        >>> groupable = catalog.groupable()
+    """
+
+    def __init__(self, report_type: str, columns: List[Dict[str, str]]):
+        """
+        Построить каталог и индексы.
+
+        Args:
+            report_type: Тип отчета
+            columns: Колонки в формате get_columns()
+        """
+        self.report_type = report_type
+        self.columns = columns
+
+        self._by_id: Dict[str, ColumnInfo] = {}
+        self._by_type: Dict[str, List[ColumnInfo]] = {}
+        self._by_tag: Dict[str, List[ColumnInfo]] = {}
+        self._groupable: List[ColumnInfo] = []
+        self._aggregatable: List[ColumnInfo] = []
+        self._filterable: List[ColumnInfo] = []
+
+        for column in columns:
+            info = ColumnInfo.from_column(column)
+            self._by_id[info.id] = info
+            self._by_type.setdefault(info.type, []).append(info)
+            for tag in info.tags:
+                self._by_tag.setdefault(tag, []).append(info)
+            if info.grouping_allowed:
+                self._groupable.append(info)
+            if info.aggregation_allowed:
+                self._aggregatable.append(info)
+            if info.filtering_allowed:
+                self._filterable.append(info)
+
+    def get(self, column_id: str) -> Optional[ColumnInfo]:
+        """Описание колонки по имени поля (None, если такой нет)."""
+        return self._by_id.get(column_id)
+
+    def __getitem__(self, column_id: str) -> ColumnInfo:
+        return self._by_id[column_id]
+
+    def __contains__(self, column_id: object) -> bool:
+        return column_id in self._by_id
+
+    def __iter__(self) -> Iterator[ColumnInfo]:
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def ids(self) -> List[str]:
+        """Имена всех полей."""
+        return list(self._by_id)
+
+    @property
+    def types(self) -> List[str]:
+        """Встречающиеся типы колонок."""
+        return list(self._by_type)
+
+    @property
+    def tags(self) -> List[str]:
+        """Встречающиеся теги."""
+        return list(self._by_tag)
+
+    def of_type(self, column_type: str) -> List[ColumnInfo]:
+        """Колонки типа column_type (например, "AMOUNT")."""
+        return list(self._by_type.get(column_type, ()))
+
+    def with_tag(self, tag: str) -> List[ColumnInfo]:
+        """Колонки с тегом tag."""
+        return list(self._by_tag.get(tag, ()))
+
+    def groupable(self) -> List[ColumnInfo]:
+        """Колонки, допустимые в groupByRowFields."""
+        return list(self._groupable)
+
+    def aggregatable(self) -> List[ColumnInfo]:
+        """Колонки, допустимые в aggregateFields."""
+        return list(self._aggregatable)
+
+    def filterable(self) -> List[ColumnInfo]:
+        """Колонки, по которым можно фильтровать."""
+        return list(self._filterable)
+
+    def __repr__(self) -> str:
+        return f"<ColumnCatalog(report_type={self.report_type!r}, columns={len(self)})>"
+
+
+# Кэш в памяти общий для всех клиентов процесса:
+# (сервер, версия сервера, тип отчета) -> (время, каталог)
+_memory: Dict[Tuple[str, Optional[str], str], Tuple[float, ColumnCatalog]] = {}
+_memory_lock = threading.Lock()
+
+
+class ColumnCache:
+    """
+    Кэш каталогов колонок в памяти процесса и на диске.
+
+    Особенности:
+    - Ключ — сервер, версия сервера и тип отчета: после обновления
+      сервера старые записи не используются
+    - Запись устаревает через ttl после загрузки с сервера
+    - Записи другой версии формата игнорируются
+    - Записи на диске — JSON, сжатый gzip, общий для процессов пользователя
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: timedelta = timedelta(days=1),
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Инициализация кэша.
+
+        Args:
+            cache_dir: Каталог записей на диске (None — только память)
+            ttl: Время жизни записи
+            clock: Источник текущего времени (секунды Unix)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.ttl = ttl
+        self._clock = clock
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["ColumnCache"]:
+        """
+        Создать кэш по настройкам приложения.
+
+        Каталог — olap_columns_cache_dir, иначе подкаталог columns кэша
+        OLAP-отчетов, иначе каталог .iiko-columns рядом с файлом токена
+        (token_storage_path): как и токен, кэш принадлежит пользователю,
+        а не лежит в общем временном каталоге.
+
+        Args:
+            settings: Экземпляр Settings
+
+        Returns:
+            Optional[ColumnCache]: Кэш или None, если olap_columns_cache_ttl_seconds = 0
+        """
+        if settings.olap_columns_cache_ttl_seconds == 0:
+            return None
+
+        cache_dir = settings.olap_columns_cache_dir
+        if cache_dir is None and settings.olap_cache_dir is not None:
+            cache_dir = settings.olap_cache_dir / "columns"
+        if cache_dir is None:
+            cache_dir = settings.token_storage_path.parent / DEFAULT_COLUMNS_CACHE_DIR_NAME
+        return cls(
+            cache_dir=cache_dir,
+            ttl=timedelta(seconds=settings.olap_columns_cache_ttl_seconds),
+        )
+
+    def _path(self, server: str, version: Optional[str], report_type: str) -> Path:
+        key = fingerprint({"server": server, "serverVersion": version, "reportType": report_type})
+        return self.cache_dir / f"{key}.json.gz"
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return self._clock() - fetched_at < self.ttl.total_seconds()
+
+    def get(
+        self,
+        server: str,
+        report_type: str,
+        version: Optional[str] = None,
+    ) -> Optional[ColumnCatalog]:
+        """
+        Получить каталог из кэша.
+
+        Args:
+            server: Базовый URL сервера iiko
+            report_type: Тип отчета
+            version: Версия сервера (None — неизвестна)
+
+        Returns:
+            Optional[ColumnCatalog]: Каталог или None, если записи нет или она устарела
+        """
+        with _memory_lock:
+            cached = _memory.get((server, version, report_type))
+        if cached is not None and self._fresh(cached[0]):
+            return cached[1]
+
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(server, version, report_type)
+        try:
+            entry = read_json_gz(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            logger.warning(f"Поврежденная запись кэша колонок {path.name}: {e}")
+            return None
+
+        if (
+            entry.get("version") != COLUMNS_CACHE_FORMAT_VERSION
+            or entry.get("server") != server
+            or entry.get("serverVersion") != version
+            or entry.get("reportType") != report_type
+            or not self._fresh(entry.get("fetched_at", 0))
+        ):
+            return None
+
+        catalog = ColumnCatalog(report_type, entry["columns"])
+        with _memory_lock:
+            _memory[(server, version, report_type)] = (entry["fetched_at"], catalog)
+        logger.debug(f"Кэш колонок: {report_type} загружен с диска")
+        return catalog
+
+    def put(
+        self,
+        server: str,
+        report_type: str,
+        catalog: ColumnCatalog,
+        version: Optional[str] = None,
+    ) -> None:
+        """
+        Сохранить каталог, только что полученный с сервера.
+
+        Args:
+            server: Базовый URL сервера iiko
+            report_type: Тип отчета
+            catalog: Каталог колонок
+            version: Версия сервера (None — неизвестна)
+        """
+        fetched_at = self._clock()
+        with _memory_lock:
+            _memory[(server, version, report_type)] = (fetched_at, catalog)
+
+        if self.cache_dir is None:
+            return
+        try:
+            write_json_gz(self._path(server, version, report_type), {
+                "version": COLUMNS_CACHE_FORMAT_VERSION,
+                "server": server,
+                "serverVersion": version,
+                "reportType": report_type,
+                "fetched_at": fetched_at,
+                "columns": catalog.columns,
+            })
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить кэш колонок: {e}")
+
+    def invalidate(self, server: str, report_type: str, version: Optional[str] = None) -> None:
+        """Удалить запись (например, если колонки изменились без смены версии)."""
+        with _memory_lock:
+            _memory.pop((server, version, report_type), None)
+        if self.cache_dir is not None:
+            try:
+                self._path(server, version, report_type).unlink()
+            except OSError:
+                pass
@@ -0,0 +1,430 @@
+"""
+Слияние агрегатов OLAP-отчетов с учетом вида метрики.
+
+При построении отчета по частям значения одного агрегата из разных окон
+(и итоги окон) нужно объединять. Простое сложение верно только для сумм:
+средние, проценты и количества уникальных объектов так объединять нельзя.
+Вид слияния (MergeRule) выводится из метаданных колонки (тип) и имени
+поля, а для отдельных полей задается явно в ReportSpec.merge_rules.
+
+Виды слияния:
+- sum — значения складываются (MONEY, AMOUNT, INTEGER, DURATION_IN_SECONDS)
+- min, max — минимум и максимум
+- avg — среднее, взвешенное по другому агрегату отчета (weight)
+- distinct — количество уникальных объектов (UniqOrderId.OrdersCount):
+  складывается между окнами по дате (объект относится к одному дню),
+  но не между строками разных групп
+- none — значения не объединяются (PERCENT и неизвестные случаи);
+  отчет с такими агрегатами без даты в группировке строится одним
+  запросом за весь период, а не по окнам
+
+Если для всех агрегатов итог вычисляется по строкам (sum, min, max, avg
+при наличии веса), итоги отчета по частям считаются локально и окна
+запрашиваются с summary=false, как рекомендует iiko для крупных сетей.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+from .columns import ColumnCatalog, ColumnInfo
+
+logger = logging.getLogger(__name__)
+
+MERGE_SUM = "sum"
+MERGE_MIN = "min"
+MERGE_MAX = "max"
+MERGE_AVG = "avg"
+MERGE_DISTINCT = "distinct"
+MERGE_NONE = "none"
+
+MERGE_KINDS = (MERGE_SUM, MERGE_MIN, MERGE_MAX, MERGE_AVG, MERGE_DISTINCT, MERGE_NONE)
+
+# Типы колонок, значения которых складываются
+ADDITIVE_TYPES = frozenset({"MONEY", "AMOUNT", "INTEGER", "DURATION_IN_SECONDS"})
+
+# Знаков после запятой в суммах дробных значений: убирает шум двоичного
+# представления (12345.6 + 7.1 = 12352.699999999999), чтобы сумма по окнам
+# совпадала со значением из ответа за весь период
+SUM_DIGITS = 9
+
+# Виды, для которых итог можно посчитать по строкам отчета
+LOCAL_SUMMARY_KINDS = frozenset({MERGE_SUM, MERGE_MIN, MERGE_MAX, MERGE_AVG})
+
+
+@dataclass(frozen=True)
+class MergeRule:
+    """
+    Правило слияния значений агрегата.
+
+    Attributes:
+        kind: Вид слияния из MERGE_KINDS
+        weight: Поле-вес для kind="avg" (например, UniqOrderId.OrdersCount
+            для среднего чека)
+    """
+
+    kind: str
+    weight: Optional[str] = None
+
+    def __post_init__(self):
+        if self.kind not in MERGE_KINDS:
+            raise ValueError(
+                f"Неизвестный вид слияния {self.kind!r}, допустимые: {', '.join(MERGE_KINDS)}"
+            )
+        if self.kind == MERGE_AVG and not self.weight:
+            raise ValueError("Для вида слияния avg нужно поле-вес (weight)")
+
+    @classmethod
+    def parse(cls, value: Union[str, "MergeRule"]) -> "MergeRule":
+        """
+        Привести правило к MergeRule.
+
+        Args:
+            value: MergeRule или строка "sum", "min", "max", "distinct",
+                "none", "avg:<поле-вес>"
+
+        Returns:
+            MergeRule: Правило
+
+        Raises:
+            ValueError: Неизвестный вид слияния или avg без веса
+        """
+        if isinstance(value, MergeRule):
+            return value
+        kind, _, weight = str(value).partition(":")
+        return cls(kind.strip().lower(), weight.strip() or None)
+
+
+def infer_rule(field: str, info: Optional[ColumnInfo] = None) -> MergeRule:
+    """
+    Вывести правило слияния по имени поля и метаданным колонки.
+
+    Args:
+        field: Имя агрегируемого поля
+        info: Описание колонки (None — метаданные недоступны)
+
+    Returns:
+        MergeRule: Правило; без метаданных числа складываются, как раньше
+    """
+    name = field.lower()
+    suffix = name.rsplit(".", 1)[-1]
+
+    if suffix in ("min", "minimum"):
+        return MergeRule(MERGE_MIN)
+    if suffix in ("max", "maximum"):
+        return MergeRule(MERGE_MAX)
+    # Среднее без известного веса объединить нельзя — вес задается явно
+    if "average" in suffix or suffix == "avg" or "percent" in name:
+        return MergeRule(MERGE_NONE)
+    if name.startswith("uniq"):
+        return MergeRule(MERGE_DISTINCT)
+
+    if info is None or info.type in ADDITIVE_TYPES:
+        return MergeRule(MERGE_SUM)
+    return MergeRule(MERGE_NONE)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _combine(kind: str, av: Any, bv: Any, aw: Any = None, bw: Any = None) -> Any:
+    """Объединить два значения агрегата; aw, bw — веса (для avg)."""
+    if kind == MERGE_NONE:
+        return None
+    if av is None:
+        return bv
+    if bv is None:
+        return av
+    if not (_is_number(av) and _is_number(bv)):
+        return av
+
+    if kind in (MERGE_SUM, MERGE_DISTINCT):
+        total = av + bv
+        return round(total, SUM_DIGITS) if isinstance(total, float) else total
+    if kind == MERGE_MIN:
+        return min(av, bv)
+    if kind == MERGE_MAX:
+        return max(av, bv)
+
+    if not _is_number(aw) or not _is_number(bw) or aw + bw == 0:
+        return None
+    return (av * aw + bv * bw) / (aw + bw)
+
+
+class MetricMerger:
+    """
+    Слияние значений агрегатов отчета по правилам.
+
+    Пример использования:
+        >>> merger = MetricMerger.for_spec(spec, sdk.olap.get_column_catalog("SALES"))
+        >>> merger.rules["DishDiscountSumInt.average"]
+        MergeRule(kind='none', weight=None)
+        >>> total = merger.merge(summary_a, summary_b)
+    """
+
+    def __init__(self, aggregate_fields: Iterable[str], rules: Mapping[str, MergeRule]):
+        """
+        Инициализация.
+
+        Args:
+            aggregate_fields: Агрегируемые поля отчета
+            rules: Правила по полям (для отсутствующих — sum)
+
+        Raises:
+            ValueError: Поле-вес среднего не входит в aggregate_fields
+        """
+        self.aggregate_fields: List[str] = list(aggregate_fields)
+        self.rules: Dict[str, MergeRule] = {}
+        for f in self.aggregate_fields:
+            rule = rules.get(f, MergeRule(MERGE_SUM))
+            if rule.kind == MERGE_AVG and rule.weight not in self.aggregate_fields:
+                raise ValueError(
+                    f"Поле-вес {rule.weight} для среднего {f} не запрошено в отчете: "
+                    "добавьте его в aggregate_fields"
+                )
+            self.rules[f] = rule
+
+        # (вид, индекс веса) по позициям aggregate_fields для merge_values
+        position = {f: i for i, f in enumerate(self.aggregate_fields)}
+        self._plan = [
+            (rule.kind, position.get(rule.weight)) for rule in self.rules.values()
+        ]
+
+    @classmethod
+    def for_spec(cls, spec, catalog: Optional[ColumnCatalog] = None) -> "MetricMerger":
+        """
+        Построить правила для отчета.
+
+        Правила из spec.merge_rules имеют приоритет над выведенными
+        по метаданным (infer_rule).
+
+        Args:
+            spec: Описание отчета (ReportSpec)
+            catalog: Каталог колонок отчета (None — только по именам полей)
+
+        Returns:
+            MetricMerger: Правила слияния для spec.aggregate_fields
+
+        Raises:
+            ValueError: Некорректное правило в spec.merge_rules или поле-вес
+                среднего не входит в spec.aggregate_fields
+        """
+        overrides = {f: MergeRule.parse(r) for f, r in (spec.merge_rules or {}).items()}
+        rules = {
+            f: overrides.get(f) or infer_rule(f, catalog.get(f) if catalog is not None else None)
+            for f in spec.aggregate_fields
+        }
+        return cls(spec.aggregate_fields, rules)
+
+    @property
+    def unmergeable(self) -> List[str]:
+        """Агрегаты вида none: их значения из разных окон не объединяются."""
+        return [f for f, r in self.rules.items() if r.kind == MERGE_NONE]
+
+    @property
+    def local_summary(self) -> bool:
+        """Итог по всем агрегатам вычисляется по строкам отчета."""
+        return all(r.kind in LOCAL_SUMMARY_KINDS for r in self.rules.values())
+
+    def merge(
+        self,
+        a: Optional[Mapping[str, Any]],
+        b: Optional[Mapping[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Объединить значения агрегатов двух непересекающихся частей.
+
+        Подходит и для итогов окон, и для строк одной группы из разных
+        окон. Средние взвешиваются по значениям веса до слияния.
+
+        Args:
+            a: Значения {поле: значение} первой части или None
+            b: Значения второй части или None
+
+        Returns:
+            Optional[Dict[str, Any]]: Объединенные значения (None, если обе части None)
+        """
+        if a is None:
+            return dict(b) if b is not None else None
+        if b is None:
+            return dict(a)
+        rules = self.rules
+        merged: Dict[str, Any] = {}
+        for f in dict.fromkeys([*a, *b]):
+            rule = rules.get(f, MergeRule(MERGE_SUM))
+            weight = rule.weight
+            merged[f] = _combine(
+                rule.kind, a.get(f), b.get(f),
+                a.get(weight) if weight else None, b.get(weight) if weight else None,
+            )
+        return merged
+
+    def merge_values(self, a: Sequence[Any], b: Sequence[Any]) -> List[Any]:
+        """
+        Объединить значения агрегатов двух строк одной группы.
+
+        Args:
+            a: Значения в порядке aggregate_fields
+            b: Значения в том же порядке
+
+        Returns:
+            List[Any]: Объединенные значения
+        """
+        return [
+            _combine(
+                kind, av, bv,
+                a[weight] if weight is not None else None,
+                b[weight] if weight is not None else None,
+            )
+            for (kind, weight), av, bv in zip(self._plan, a, b)
+        ]
+
+    def summarize(self, report) -> Dict[str, Any]:
+        """
+        Посчитать общие итоги по строкам отчета.
+
+        Для distinct и none итог по строкам не вычисляется (None).
+
+        Args:
+            report: OLAPReport с агрегатами aggregate_fields
+
+        Returns:
+            Dict[str, Any]: Итоги {поле: значение}
+        """
+        summary: Dict[str, Any] = {}
+        for f in self.aggregate_fields:
+            rule = self.rules[f]
+            values = [v for v in report.measures[f] if _is_number(v)]
+
+            if rule.kind == MERGE_SUM:
+                total = math.fsum(values) if any(isinstance(v, float) for v in values) else sum(values)
+                summary[f] = round(total, SUM_DIGITS) if isinstance(total, float) else total
+            elif rule.kind == MERGE_MIN:
+                summary[f] = min(values) if values else None
+            elif rule.kind == MERGE_MAX:
+                summary[f] = max(values) if values else None
+            elif rule.kind == MERGE_AVG:
+                total = weight = 0
+                for v, w in zip(report.measures[f], report.measures[rule.weight]):
+                    if _is_number(v) and _is_number(w):
+                        total += v * w
+                        weight += w
+                summary[f] = total / weight if weight else None
+            else:
+                summary[f] = None
+        return summary
+
+
+class GroupAccumulator:
+    """
+    Слияние строк отчетов по ключу группировки.
+
+    Строки окон добавляются по мере поступления; для каждой группы
+    хранится одна строка, поэтому память ограничена количеством групп,
+    а не суммой строк всех окон. Агрегаты группы, пришедшей в нескольких
+    окнах, объединяются по правилам MetricMerger.
+
+    Пример использования:
+        >>> acc = GroupAccumulator(["Department"], merger)
+        >>> for part in parts:
+        ...     acc.add(part)
+        >>> rows = list(acc.rows())
+    """
+
+    def __init__(self, group_by_row_fields: Iterable[str], merger: MetricMerger):
+        """
+        Инициализация.
+
+        Args:
+            group_by_row_fields: Поля группировки (ключ слияния)
+            merger: Правила слияния агрегатов
+        """
+        self.group_by_row_fields: List[str] = list(group_by_row_fields)
+        self.merger = merger
+        self._index: Dict[tuple, int] = {}
+        self._keys: List[tuple] = []
+        self._values: List[List[Any]] = [[] for _ in merger.aggregate_fields]
+
+        # Средние объединяются раньше остальных: им нужны веса до слияния
+        plan = list(enumerate(merger._plan))
+        self._order = [p for p in plan if p[1][0] == MERGE_AVG] + [
+            p for p in plan if p[1][0] != MERGE_AVG
+        ]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, part) -> None:
+        """
+        Добавить строки отчета за очередное окно.
+
+        Args:
+            part: OLAPReport с теми же полями группировки и агрегатами
+
+        Raises:
+            ValueError: Группа пришла повторно, а среди агрегатов есть
+                несливаемые (вид none) — результат был бы None
+        """
+        index = self._index
+        keys = self._keys
+        known = len(keys)
+
+        dimensions = [part.dimensions[f] for f in self.group_by_row_fields]
+        part_keys = zip(*dimensions) if dimensions else (() for _ in range(len(part)))
+        positions: List[int] = []
+        for key in part_keys:
+            position = index.get(key)
+            if position is None:
+                position = index[key] = len(keys)
+                keys.append(key)
+            positions.append(position)
+
+        added = len(keys) - known
+        columns = [list(part.measures[f]) for f in self.merger.aggregate_fields]
+        for acc in self._values:
+            acc.extend([None] * added)
+
+        for j, (kind, weight) in self._order:
+            acc = self._values[j]
+            column = columns[j]
+            if kind in (MERGE_SUM, MERGE_DISTINCT):
+                for position, value in zip(positions, column):
+                    current = acc[position]
+                    if position >= known or current is None:
+                        acc[position] = value
+                    elif value is not None:
+                        total = current + value
+                        acc[position] = round(total, SUM_DIGITS) if type(total) is float else total
+                continue
+
+            if kind == MERGE_NONE and known and any(p < known for p in positions):
+                raise ValueError(
+                    f"Агрегат {self.merger.aggregate_fields[j]} (вид none) нельзя "
+                    "объединить между окнами: постройте отчет одним запросом "
+                    "или задайте правило в merge_rules"
+                )
+
+            weights = self._values[weight] if weight is not None else None
+            part_weights = columns[weight] if weight is not None else None
+            for i, (position, value) in enumerate(zip(positions, column)):
+                if position >= known:
+                    acc[position] = value
+                else:
+                    acc[position] = _combine(
+                        kind, acc[position], value,
+                        weights[position] if weights is not None else None,
+                        part_weights[i] if part_weights is not None else None,
+                    )
+
+    def rows(self) -> Iterator[List[Any]]:
+        """
+        Строки групп в порядке первого появления.
+
+        Returns:
+            Iterator[List[Any]]: Значения полей группировки, затем агрегатов
+        """
+        values = self._values
+        for position, key in enumerate(self._keys):
+            yield list(key) + [acc[position] for acc in values]
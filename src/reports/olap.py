@@ -6,28 +6,502 @@
 
 import json
 import logging
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Sequence, Tuple, Union
+from dataclasses import dataclass, field, replace
 from xml.etree import ElementTree as ET
 
+import requests
+
+from .cache import OLAPCache
+from .columns import ColumnCache, ColumnCatalog
+from .chunking import DateLike, DateWindow, floor_boundary, format_datetime, parse_datetime, plan_windows
+from .columnar import DimensionColumn, MeasureColumn
+from .merge import GroupAccumulator, MetricMerger
+from .streaming import parse_olap_stream
+from .validation import validate_spec
+
 logger = logging.getLogger(__name__)
 
+# Поле, по которому по умолчанию режется период при построении по частям
+DEFAULT_DATE_FIELD = "OpenDate.Typed"
+
+# Размер куска тела ответа при потоковом разборе
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
 @dataclass
+class ReportSpec:
+    """
+    Описание OLAP-отчета (v2) без привязки к периоду.
+
+    Attributes:
+        report_type: Тип отчета (например, "SALES")
+        group_by_row_fields: Поля группировки строк
+        aggregate_fields: Агрегируемые поля
+        filters: Дополнительные фильтры (без фильтра по дате)
+        summary: Нужны ли общие итоги
+        merge_rules: Правила слияния агрегатов при построении по частям
+            {поле: MergeRule или "sum"/"min"/"max"/"distinct"/"none"/"avg:<вес>"},
+            перекрывающие выведенные по метаданным колонок
+    """
+
+    report_type: str
+    group_by_row_fields: List[str] = field(default_factory=list)
+    aggregate_fields: List[str] = field(default_factory=list)
+    filters: Dict[str, Any] = field(default_factory=dict)
+    summary: bool = True
+    merge_rules: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def columns(self) -> List[str]:
+        """Колонки итогового отчета: сначала группировки, затем агрегаты."""
+        return list(self.group_by_row_fields) + list(self.aggregate_fields)
+
+
 class OLAPReport:
-    columns: List[str]
-    rows: List[List[Any]]
+    """
+    Результат OLAP-отчета в колоночном представлении.
+
+    Поля группировки хранятся словарно-кодированными (DimensionColumn),
+    агрегаты — в типизированных буферах (MeasureColumn). Строки
+    материализуются только по требованию: iter_rows()/iter_dicts() ленивые,
+    to_pandas() строит DataFrame поверх буферов.
+
+    Attributes:
+        group_by_row_fields: Поля группировки строк
+        aggregate_fields: Агрегируемые поля
+        dimensions: Колонки полей группировки
+        measures: Колонки агрегируемых полей
+        summary: Общие итоги {поле: значение} или None
+        raw: Служебная часть ответа сервера без массива data
+    """
+
+    def __init__(
+        self,
+        group_by_row_fields: List[str],
+        aggregate_fields: List[str],
+        summary: Optional[Dict[str, Any]] = None,
+        raw: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Создать пустой отчет с заданной схемой.
+
+        Args:
+            group_by_row_fields: Поля группировки строк
+            aggregate_fields: Агрегируемые поля
+            summary: Общие итоги
+            raw: Служебная часть ответа сервера
+        """
+        self.group_by_row_fields = list(group_by_row_fields)
+        self.aggregate_fields = list(aggregate_fields)
+        self.dimensions: Dict[str, DimensionColumn] = {
+            f: DimensionColumn() for f in self.group_by_row_fields
+        }
+        self.measures: Dict[str, MeasureColumn] = {
+            f: MeasureColumn() for f in self.aggregate_fields
+        }
+        self.summary = summary
+        self.raw = raw if raw is not None else {}
 
-    summary: Optional[Dict[str, Any]]
-    raw: Dict[str, Any]
+    @property
+    def columns(self) -> List[str]:
+        """Колонки отчета: сначала группировки, затем агрегаты."""
+        return self.group_by_row_fields + self.aggregate_fields
+
+    def _column_list(self) -> List[Any]:
+        return [self.dimensions[f] for f in self.group_by_row_fields] + [
+            self.measures[f] for f in self.aggregate_fields
+        ]
+
+    def append(self, row: Sequence[Any]) -> None:
+        """
+        Добавить строку-список (значения в порядке columns).
+
+        Args:
+            row: Значения строки
+        """
+        for column, value in zip(self._column_list(), row):
+            column.append(value)
+
+    def append_record(self, record: Union[Dict[str, Any], Sequence[Any]]) -> None:
+        """
+        Добавить строку в формате ответа сервера {поле: значение}.
+
+        Строки-списки (значения в порядке columns) тоже принимаются.
+
+        Args:
+            record: Строка отчета
+        """
+        if not isinstance(record, dict):
+            self.append(record)
+            return
+        get = record.get
+        for f, column in self.dimensions.items():
+            column.append(get(f))
+        for f, column in self.measures.items():
+            column.append(get(f))
+
+    def extend(self, other: "OLAPReport") -> None:
+        """
+        Дописать строки другого отчета с той же схемой.
+
+        Args:
+            other: Отчет с теми же полями группировки и агрегатами
+
+        Raises:
+            ValueError: Если схемы отчетов различаются
+        """
+        if other.columns != self.columns:
+            raise ValueError(
+                f"Нельзя объединить отчеты с разными колонками: "
+                f"{self.columns} и {other.columns}"
+            )
+        for f, column in self.dimensions.items():
+            column.extend(other.dimensions[f])
+        for f, column in self.measures.items():
+            column.extend(other.measures[f])
+
+    def __len__(self) -> int:
+        for column in self._column_list():
+            return len(column)
+        return 0
+
+    def iter_rows(self) -> Iterator[List[Any]]:
+        """
+        Лениво перебрать строки отчета как списки значений.
+
+        Returns:
+            Iterator[List[Any]]: Строки в порядке columns
+        """
+        for values in zip(*self._column_list()):
+            yield list(values)
+
+    @property
+    def rows(self) -> List[List[Any]]:
+        """
+        Строки отчета списком списков.
+
+        Материализует весь отчет; для больших отчетов используйте
+        iter_rows(), iter_dicts() или to_pandas().
+        """
+        return list(self.iter_rows())
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """
+        Лениво преобразовать строки отчета в dict.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Строки {поле: значение}
+        """
+        columns = self.columns
+        for values in zip(*self._column_list()):
+            yield dict(zip(columns, values))
 
     def to_dicts(self) -> List[Dict[str, Any]]:
         """
-        Преобразовать строки отчета в list[dict]
+        Преобразовать строки отчета в list[dict].
+
+        Материализует весь отчет; для больших отчетов используйте iter_dicts().
         """
-        return [
-            dict(zip(self.columns, row))
-            for row in self.rows
-        ]
+        return list(self.iter_dicts())
+
+    def to_pandas(self):
+        """
+        Построить pandas.DataFrame поверх колоночных буферов.
+
+        Агрегаты передаются в pandas без копирования (numpy-представление
+        буферов array), поля группировки — как Categorical из кодов
+        и словаря значений. Целые агрегаты с пропусками становятся
+        nullable Int64. Пока DataFrame жив, буферы агрегатов
+        экспортированы и дописывать строки в отчет нельзя (BufferError).
+
+        Returns:
+            pandas.DataFrame: Таблица с колонками columns
+
+        Raises:
+            ImportError: Если pandas не установлен
+        """
+        import numpy as np
+        import pandas as pd
+
+        frame: Dict[str, Any] = {}
+        for f, dim in self.dimensions.items():
+            codes = np.frombuffer(dim.codes, dtype=np.int32) if len(dim) else np.empty(0, np.int32)
+            frame[f] = pd.Categorical.from_codes(codes, categories=pd.Index(dim.values, dtype=object))
+        for f, measure in self.measures.items():
+            data = measure.data
+            if measure.typecode == "q":
+                values = np.frombuffer(data, dtype=np.int64) if len(data) else np.empty(0, np.int64)
+                if measure.valid is not None:
+                    # Пропуски — nullable Int64 с маской, числа остаются целыми
+                    missing = np.frombuffer(measure.valid, dtype=np.uint8) == 0
+                    values = pd.arrays.IntegerArray(values, missing)
+                frame[f] = values
+            elif measure.typecode == "d":
+                frame[f] = np.frombuffer(data, dtype=np.float64) if len(data) else np.empty(0, np.float64)
+            else:
+                frame[f] = np.array(data, dtype=object)
+
+        return pd.DataFrame(frame, columns=self.columns, copy=False)
+
+    @classmethod
+    def from_records(
+        cls,
+        group_by_row_fields: List[str],
+        aggregate_fields: List[str],
+        records: Iterable[Any],
+        summary: Optional[Dict[str, Any]] = None,
+        raw: Optional[Dict[str, Any]] = None,
+    ) -> "OLAPReport":
+        """
+        Построить отчет из строк ответа сервера.
+
+        Args:
+            group_by_row_fields: Поля группировки строк
+            aggregate_fields: Агрегируемые поля
+            records: Строки {поле: значение} или списки в порядке колонок
+            summary: Общие итоги
+            raw: Служебная часть ответа сервера
+
+        Returns:
+            OLAPReport: Заполненный отчет
+        """
+        report = cls(group_by_row_fields, aggregate_fields, summary=summary, raw=raw)
+        for record in records:
+            report.append_record(record)
+        return report
+
+    def __repr__(self) -> str:
+        return f"<OLAPReport(columns={self.columns}, rows={len(self)})>"
+
+
+def _extract_summary(
+    raw_summary: Any,
+    group_by_row_fields: List[str],
+    aggregate_fields: List[str],
+) -> Optional[Dict[str, Any]]:
+    """
+    Извлечь общие итоги по агрегируемым полям.
+
+    Поддерживаются варианты ответа:
+    - список значений по всем колонкам (группировки, затем агрегаты);
+    - список пар [группы, значения], где общий итог — пара с пустыми группами;
+    - словарь {поле: значение}.
+    """
+    if not raw_summary or not aggregate_fields:
+        return None
+
+    if isinstance(raw_summary, dict):
+        return {f: raw_summary.get(f) for f in aggregate_fields}
+
+    first = raw_summary[0]
+    if isinstance(first, (list, tuple)) and len(first) == 2 and isinstance(first[1], dict):
+        for groups, values in raw_summary:
+            if not groups:
+                return {f: values.get(f) for f in aggregate_fields}
+        return None
+
+    offset = len(group_by_row_fields)
+    return {
+        f: raw_summary[offset + i] if offset + i < len(raw_summary) else None
+        for i, f in enumerate(aggregate_fields)
+    }
+
+
+def _build_v2_request(
+    report_type: str,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    group_by_row_fields: Optional[List[str]],
+    aggregate_fields: Optional[List[str]],
+    filters: Optional[Dict[str, Any]],
+    summary: bool,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Сформировать query-параметры и тело запроса POST /v2/reports/olap."""
+    payload: Dict[str, Any] = {"reportType": report_type}
+
+    if group_by_row_fields:
+        payload["groupByRowFields"] = group_by_row_fields
+    if aggregate_fields:
+        payload["aggregateFields"] = aggregate_fields
+    if filters:
+        payload["filters"] = filters
+
+    params = {"summary": str(summary).lower()}
+    if date_from:
+        params["dateFrom"] = date_from
+    if date_to:
+        params["dateTo"] = date_to
+
+    return params, payload
+
+
+def _finish_v2_report(report: "OLAPReport", data: Dict[str, Any]) -> "OLAPReport":
+    """
+    Дополнить отчет итогами и служебной частью ответа.
+
+    Args:
+        report: Отчет с уже заполненными строками
+        data: Ответ сервера без массива data
+    """
+    raw_summary = data.get("summary") or data.get("totals")
+    report.summary = _extract_summary(
+        raw_summary, report.group_by_row_fields, report.aggregate_fields
+    )
+    report.raw = data
+    return report
+
+
+def _count_bytes(chunks: Iterable[bytes], event: Any) -> Iterator[bytes]:
+    """Считать байты тела в event.bytes при потоковом чтении."""
+    event.bytes = 0
+    for chunk in chunks:
+        event.bytes += len(chunk)
+        yield chunk
+
+
+def plan_chunked(
+        spec: ReportSpec,
+        date_from: DateLike,
+        date_to: DateLike,
+        chunk: str,
+        date_field: str,
+) -> List[DateWindow]:
+    """
+    Проверить spec и нарезать период на окна для отчета по частям.
+
+    Args:
+        spec: Описание отчета
+        date_from: Начало периода (включительно)
+        date_to: Конец периода (не включительно)
+        chunk: Размер окна: "day", "week" или "month"
+        date_field: Поле, по которому фильтруется период
+
+    Returns:
+        List[DateWindow]: Окна в хронологическом порядке
+
+    Raises:
+        ValueError: Неверный период/размер окна или фильтр по date_field
+            уже задан в spec.filters
+    """
+    if date_field in spec.filters:
+        raise ValueError(
+            f"Фильтр по полю {date_field} задается окнами, "
+            "уберите его из spec.filters"
+        )
+
+    windows = plan_windows(date_from, date_to, chunk)
+    logger.info(
+        f"Построение OLAP-отчета {spec.report_type} по частям: "
+        f"{len(windows)} окон ({chunk})"
+    )
+    return windows
+
+
+def coalesce_windows(
+        spec: ReportSpec,
+        windows: List[DateWindow],
+        merger: MetricMerger,
+        date_field: str = DEFAULT_DATE_FIELD,
+) -> List[DateWindow]:
+    """
+    Заменить окна одним окном за весь период, если группы окон нельзя слить.
+
+    Если date_field не входит в группировку, строки одной группы из разных
+    окон сливаются (см. merge_windows). Агрегаты вида none (проценты,
+    средние без веса) так объединить нельзя, поэтому такой отчет строится
+    одним запросом за весь период.
+
+    Args:
+        spec: Описание отчета
+        windows: Окна из plan_chunked
+        merger: Правила слияния агрегатов spec
+        date_field: Поле, по которому фильтруется период
+
+    Returns:
+        List[DateWindow]: Исходные окна или одно окно за весь период
+    """
+    if len(windows) < 2 or date_field in spec.group_by_row_fields:
+        return windows
+    fields = merger.unmergeable
+    if not fields:
+        return windows
+    logger.warning(
+        f"Агрегаты {', '.join(fields)} нельзя объединить между окнами "
+        f"без {date_field} в группировке: отчет {spec.report_type} "
+        "строится одним запросом за весь период"
+    )
+    return [DateWindow(windows[0].start, windows[-1].end)]
+
+
+def merge_windows(
+        spec: ReportSpec,
+        parts: Iterable[Tuple[DateWindow, "OLAPReport"]],
+        merger: Optional[MetricMerger] = None,
+        date_field: str = DEFAULT_DATE_FIELD,
+) -> "OLAPReport":
+    """
+    Склеить отчеты по окнам в один отчет.
+
+    Если date_field входит в группировку, группы окон не пересекаются
+    и строки просто дописываются. Иначе (например, группировка только
+    по Department) одна группа приходит в нескольких окнах: строки
+    сливаются по ключу группировки по мере поступления окон, агрегаты
+    объединяются по правилам merger, и в памяти остается по одной строке
+    на группу — как в ответе на один запрос за весь период.
+
+    Итоги окон объединяются по правилам merger. Если итоги нужны
+    (spec.summary), а окна запрашивались без них, итоги считаются по строкам.
+
+    Args:
+        spec: Описание исходного отчета
+        parts: Пары (окно, отчет за окно) в хронологическом порядке
+        merger: Правила слияния (по умолчанию выводятся по именам полей)
+        date_field: Поле, по которому фильтровался период
+
+    Returns:
+        OLAPReport: Объединенный отчет. В raw["chunks"] — окна,
+        количество строк и признак кэша.
+    """
+    if merger is None:
+        merger = MetricMerger.for_spec(spec)
+    result = OLAPReport(spec.group_by_row_fields, spec.aggregate_fields)
+    summary: Optional[Dict[str, Any]] = None
+    chunks: List[Dict[str, Any]] = []
+
+    # None — группы окон не пересекаются, строки дописываются как есть
+    groups: Optional[GroupAccumulator] = (
+        None if date_field in spec.group_by_row_fields
+        else GroupAccumulator(spec.group_by_row_fields, merger)
+    )
+
+    for window, part in parts:
+        if groups is None:
+            result.extend(part)
+        else:
+            groups.add(part)
+        summary = merger.merge(summary, part.summary)
+        chunks.append({
+            "from": format_datetime(window.start),
+            "to": format_datetime(window.end),
+            "rows": len(part),
+            "cached": part.raw.get("cached", False),
+        })
+
+        logger.info(f"Окно {window}: строк {len(part)}")
+
+    if groups is not None:
+        for row in groups.rows():
+            result.append(row)
+        logger.info(f"Строк после слияния групп окон: {len(result)}")
+
+    if spec.summary and summary is None and merger.local_summary:
+        summary = merger.summarize(result)
+    result.summary = summary
+    result.raw = {"summary": summary, "chunks": chunks}
+    return result
 
 
 class OLAPReports:
@@ -48,15 +522,45 @@ class OLAPReports:
             sdk: Экземпляр IikoSDK
         """
         self.sdk = sdk
+        self.cache: Optional[OLAPCache] = OLAPCache.from_settings(sdk.settings)
+        self.columns_cache: Optional[ColumnCache] = ColumnCache.from_settings(sdk.settings)
+        self.stream_responses: bool = sdk.settings.olap_stream_responses
+        self.validate_specs: bool = sdk.settings.olap_validate_specs
+        self.local_summary: bool = sdk.settings.olap_local_summary
+        self._server_version: Optional[str] = None
+        self._server_version_checked = False
+
+    def get_server_version(self) -> Optional[str]:
+        """
+        Версия сервера iiko (входит в ключ кэша колонок).
+
+        Эндпоинт: GET /resto/api/version. Запрашивается один раз
+        на клиент. Если сервер не отдал версию, возвращается None:
+        тогда кэш колонок опирается только на время жизни записей.
 
-    def get_columns(self, report_type: str = "SALES") -> List[Dict[str, str]]:
+        Returns:
+            Optional[str]: Версия сервера или None
+        """
+        if not self._server_version_checked:
+            try:
+                response = self.sdk.get("/version")
+                self._server_version = response.text.strip() or None
+            except requests.RequestException as e:
+                logger.warning(f"Не удалось получить версию сервера: {e}")
+            self._server_version_checked = True
+        return self._server_version
+
+    def get_columns(self, report_type: str = "SALES", refresh: bool = False) -> List[Dict[str, str]]:
         """
         Получить список доступных колонок для OLAP-отчетов.
 
         Эндпоинт: GET /resto/api/v2/reports/olap/columns
 
+        Список берется из кэша колонок, если он свежий (см. get_column_catalog).
+
         Args:
             report_type: Тип отчета (например, "SALES", "DELIVERIES", "TRANSACTIONS", "ORDERS")
+            refresh: Запросить список у сервера, минуя кэш
 
         Returns:
             List[Dict[str, str]]: Список колонок с их атрибутами
@@ -70,6 +574,40 @@ class OLAPReports:
             >>> for col in columns:
             ...     print(f"{col['name']}: {col.get('caption', 'N/A')}")
         """
+        catalog = self.get_column_catalog(report_type, refresh=refresh)
+        # Копии, чтобы изменения вызывающего не попали в кэш
+        return [dict(c) for c in catalog.columns]
+
+    def get_column_catalog(self, report_type: str = "SALES", refresh: bool = False) -> ColumnCatalog:
+        """
+        Получить колонки отчета с индексами по типу, тегам и признакам.
+
+        Каталог кэшируется в памяти и на диске по серверу, версии сервера
+        и типу отчета (olap_columns_cache_ttl_seconds), поэтому повторные
+        вызовы и следующие запуски не скачивают список колонок.
+
+        Args:
+            report_type: Тип отчета
+            refresh: Запросить список у сервера, минуя кэш
+
+        Returns:
+            ColumnCatalog: Каталог колонок
+
+        Raises:
+            requests.RequestException: Ошибка при выполнении запроса
+
+        Example:
+            >>> catalog = sdk.olap.get_column_catalog("SALES")
+            >>> [c.id for c in catalog.of_type("AMOUNT")]
+        """
+        server = self.sdk.settings.rms_base_url
+        version = self.get_server_version() if self.columns_cache is not None else None
+        if self.columns_cache is not None and not refresh:
+            catalog = self.columns_cache.get(server, report_type, version)
+            if catalog is not None:
+                logger.debug(f"Колонки {report_type} взяты из кэша")
+                return catalog
+
         logger.info(f"Получение списка колонок OLAP для типа отчета: {report_type}")
 
         response = self.sdk.get(
@@ -81,9 +619,119 @@ class OLAPReports:
         columns = self._parse_columns(response.text, response.headers.get('Content-Type', ''))
 
         logger.info(f"Получено колонок: {len(columns)}")
-        return columns
+        catalog = ColumnCatalog(report_type, columns)
+        if self.columns_cache is not None:
+            self.columns_cache.put(server, report_type, catalog, version)
+        return catalog
+
+    def validate_spec(
+            self,
+            report_type: str,
+            group_by_row_fields: Optional[List[str]] = None,
+            aggregate_fields: Optional[List[str]] = None,
+            filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[ColumnCatalog]:
+        """
+        Проверить поля отчета по метаданным колонок (см. validation.validate_spec).
+
+        Каталог колонок берется из кэша. Если получить или разобрать его
+        не удалось, проверка пропускается: решение остается за сервером.
+
+        Returns:
+            Optional[ColumnCatalog]: Каталог, по которому проверен отчет
+            (None — проверка пропущена)
 
-    def _parse_columns(self, content: str, content_type: str) -> List[Dict[str, str]]:
+        Raises:
+            OLAPSpecError: Поле не существует или недоступно для своей роли
+        """
+        try:
+            catalog = self.get_column_catalog(report_type)
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Не удалось получить колонки {report_type}, проверка пропущена: {e}")
+            return None
+        validate_spec(catalog, group_by_row_fields, aggregate_fields, filters)
+        return catalog
+
+    def validate_report_spec(self, spec: ReportSpec) -> Optional[ColumnCatalog]:
+        """
+        Проверить весь отчет один раз перед построением по частям.
+
+        Составные построения (по окнам, по частям, синхронизация) проверяют
+        исходное описание до планирования, а запросы окон и частей идут
+        без повторной проверки. Выключается настройкой olap_validate_specs.
+
+        Args:
+            spec: Описание отчета
+
+        Returns:
+            Optional[ColumnCatalog]: Каталог колонок для get_merger
+            (None — проверка выключена или пропущена)
+
+        Raises:
+            OLAPSpecError: Поле не существует или недоступно для своей роли
+        """
+        if not self.validate_specs:
+            return None
+        return self.validate_spec(
+            spec.report_type, spec.group_by_row_fields,
+            spec.aggregate_fields, spec.filters,
+        )
+
+    def get_merger(
+            self,
+            spec: ReportSpec,
+            catalog: Optional[ColumnCatalog] = None,
+    ) -> MetricMerger:
+        """
+        Правила слияния агрегатов отчета по метаданным колонок.
+
+        Каталог колонок берется из кэша. Если получить его не удалось,
+        правила выводятся только по именам полей и spec.merge_rules.
+
+        Args:
+            spec: Описание отчета
+            catalog: Уже полученный каталог (например, из validate_report_spec)
+
+        Returns:
+            MetricMerger: Правила слияния для spec.aggregate_fields
+        """
+        if catalog is None:
+            try:
+                catalog = self.get_column_catalog(spec.report_type)
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(
+                    f"Не удалось получить колонки {spec.report_type}, "
+                    f"правила слияния выводятся по именам полей: {e}"
+                )
+        return MetricMerger.for_spec(spec, catalog)
+
+    def chunk_plan(
+            self,
+            spec: ReportSpec,
+            catalog: Optional[ColumnCatalog] = None,
+    ) -> Tuple[ReportSpec, MetricMerger]:
+        """
+        Описание отчета для запросов окон и правила слияния.
+
+        Если итоги по всем агрегатам считаются по строкам
+        (olap_local_summary), окна запрашиваются с summary=false.
+
+        Args:
+            spec: Описание отчета
+            catalog: Уже полученный каталог колонок (см. get_merger)
+
+        Returns:
+            Tuple[ReportSpec, MetricMerger]: Описание для build_window
+            и правила для merge_windows
+        """
+        merger = self.get_merger(spec, catalog)
+        if spec.summary and self.local_summary and merger.local_summary:
+            logger.debug(f"Итоги отчета {spec.report_type} считаются локально")
+            return replace(spec, summary=False), merger
+        return spec, merger
+
+    @staticmethod
+    def _parse_columns(content: str, content_type: str) -> List[Dict[str, str]]:
         """
         Распарсить ответ со списком колонок (JSON или XML).
 
@@ -96,11 +744,12 @@ class OLAPReports:
         """
         # Пытаемся определить формат по Content-Type или по содержимому
         if 'json' in content_type.lower() or content.strip().startswith('{'):
-            return self._parse_columns_json(content)
+            return OLAPReports._parse_columns_json(content)
         else:
-            return self._parse_columns_xml(content)
+            return OLAPReports._parse_columns_xml(content)
 
-    def _parse_columns_json(self, json_text: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _parse_columns_json(json_text: str) -> List[Dict[str, str]]:
         """
         Распарсить JSON ответ со списком колонок.
 
@@ -139,7 +788,8 @@ class OLAPReports:
             logger.error(f"JSON content (first 500 chars): {repr(json_text[:500])}")
             raise ValueError(f"Не удалось распарсить JSON ответ: {e}")
 
-    def _parse_columns_xml(self, xml_text: str) -> List[Dict[str, str]]:
+    @staticmethod
+    def _parse_columns_xml(xml_text: str) -> List[Dict[str, str]]:
         """
         Распарсить XML ответ со списком колонок.
 
@@ -229,7 +879,8 @@ class OLAPReports:
         if len(columns) > 7:
             logger.warning(
                 f"Передано {len(columns)} колонок. "
-                "Рекомендуется использовать не более 7 для производительности."
+                "Рекомендуется использовать не более 7 для производительности "
+                "(широкие отчеты можно строить частями через build_report_wide)."
             )
 
         logger.info(f"Построение OLAP-отчета: {report_type}")
@@ -265,57 +916,446 @@ class OLAPReports:
             aggregate_fields: Optional[List[str]] = None,
             filters: Optional[Dict[str, Any]] = None,
             summary: bool = True,
+            stream: Optional[bool] = None,
+            validate: Optional[bool] = None,
     ) -> OLAPReport:
+        """
+        Построить OLAP-отчет (версия API v2).
 
-        payload = {"reportType": report_type}
+        Эндпоинт: POST /resto/api/v2/reports/olap
 
-        if group_by_row_fields:
-            payload["groupByRowFields"] = group_by_row_fields
-        if aggregate_fields:
-            payload["aggregateFields"] = aggregate_fields
-        if filters:
-            payload["filters"] = filters
+        Args:
+            report_type: Тип отчета (например, "SALES")
+            date_from: Начальная дата (query-параметр dateFrom)
+            date_to: Конечная дата (query-параметр dateTo)
+            group_by_row_fields: Поля группировки строк
+            aggregate_fields: Агрегируемые поля
+            filters: Фильтры отчета (в т.ч. DateRange по дате)
+            summary: Построить общие итоги (False для крупных сетей)
+            stream: Разбирать ответ потоком, не загружая тело целиком
+                (по умолчанию — настройка olap_stream_responses)
+            validate: Проверить поля по колонкам до запроса (по умолчанию —
+                настройка olap_validate_specs; составные построения передают
+                False, так как проверяют исходный отчет один раз)
 
-        params = {"summary": str(summary).lower()}
-        if date_from:
-            params["dateFrom"] = date_from
-        if date_to:
-            params["dateTo"] = date_to
+        Returns:
+            OLAPReport: Отчет с колонками group_by_row_fields + aggregate_fields
+
+        Raises:
+            OLAPSpecError: Поля не прошли проверку по колонкам
+                (при olap_validate_specs, до запроса отчета)
+            requests.RequestException: Ошибка при выполнении запроса
+        """
+        if validate is None:
+            validate = self.validate_specs
+        if validate:
+            self.validate_spec(report_type, group_by_row_fields, aggregate_fields, filters)
+
+        params, payload = _build_v2_request(
+            report_type, date_from, date_to,
+            group_by_row_fields, aggregate_fields, filters, summary,
+        )
+
+        if stream is None:
+            stream = self.stream_responses
 
         response = self.sdk.post(
             "/v2/reports/olap",
             params=params,
             json=payload,
+            stream=stream,
         )
 
-        data = response.json()
-
-        columns: List[str] = []
-        rows: List[str] = []
         group_by_row_fields = group_by_row_fields or []
         aggregate_fields = aggregate_fields or []
 
-        columns.extend(group_by_row_fields)
-        rows.extend(aggregate_fields)
+        # Событие хуков запроса (None, если хуков нет)
+        event = getattr(response, "request_event", None)
+        parse_started = time.perf_counter() if event is not None else 0.0
+
+        if stream:
+            # Строки попадают в колоночные буферы по мере получения тела
+            report = OLAPReport(group_by_row_fields, aggregate_fields)
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            if event is not None:
+                chunks = _count_bytes(chunks, event)
+            try:
+                data = parse_olap_stream(chunks, on_row=report.append_record)
+            finally:
+                response.close()
+        else:
+            data = response.json()
+            # Строки переносятся в колоночные буферы, в raw остается только
+            # служебная часть ответа, чтобы не держать данные дважды
+            report = OLAPReport.from_records(
+                group_by_row_fields,
+                aggregate_fields,
+                data.pop("data", None) or [],
+            )
 
-        # rows = data.get("data", [])
+        report = _finish_v2_report(report, data)
+        if event is not None:
+            event.timing.parse = time.perf_counter() - parse_started
+            event.rows = len(report)
+            self.sdk.hooks.emit("on_parse", event)
+        return report
 
-        summary_dict: Optional[Dict[str, Any]] = None
-        raw_summary = data.get("summary") or data.get("totals")
+    def build_report_chunked(
+            self,
+            spec: ReportSpec,
+            date_from: DateLike,
+            date_to: DateLike,
+            chunk: str = "week",
+            date_field: str = DEFAULT_DATE_FIELD,
+            use_cache: bool = True,
+    ) -> OLAPReport:
+        """
+        Построить OLAP-отчет за длинный период по частям.
+
+        Период [date_from, date_to) режется на окна по календарным границам
+        (см. plan_windows), для каждого окна в фильтры подставляется
+        DateRange по date_field с includeLow=True и includeHigh=False,
+        поэтому соседние окна не пересекаются и строки не дублируются.
+        Окна запрашиваются последовательно, результаты склеиваются
+        в один отчет. Итоги окон объединяются с учетом вида агрегата
+        (сумма, минимум/максимум, взвешенное среднее — см. merge.py);
+        если все агрегаты это позволяют (olap_local_summary), окна
+        запрашиваются с summary=false, а итоги считаются по строкам.
+        Если date_field не входит в группировку, строки одной группы
+        из разных окон сливаются в одну, как в отчете за весь период;
+        если среди агрегатов есть несливаемые (вид none), отчет строится
+        одним запросом за весь период (см. coalesce_windows).
+
+        Если настроен дисковый кэш (olap_cache_dir), окна, целиком лежащие
+        до изменяемого горизонта, берутся из кэша без запроса к серверу.
+
+        Args:
+            spec: Описание отчета
+            date_from: Начало периода (включительно)
+            date_to: Конец периода (не включительно)
+            chunk: Размер окна: "day", "week" или "month"
+            date_field: Поле, по которому фильтруется период
+            use_cache: Брать закрытые окна из дискового кэша (если он настроен)
+
+        Returns:
+            OLAPReport: Объединенный отчет. В raw["chunks"] — окна,
+            количество строк в каждом из них и признак попадания в кэш.
 
-        if raw_summary and aggregate_fields:
-            offset = len(group_by_row_fields)
-            summary_dict = {
-                field: raw_summary[offset + i]
-                for i, field in enumerate(aggregate_fields)
-            }
+        Raises:
+            OLAPSpecError: Поля не прошли проверку по колонкам
+                (при olap_validate_specs, до первого запроса)
+            ValueError: Неверный период/размер окна или фильтр по date_field
+                уже задан в spec.filters
+            requests.RequestException: Ошибка при выполнении запроса
 
-        return OLAPReport(
-            columns=columns,
-            rows=rows,
-            summary=summary_dict,
-            raw=data,
+        Example:
+            >>> spec = ReportSpec(
+            ...     report_type="SALES",
+            ...     group_by_row_fields=["OpenDate.Typed", "Department"],
+            ...     aggregate_fields=["DishDiscountSumInt", "GuestNum"],
+            ... )
+            >>> report = sdk.olap.build_report_chunked(
+            ...     spec, "2026-01-01", "2026-02-01", chunk="week"
+            ... )
+        """
+        catalog = self.validate_report_spec(spec)
+        return self._build_chunked(spec, date_from, date_to, chunk, date_field, use_cache, catalog)
+
+    def _build_chunked(
+            self,
+            spec: ReportSpec,
+            date_from: DateLike,
+            date_to: DateLike,
+            chunk: str,
+            date_field: str,
+            use_cache: bool,
+            catalog: Optional[ColumnCatalog] = None,
+    ) -> OLAPReport:
+        """Построить отчет по окнам без проверки spec (она выполнена вызывающим)."""
+        windows = plan_chunked(spec, date_from, date_to, chunk, date_field)
+        window_spec, merger = self.chunk_plan(spec, catalog)
+        windows = coalesce_windows(spec, windows, merger, date_field)
+        parts = (
+            (window, self.build_window(window_spec, window, date_field, use_cache))
+            for window in windows
         )
+        return merge_windows(spec, parts, merger, date_field)
+
+    def build_report_wide(
+            self,
+            spec: ReportSpec,
+            date_from: DateLike,
+            date_to: DateLike,
+            chunk: Optional[str] = None,
+            date_field: str = DEFAULT_DATE_FIELD,
+            use_cache: bool = True,
+            max_fields: Optional[int] = None,
+    ) -> OLAPReport:
+        """
+        Построить отчет с любым количеством агрегатов узкими запросами.
+
+        Отчет разбивается на части не шире max_fields полей с общими
+        полями группировки (см. plan_report), части запрашиваются
+        последовательно и соединяются по ключу группировки (join_reports).
+
+        Args:
+            spec: Описание отчета
+            date_from: Начало периода (включительно)
+            date_to: Конец периода (не включительно)
+            chunk: Размер окна для каждой части ("day", "week", "month")
+                или None — каждая часть одним запросом за весь период
+            date_field: Поле, по которому фильтруется период
+            use_cache: Брать закрытые окна из дискового кэша (если он настроен)
+            max_fields: Максимум полей в одном запросе (по умолчанию MAX_REPORT_FIELDS)
+
+        Returns:
+            OLAPReport: Отчет с колонками spec.columns. В raw["parts"] —
+            агрегаты и количество строк каждой части.
+
+        Raises:
+            OLAPSpecError: Поля не прошли проверку по колонкам
+                (при olap_validate_specs, до первого запроса)
+            ValueError: Поля группировки не оставляют места для агрегатов,
+                неверный период или фильтр по date_field уже задан в spec.filters
+            requests.RequestException: Ошибка при выполнении запроса
+
+        Example:
+            >>> spec = ReportSpec(
+            ...     report_type="SALES",
+            ...     group_by_row_fields=["OpenDate.Typed", "Department"],
+            ...     aggregate_fields=["DishDiscountSumInt", "DishSumInt", "GuestNum",
+            ...                       "UniqOrderId.OrdersCount", "DishAmountInt",
+            ...                       "DiscountSum", "ProductCostBase.ProductCost"],
+            ... )
+            >>> report = sdk.olap.build_report_wide(spec, "2026-01-01", "2026-02-01")
+        """
+        from .planner import MAX_REPORT_FIELDS, join_reports, plan_report
+
+        catalog = self.validate_report_spec(spec)
+        parts = plan_report(spec, max_fields or MAX_REPORT_FIELDS)
+        reports = [
+            self.build_part(part, date_from, date_to, chunk, date_field, use_cache, catalog)
+            for part in parts
+        ]
+        return join_reports(spec, reports)
+
+    def build_part(
+            self,
+            spec: ReportSpec,
+            date_from: DateLike,
+            date_to: DateLike,
+            chunk: Optional[str],
+            date_field: str,
+            use_cache: bool,
+            catalog: Optional[ColumnCatalog] = None,
+    ) -> OLAPReport:
+        """
+        Построить одну часть широкого отчета: по окнам или одним запросом.
+
+        Часть не проверяется по колонкам: build_report_wide проверяет
+        исходный отчет до планирования (см. validate_report_spec).
+
+        Args:
+            spec: Часть отчета (см. plan_report)
+            date_from: Начало периода (включительно)
+            date_to: Конец периода (не включительно)
+            chunk: Размер окна или None — одним запросом за весь период
+            date_field: Поле, по которому фильтруется период
+            use_cache: Брать закрытые окна из дискового кэша (если он настроен)
+            catalog: Каталог колонок исходного отчета (для правил слияния окон)
+
+        Returns:
+            OLAPReport: Отчет по части
+
+        Raises:
+            ValueError: Неверный период или фильтр по date_field уже задан
+            requests.RequestException: Ошибка при выполнении запроса
+        """
+        if chunk is not None:
+            return self._build_chunked(
+                spec, date_from, date_to, chunk, date_field, use_cache, catalog,
+            )
+        if date_field in spec.filters:
+            raise ValueError(
+                f"Фильтр по полю {date_field} задается периодом, "
+                "уберите его из spec.filters"
+            )
+        window = DateWindow(parse_datetime(date_from), parse_datetime(date_to))
+        if window.start >= window.end:
+            raise ValueError(
+                f"Пустой период: {format_datetime(window.start)} >= {format_datetime(window.end)}"
+            )
+        return self.build_window(spec, window, date_field, use_cache)
+
+    def sync(
+            self,
+            spec: ReportSpec,
+            store,
+            start: Optional[DateLike] = None,
+            until: Optional[DateLike] = None,
+            recheck_days: int = 2,
+            chunk: str = "day",
+            date_field: str = DEFAULT_DATE_FIELD,
+    ):
+        """
+        Инкрементально дозагрузить отчет в локальное хранилище.
+
+        Хранилище помнит отметку — конец последнего полностью закрытого
+        окна, уже загруженного для этого описания отчета. Запрашиваются
+        только окна после отметки плюс recheck_days дней перед ней
+        (перепроверка поздно закрытых заказов), начиная с границы окна
+        chunk, в которое попадает этот день; перезагруженные окна
+        заменяют свои партиции в хранилище. Загружаются только закрытые
+        сутки — до начала текущего дня (или до until).
+
+        Отметка сдвигается после каждого окна, поэтому прерванная
+        синхронизация продолжается с места остановки.
+
+        Args:
+            spec: Описание отчета
+            store: Хранилище (OLAPStore)
+            start: Начало периода для первой синхронизации
+            until: Конец загружаемого периода (по умолчанию — начало текущих суток)
+            recheck_days: Сколько дней перед отметкой загружать повторно
+            chunk: Размер окна: "day", "week" или "month"
+            date_field: Поле, по которому фильтруется период
+
+        Returns:
+            SyncResult: Ключ отчета в хранилище, загруженные окна,
+            число строк и новая отметка
+
+        Raises:
+            OLAPSpecError: Поля не прошли проверку по колонкам
+                (при olap_validate_specs, до первого запроса)
+            ValueError: Первая синхронизация без start или окно частично
+                пересекается с сохраненной партицией (сменился chunk)
+            requests.RequestException: Ошибка при выполнении запроса
+
+        Example:
+            >>> store = OLAPStore(Path("olap_store"))
+            >>> result = sdk.olap.sync(spec, store, start="2026-01-01")
+            >>> report = store.load(result.key, spec)
+        """
+        from .store import SyncResult
+
+        self.validate_report_spec(spec)
+        key = store.make_key(self.sdk.settings.rms_base_url, spec, date_field)
+        mark = store.get_high_water_mark(key)
+
+        if until is not None:
+            end = parse_datetime(until)
+        else:
+            end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if mark is None:
+            if start is None:
+                raise ValueError(
+                    "Для первой синхронизации отчета нужно указать start"
+                )
+            begin = parse_datetime(start)
+        else:
+            # Начало перепроверки выравнивается по сетке окон: иначе новые
+            # окна частично перекрывали бы сохраненные партиции
+            begin = floor_boundary(mark - timedelta(days=recheck_days), chunk)
+            first = store.first_partition_start(key)
+            if first is not None:
+                begin = max(begin, first)
+            if start is not None:
+                begin = max(begin, parse_datetime(start))
+
+        result = SyncResult(key=key, high_water_mark=mark)
+        if begin >= end:
+            logger.info(f"Синхронизация {spec.report_type}: новых закрытых окон нет")
+            return result
+
+        windows = plan_windows(begin, end, chunk)
+        logger.info(
+            f"Синхронизация {spec.report_type}: {len(windows)} окон "
+            f"с {format_datetime(begin)} (отметка: "
+            f"{format_datetime(mark) if mark else 'нет'})"
+        )
+
+        meta = {
+            "reportType": spec.report_type,
+            "groupByRowFields": list(spec.group_by_row_fields),
+            "aggregateFields": list(spec.aggregate_fields),
+            "dateField": date_field,
+        }
+
+        for window in windows:
+            part = self.build_window(spec, window, date_field, use_cache=False)
+            store.write_window(key, window, part)
+
+            result.windows.append(window)
+            result.rows += len(part)
+            if result.high_water_mark is None or window.end > result.high_water_mark:
+                result.high_water_mark = window.end
+                store.set_high_water_mark(key, window.end, meta)
+
+            logger.info(f"Окно {window}: строк {len(part)}")
+
+        return result
+
+    def build_window(
+            self,
+            spec: ReportSpec,
+            window: DateWindow,
+            date_field: str,
+            use_cache: bool = True,
+    ) -> OLAPReport:
+        """
+        Построить отчет за одно окно, используя дисковый кэш для закрытых окон.
+
+        Окно не проверяется по колонкам: составные построения проверяют
+        исходный отчет один раз (см. validate_report_spec).
+
+        Args:
+            spec: Описание отчета
+            window: Окно отчета
+            date_field: Поле, по которому фильтруется период
+            use_cache: Разрешить чтение и запись кэша
+
+        Returns:
+            OLAPReport: Отчет за окно
+        """
+        filters = dict(spec.filters)
+        filters[date_field] = window.to_filter()
+
+        cache = self.cache if use_cache else None
+        key: Optional[str] = None
+        if cache is not None and cache.is_cacheable(window):
+            key = cache.make_key(
+                self.sdk.settings.rms_base_url,
+                spec.report_type,
+                spec.group_by_row_fields,
+                spec.aggregate_fields,
+                filters,
+                window,
+                spec.summary,
+            )
+            entry = cache.get(key)
+            if entry is not None:
+                return OLAPReport.from_records(
+                    spec.group_by_row_fields,
+                    spec.aggregate_fields,
+                    entry["rows"],
+                    summary=entry.get("summary"),
+                    raw={"cached": True},
+                )
+
+        part = self.build_report_v2(
+            report_type=spec.report_type,
+            group_by_row_fields=list(spec.group_by_row_fields),
+            aggregate_fields=list(spec.aggregate_fields),
+            filters=filters,
+            summary=spec.summary,
+            validate=False,
+        )
+
+        if key is not None:
+            cache.put(key, {"rows": part.rows, "summary": part.summary})
+
+        return part
 
     def get_available_reports(self) -> List[str]:
         """
@@ -0,0 +1,185 @@
+"""
+Разбиение широких OLAP-отчетов на узкие и локальное соединение результатов.
+
+iiko рекомендует запрашивать не более 7 полей в одном отчете: на широких
+отчетах сервер строит куб заметно дольше и сильнее нагружает базу.
+Планировщик режет список агрегатов на части так, чтобы в каждом запросе
+вместе с полями группировки было не больше max_fields полей. Среднее
+с весом (merge_rules "avg:<вес>") попадает в одну часть со своим весом,
+иначе его нельзя объединить между окнами. Все части
+группируются по одним и тем же полям, поэтому строки частей соединяются
+по ключу группировки (хэш-соединение) в один отчет.
+"""
+
+import logging
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .merge import MERGE_AVG, MergeRule
+from .olap import OLAPReport, ReportSpec
+
+logger = logging.getLogger(__name__)
+
+# Рекомендованный iiko предел полей в одном отчете
+MAX_REPORT_FIELDS = 7
+
+
+def _aggregate_units(spec: ReportSpec) -> List[List[str]]:
+    """
+    Группы агрегатов, которые нельзя разносить по разным частям.
+
+    Среднее (kind="avg") связано со своим весом; остальные агрегаты
+    образуют группы из одного поля. Группы и поля внутри них идут
+    в порядке первого появления в spec.aggregate_fields.
+    """
+    aggregates = list(spec.aggregate_fields)
+    owner = {f: f for f in aggregates}
+
+    def root(f: str) -> str:
+        while owner[f] != f:
+            f = owner[f]
+        return f
+
+    for f, value in (spec.merge_rules or {}).items():
+        rule = MergeRule.parse(value)
+        if rule.kind == MERGE_AVG and f in owner and rule.weight in owner:
+            owner[root(f)] = root(rule.weight)
+
+    units: Dict[str, List[str]] = {}
+    for f in aggregates:
+        units.setdefault(root(f), []).append(f)
+    return list(units.values())
+
+
+def plan_report(spec: ReportSpec, max_fields: int = MAX_REPORT_FIELDS) -> List[ReportSpec]:
+    """
+    Разбить отчет на части не шире max_fields полей.
+
+    Каждая часть содержит все поля группировки, фильтры, признак итогов
+    и правила слияния исходного отчета и часть агрегатов (в исходном
+    порядке). Агрегаты распределяются между частями поровну: 12 агрегатов
+    при свободных 5 местах дают части по 4, а не 5 + 5 + 2. Среднее
+    с весом (merge_rules) всегда попадает в часть своего веса.
+
+    Args:
+        spec: Описание отчета
+        max_fields: Максимум полей (группировки + агрегаты) в одной части
+
+    Returns:
+        List[ReportSpec]: Части отчета; [spec], если отчет уже достаточно узкий
+
+    Raises:
+        ValueError: Если поля группировки не оставляют места для агрегатов
+            или среднее вместе со своим весом не помещается в одну часть
+    """
+    group_by = list(spec.group_by_row_fields)
+    aggregates = list(spec.aggregate_fields)
+    if len(group_by) + len(aggregates) <= max_fields:
+        return [spec]
+
+    room = max_fields - len(group_by)
+    if room < 1:
+        raise ValueError(
+            f"Полей группировки {len(group_by)} при пределе {max_fields}: "
+            "не остается места для агрегатов"
+        )
+
+    count = -(-len(aggregates) // room)
+    size = -(-len(aggregates) // count)
+
+    chunks: List[List[str]] = []
+    for unit in _aggregate_units(spec):
+        if len(unit) > room:
+            raise ValueError(
+                f"Средние и их веса {unit} не помещаются в одну часть "
+                f"из {room} агрегатов"
+            )
+        if chunks and len(chunks[-1]) + len(unit) <= size:
+            chunks[-1].extend(unit)
+        else:
+            chunks.append(list(unit))
+
+    parts = [
+        replace(spec, aggregate_fields=chunk, filters=dict(spec.filters))
+        for chunk in chunks
+    ]
+    logger.info(
+        f"Отчет {spec.report_type} ({len(spec.columns)} полей) разбит на "
+        f"{len(parts)} частей по {size} агрегатов"
+    )
+    return parts
+
+
+def _join_summaries(spec: ReportSpec, parts: Sequence[OLAPReport]) -> Optional[Dict[str, Any]]:
+    """Объединить итоги частей (у частей разные агрегаты, значения не пересекаются)."""
+    joined: Dict[str, Any] = {}
+    for part in parts:
+        if part.summary is not None:
+            joined.update(part.summary)
+    if not joined:
+        return None
+    return {f: joined.get(f) for f in spec.aggregate_fields}
+
+
+def join_reports(spec: ReportSpec, parts: Sequence[OLAPReport]) -> OLAPReport:
+    """
+    Соединить части отчета по ключу группировки.
+
+    Соединение полное внешнее: группа, отсутствующая в ответе одной из
+    частей (сервер не возвращает строки без данных), попадает в результат
+    с None в агрегатах этой части. Строки идут в порядке первого появления
+    группы.
+
+    Args:
+        spec: Описание исходного (широкого) отчета
+        parts: Отчеты по частям из plan_report(spec)
+
+    Returns:
+        OLAPReport: Отчет с колонками spec.columns. В raw["parts"] —
+        агрегаты и количество строк каждой части.
+
+    Raises:
+        ValueError: Если поля группировки частей отличаются от spec
+    """
+    group_by = list(spec.group_by_row_fields)
+    width = len(group_by)
+
+    index: Dict[Tuple[Any, ...], int] = {}
+    keys: List[Tuple[Any, ...]] = []
+    values: Dict[str, List[Any]] = {f: [] for f in spec.aggregate_fields}
+
+    for part in parts:
+        if part.group_by_row_fields != group_by:
+            raise ValueError(
+                f"Нельзя соединить части с разными группировками: "
+                f"{group_by} и {part.group_by_row_fields}"
+            )
+        columns = [values[f] for f in part.aggregate_fields]
+        for row in part.iter_rows():
+            key = tuple(row[:width])
+            position = index.get(key)
+            if position is None:
+                position = index[key] = len(keys)
+                keys.append(key)
+                for column in values.values():
+                    column.append(None)
+            for column, value in zip(columns, row[width:]):
+                column[position] = value
+
+    summary = _join_summaries(spec, parts)
+    result = OLAPReport(
+        group_by,
+        spec.aggregate_fields,
+        summary=summary,
+        raw={
+            "summary": summary,
+            "parts": [
+                {"aggregateFields": part.aggregate_fields, "rows": len(part)}
+                for part in parts
+            ],
+        },
+    )
+    measures = [values[f] for f in spec.aggregate_fields]
+    for position, key in enumerate(keys):
+        result.append(list(key) + [column[position] for column in measures])
+    return result
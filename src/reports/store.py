@@ -0,0 +1,230 @@
+"""
+Локальное хранилище OLAP-отчетов для инкрементальной синхронизации.
+
+Для каждого описания отчета хранится отметка (high-water mark) —
+конец последнего полностью закрытого окна, которое уже загружено.
+Данные лежат партициями по окнам, поэтому повторно загруженное окно
+(перепроверка поздно закрытых заказов) заменяет старую партицию,
+а не дублирует строки.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils import fingerprint, read_json_gz, write_json_gz
+from .chunking import DateWindow, format_datetime, parse_datetime
+from .olap import OLAPReport, ReportSpec
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_FORMAT = "%Y%m%dT%H%M%S"
+
+
+@dataclass
+class SyncResult:
+    """
+    Результат одного запуска синхронизации.
+
+    Attributes:
+        key: Ключ отчета в хранилище
+        windows: Загруженные окна
+        rows: Количество загруженных строк
+        high_water_mark: Отметка после синхронизации
+    """
+
+    key: str
+    windows: List[DateWindow] = field(default_factory=list)
+    rows: int = 0
+    high_water_mark: Optional[datetime] = None
+
+
+class OLAPStore:
+    """
+    Хранилище партиций OLAP-отчетов на диске.
+
+    Структура каталога:
+        <root>/<ключ отчета>/state.json              — отметка и описание отчета
+        <root>/<ключ отчета>/partitions/<from>_<to>.json.gz — строки окна
+    """
+
+    def __init__(self, root: Path):
+        """
+        Инициализация хранилища.
+
+        Args:
+            root: Корневой каталог хранилища
+        """
+        self.root = Path(root)
+
+    @staticmethod
+    def make_key(server: str, spec: ReportSpec, date_field: str) -> str:
+        """
+        Вычислить ключ отчета в хранилище.
+
+        Args:
+            server: Базовый URL сервера iiko
+            spec: Описание отчета
+            date_field: Поле, по которому режется период
+
+        Returns:
+            str: Hex-строка SHA-256
+        """
+        return fingerprint({
+            "server": server,
+            "reportType": spec.report_type,
+            "groupByRowFields": list(spec.group_by_row_fields),
+            "aggregateFields": list(spec.aggregate_fields),
+            "filters": spec.filters,
+            "summary": spec.summary,
+            "dateField": date_field,
+        })
+
+    def _dir(self, key: str) -> Path:
+        return self.root / key
+
+    def _partitions_dir(self, key: str) -> Path:
+        return self._dir(key) / "partitions"
+
+    def _read_state(self, key: str) -> Dict[str, Any]:
+        path = self._dir(key) / "state.json"
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ошибка при чтении состояния {path}: {e}")
+            return {}
+
+    def _write_state(self, key: str, state: Dict[str, Any]) -> None:
+        directory = self._dir(key)
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_name, directory / "state.json")
+
+    def get_high_water_mark(self, key: str) -> Optional[datetime]:
+        """
+        Получить отметку загруженных данных.
+
+        Args:
+            key: Ключ отчета
+
+        Returns:
+            Optional[datetime]: Конец последнего загруженного закрытого окна
+            или None, если отчет еще не синхронизировался
+        """
+        mark = self._read_state(key).get("high_water_mark")
+        return parse_datetime(mark) if mark else None
+
+    def set_high_water_mark(
+        self,
+        key: str,
+        mark: datetime,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Сохранить отметку загруженных данных.
+
+        Args:
+            key: Ключ отчета
+            mark: Новая отметка
+            meta: Описание отчета для информации
+        """
+        state = self._read_state(key)
+        state["high_water_mark"] = format_datetime(mark)
+        state["updated_at"] = datetime.now().isoformat()
+        if meta is not None:
+            state["spec"] = meta
+        self._write_state(key, state)
+
+    def _partition_windows(self, key: str) -> List[tuple]:
+        """Список (окно, путь) всех партиций отчета в хронологическом порядке."""
+        result = []
+        directory = self._partitions_dir(key)
+        if not directory.exists():
+            return result
+        for path in directory.glob("*.json.gz"):
+            name = path.name[: -len(".json.gz")]
+            try:
+                start, end = name.split("_")
+                window = DateWindow(
+                    datetime.strptime(start, _PARTITION_FORMAT),
+                    datetime.strptime(end, _PARTITION_FORMAT),
+                )
+            except ValueError:
+                continue
+            result.append((window, path))
+        result.sort(key=lambda item: item[0].start)
+        return result
+
+    def first_partition_start(self, key: str) -> Optional[datetime]:
+        """Начало самой ранней сохраненной партиции (None, если партиций нет)."""
+        partitions = self._partition_windows(key)
+        return partitions[0][0].start if partitions else None
+
+    def write_window(self, key: str, window: DateWindow, report: OLAPReport) -> None:
+        """
+        Записать строки окна, заменив партиции, которые оно покрывает.
+
+        Партиция, которую окно покрывает только частично, не удаляется:
+        ее строки за непокрытую часть иначе были бы потеряны.
+
+        Args:
+            key: Ключ отчета
+            window: Окно отчета
+            report: Отчет за окно
+
+        Raises:
+            ValueError: Окно частично пересекается с сохраненной партицией
+                (например, после смены размера окна chunk)
+        """
+        replaced = []
+        for existing, path in self._partition_windows(key):
+            if not (existing.start < window.end and window.start < existing.end):
+                continue
+            if existing.start < window.start or existing.end > window.end:
+                raise ValueError(
+                    f"Окно {window} частично пересекается с партицией {existing}; "
+                    "перезапись удалила бы строки за непокрытую часть"
+                )
+            replaced.append(path)
+
+        name = (
+            f"{window.start.strftime(_PARTITION_FORMAT)}_"
+            f"{window.end.strftime(_PARTITION_FORMAT)}.json.gz"
+        )
+        target = self._partitions_dir(key) / name
+        write_json_gz(target, {"rows": report.rows, "summary": report.summary})
+
+        # Старые партиции удаляются после записи новой: при сбое между
+        # шагами строки задвоятся до следующей синхронизации, но не пропадут
+        for path in replaced:
+            if path != target:
+                path.unlink()
+
+    def load(self, key: str, spec: ReportSpec) -> OLAPReport:
+        """
+        Загрузить все сохраненные строки отчета.
+
+        Args:
+            key: Ключ отчета
+            spec: Описание отчета
+
+        Returns:
+            OLAPReport: Отчет, собранный из партиций в хронологическом порядке
+        """
+        report = OLAPReport(spec.group_by_row_fields, spec.aggregate_fields)
+        for _, path in self._partition_windows(key):
+            entry = read_json_gz(path)
+            for row in entry["rows"]:
+                report.append(row)
+        report.raw = {"high_water_mark": self._read_state(key).get("high_water_mark")}
+        return report
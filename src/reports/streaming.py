@@ -0,0 +1,243 @@
+"""
+Потоковый разбор больших ответов OLAP-отчетов.
+
+Ответ сервера имеет вид {"data": [...], "summary": [...], ...}.
+Вместо того чтобы держать в памяти одновременно байты, строку и дерево
+Python-объектов всего ответа, парсер читает тело кусками и отдает
+элементы массива data по одному, как только они получены целиком.
+Остальные ключи верхнего уровня (summary и т.п.) разбираются обычным
+способом — они небольшие.
+"""
+
+import codecs
+import json
+from typing import Any, Callable, Dict, Iterable
+
+_WHITESPACE = " \t\n\r"
+
+# Символы, которыми может заканчиваться числовой литерал внутри ответа
+_NUMBER_DELIMITERS = ",]}" + _WHITESPACE
+
+# Состояния разбора объекта верхнего уровня
+_EXPECT_OBJECT = 0
+_EXPECT_KEY = 1
+_EXPECT_COLON = 2
+_EXPECT_VALUE = 3
+_AFTER_VALUE = 4
+_EXPECT_ROW = 5
+_AFTER_ROW = 6
+_DONE = 7
+
+# Сколько обработанных символов копить перед сдвигом буфера
+_COMPACT_THRESHOLD = 1 << 16
+
+
+class OLAPStreamParser:
+    """
+    Инкрементальный парсер ответа OLAP-отчета.
+
+    Пример использования:
+        >>> parser = OLAPStreamParser(on_row=rows.append)
+        >>> for chunk in response.iter_content(chunk_size=65536):
+        ...     parser.feed(chunk)
+        >>> meta = parser.close()  # {"summary": [...], ...}
+    """
+
+    def __init__(
+        self,
+        on_row: Callable[[Any], None],
+        array_key: str = "data",
+        encoding: str = "utf-8",
+    ):
+        """
+        Инициализация парсера.
+
+        Args:
+            on_row: Вызывается для каждого элемента массива array_key
+            array_key: Ключ верхнего уровня, элементы которого отдаются потоком
+            encoding: Кодировка тела ответа
+        """
+        self.on_row = on_row
+        self.array_key = array_key
+        self.rows = 0
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = _EXPECT_OBJECT
+        self._key: str = ""
+        self._meta: Dict[str, Any] = {}
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Передать очередной кусок тела ответа.
+
+        Args:
+            chunk: Байты ответа
+        """
+        text = self._decoder.decode(chunk)
+        if not text:
+            return
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += text
+        self._parse(eof=False)
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Завершить разбор.
+
+        Returns:
+            Dict[str, Any]: Ключи верхнего уровня, кроме array_key
+
+        Raises:
+            ValueError: Ответ обрезан или не является корректным JSON-объектом
+        """
+        self._buf += self._decoder.decode(b"", final=True)
+        self._parse(eof=True)
+        self._skip_whitespace()
+        if self._state != _DONE or self._pos != len(self._buf):
+            raise ValueError(
+                f"Некорректный или неполный JSON ответ (позиция {self._pos})"
+            )
+        return self._meta
+
+    def _skip_whitespace(self) -> None:
+        buf, pos = self._buf, self._pos
+        n = len(buf)
+        while pos < n and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+
+    def _decode_value(self, eof: bool):
+        """
+        Разобрать одно JSON-значение с текущей позиции.
+
+        Returns:
+            Tuple[bool, Any]: (успех, значение). Неуспех означает, что данных
+            пока недостаточно.
+        """
+        try:
+            value, end = self._json.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError(
+                    f"Некорректный JSON ответ (позиция {self._pos})"
+                ) from None
+            return False, None
+        # Число может быть обрезано на границе куска ("-0." | "5", "1e" | "3"):
+        # raw_decode вернет его префикс. Литерал считается полным, только
+        # если за ним в буфере уже есть разделитель.
+        if (
+            not eof
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and (end == len(self._buf) or self._buf[end] not in _NUMBER_DELIMITERS)
+        ):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _expect(self, char: str) -> bool:
+        if self._buf[self._pos] != char:
+            raise ValueError(
+                f"Ожидался символ {char!r} на позиции {self._pos}, "
+                f"получен {self._buf[self._pos]!r}"
+            )
+        self._pos += 1
+        return True
+
+    def _parse(self, eof: bool) -> None:
+        while True:
+            self._skip_whitespace()
+            if self._pos >= len(self._buf) or self._state == _DONE:
+                return
+
+            state = self._state
+            char = self._buf[self._pos]
+
+            if state == _EXPECT_OBJECT:
+                self._expect("{")
+                self._state = _EXPECT_KEY
+
+            elif state == _EXPECT_KEY:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                if char != '"':
+                    self._expect('"')
+                ok, key = self._decode_value(eof)
+                if not ok:
+                    return
+                self._key = key
+                self._state = _EXPECT_COLON
+
+            elif state == _EXPECT_COLON:
+                self._expect(":")
+                self._state = _EXPECT_VALUE
+
+            elif state == _EXPECT_VALUE:
+                if self._key == self.array_key and char == "[":
+                    self._pos += 1
+                    self._state = _EXPECT_ROW
+                    continue
+                ok, value = self._decode_value(eof)
+                if not ok:
+                    return
+                self._meta[self._key] = value
+                self._state = _AFTER_VALUE
+
+            elif state == _AFTER_VALUE:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                else:
+                    self._expect(",")
+                    self._state = _EXPECT_KEY
+
+            elif state == _EXPECT_ROW:
+                if char == "]":
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                ok, row = self._decode_value(eof)
+                if not ok:
+                    return
+                self.rows += 1
+                self.on_row(row)
+                self._state = _AFTER_ROW
+
+            elif state == _AFTER_ROW:
+                if char == "]":
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                else:
+                    self._expect(",")
+                    self._state = _EXPECT_ROW
+
+
+def parse_olap_stream(
+    chunks: Iterable[bytes],
+    on_row: Callable[[Any], None],
+    array_key: str = "data",
+) -> Dict[str, Any]:
+    """
+    Разобрать ответ OLAP-отчета потоком.
+
+    Args:
+        chunks: Куски тела ответа (например, response.iter_content())
+        on_row: Вызывается для каждой строки массива array_key
+        array_key: Ключ массива строк
+
+    Returns:
+        Dict[str, Any]: Остальные ключи верхнего уровня ответа
+
+    Raises:
+        ValueError: Ответ не является корректным JSON-объектом
+    """
+    parser = OLAPStreamParser(on_row, array_key=array_key)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
@@ -0,0 +1,110 @@
+"""
+Проверка параметров OLAP-отчета по метаданным колонок до запроса.
+
+Ошибка в имени поля или поле, которое нельзя группировать/агрегировать,
+иначе обнаруживается только после долгого построения отчета на сервере,
+а запрос все это время занимает последовательный слот лицензии.
+"""
+
+import difflib
+from typing import Any, Dict, Iterable, List, Optional
+
+from .columns import ColumnCatalog
+
+# Сколько вариантов предлагать для опечатки
+MAX_SUGGESTIONS = 3
+
+
+class OLAPSpecError(ValueError):
+    """
+    Параметры OLAP-отчета не соответствуют колонкам отчета.
+
+    Attributes:
+        report_type: Тип отчета
+        problems: Описания всех найденных ошибок
+    """
+
+    def __init__(self, report_type: str, problems: List[str]):
+        self.report_type = report_type
+        self.problems = problems
+        details = "\n".join(f"  - {p}" for p in problems)
+        super().__init__(f"Некорректные параметры отчета {report_type}:\n{details}")
+
+
+def _suggest(field: str, candidates: Iterable[str]) -> List[str]:
+    """Похожие имена полей: без учета регистра, затем по близости написания."""
+    candidates = list(candidates)
+    lowered = field.lower()
+    exact = [c for c in candidates if c.lower() == lowered]
+    if exact:
+        return exact
+
+    by_lower = {c.lower(): c for c in candidates}
+    matches = difflib.get_close_matches(lowered, list(by_lower), n=MAX_SUGGESTIONS, cutoff=0.6)
+    # Префикс тоже подсказка: DishSum -> DishSumInt
+    prefixed = [c for c in candidates if c.lower().startswith(lowered) and c.lower() not in matches]
+    return [by_lower[m] for m in matches] + prefixed[:MAX_SUGGESTIONS - len(matches)]
+
+
+def _hint(suggestions: List[str]) -> str:
+    if not suggestions:
+        return ""
+    return "; возможно, имелось в виду: " + ", ".join(suggestions)
+
+
+def _by_caption(catalog: ColumnCatalog, field: str) -> List[str]:
+    """Поля, название которых совпадает с field (передали caption вместо имени)."""
+    lowered = field.strip().lower()
+    return [c.id for c in catalog if c.caption.lower() == lowered]
+
+
+def validate_spec(
+    catalog: ColumnCatalog,
+    group_by_row_fields: Optional[List[str]] = None,
+    aggregate_fields: Optional[List[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Проверить поля отчета по каталогу колонок.
+
+    Проверяется, что поля существуют, поля группировки допускают
+    группировку (groupingAllowed), агрегаты — агрегацию
+    (aggregationAllowed), а поля фильтров — фильтрацию (filteringAllowed).
+    Для опечаток предлагаются похожие имена.
+
+    Args:
+        catalog: Каталог колонок отчета
+        group_by_row_fields: Поля группировки
+        aggregate_fields: Агрегируемые поля
+        filters: Фильтры {поле: фильтр}
+
+    Raises:
+        OLAPSpecError: Найдены ошибки (в problems — все сразу)
+    """
+    problems: List[str] = []
+
+    checks = [
+        (group_by_row_fields or [], "группировки", "grouping_allowed", catalog.groupable),
+        (aggregate_fields or [], "агрегации", "aggregation_allowed", catalog.aggregatable),
+        (list(filters or {}), "фильтрации", "filtering_allowed", catalog.filterable),
+    ]
+    for fields, role, flag, allowed in checks:
+        seen = set()
+        for field in fields:
+            if field in seen:
+                problems.append(f"поле {field} указано для {role} дважды")
+                continue
+            seen.add(field)
+
+            info = catalog.get(field)
+            if info is None:
+                suggestions = _by_caption(catalog, field) or _suggest(field, catalog.ids)
+                problems.append(f"неизвестное поле {field}{_hint(suggestions)}")
+            elif not getattr(info, flag):
+                suggestions = _suggest(field, (c.id for c in allowed()))
+                problems.append(
+                    f"поле {field} ({info.caption}) недоступно для {role}{_hint(suggestions)}"
+                )
+
+    if problems:
+        raise OLAPSpecError(catalog.report_type, problems)
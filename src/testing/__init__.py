@@ -0,0 +1,13 @@
+"""Инструменты для локальной проверки и бенчмарков SDK без сервера iiko."""
+
+from .fake_server import PROFILES, FakeIikoServer, FakeServerConfig, FaultProfile
+from .synthetic import SyntheticOLAP, read_chunks
+
+__all__ = [
+    "FakeIikoServer",
+    "FakeServerConfig",
+    "FaultProfile",
+    "PROFILES",
+    "SyntheticOLAP",
+    "read_chunks",
+]
@@ -0,0 +1,658 @@
+"""
+Локальный фейковый сервер iiko API.
+
+Сервер на стандартной библиотеке (http.server) для воспроизводимых
+бенчмарков и проверок SDK без доступа к настоящему серверу iiko.
+Поддерживаются эндпоинты:
+
+- /auth, /logout — выдача и освобождение токенов с лимитом слотов лицензии
+- /version — версия сервера (текст)
+- /corporation/organizations — список организаций (XML)
+- /v2/reports/olap/columns — колонки отчета SALES (JSON)
+- /v2/reports/olap — OLAP-отчет SALES по детерминированным синтетическим данным
+
+Профили сбоев (FaultProfile, PROFILES) имитируют деградацию сервера:
+случайные 5xx, 429 с Retry-After, медленную отдачу тела и обрыв соединения.
+
+Запуск из командной строки:
+    python -m src.testing.fake_server --port 8080 --rows-per-day 500
+    python -m src.testing.fake_server --faults brownout
+"""
+
+import argparse
+import json
+import logging
+import random
+import socket
+import struct
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/resto/api"
+
+# Колонки отчета SALES в формате ответа /v2/reports/olap/columns
+SALES_COLUMNS: Dict[str, Dict[str, Any]] = {
+    "OpenDate.Typed": {
+        "name": "Учетный день", "type": "DATE", "tags": ["Дата"],
+        "aggregationAllowed": False, "groupingAllowed": True, "filteringAllowed": True,
+    },
+    "HourOpen": {
+        "name": "Час открытия", "type": "STRING", "tags": ["Дата"],
+        "aggregationAllowed": False, "groupingAllowed": True, "filteringAllowed": True,
+    },
+    "Department": {
+        "name": "Торговое предприятие", "type": "STRING", "tags": ["Организация"],
+        "aggregationAllowed": False, "groupingAllowed": True, "filteringAllowed": True,
+    },
+    "WaiterName": {
+        "name": "Официант заказа", "type": "STRING", "tags": ["Сотрудники"],
+        "aggregationAllowed": False, "groupingAllowed": True, "filteringAllowed": True,
+    },
+    "PayTypes": {
+        "name": "Тип оплаты", "type": "STRING", "tags": ["Оплата"],
+        "aggregationAllowed": False, "groupingAllowed": True, "filteringAllowed": True,
+    },
+    "OrderType": {
+        "name": "Тип заказа", "type": "ENUM", "tags": ["Заказ"],
+        "aggregationAllowed": False, "groupingAllowed": True, "filteringAllowed": True,
+    },
+    "DishCategory": {
+        "name": "Категория блюда", "type": "STRING", "tags": ["Блюдо"],
+        "aggregationAllowed": False, "groupingAllowed": True, "filteringAllowed": True,
+    },
+    "DishName": {
+        "name": "Блюдо", "type": "STRING", "tags": ["Блюдо"],
+        "aggregationAllowed": False, "groupingAllowed": True, "filteringAllowed": True,
+    },
+    "DishAmountInt": {
+        "name": "Количество блюд", "type": "AMOUNT", "tags": ["Блюдо"],
+        "aggregationAllowed": True, "groupingAllowed": False, "filteringAllowed": False,
+    },
+    "DishSumInt": {
+        "name": "Сумма без скидки, р.", "type": "MONEY", "tags": ["Оплата"],
+        "aggregationAllowed": True, "groupingAllowed": False, "filteringAllowed": False,
+    },
+    "DishDiscountSumInt": {
+        "name": "Сумма со скидкой, р.", "type": "MONEY", "tags": ["Оплата"],
+        "aggregationAllowed": True, "groupingAllowed": False, "filteringAllowed": False,
+    },
+    "DiscountSum": {
+        "name": "Сумма скидки, р.", "type": "MONEY", "tags": ["Оплата"],
+        "aggregationAllowed": True, "groupingAllowed": False, "filteringAllowed": False,
+    },
+    "GuestNum": {
+        "name": "Количество гостей", "type": "INTEGER", "tags": ["Заказ"],
+        "aggregationAllowed": True, "groupingAllowed": False, "filteringAllowed": False,
+    },
+    "UniqOrderId.OrdersCount": {
+        "name": "Заказов", "type": "INTEGER", "tags": ["Заказ"],
+        "aggregationAllowed": True, "groupingAllowed": False, "filteringAllowed": False,
+    },
+}
+
+DEPARTMENTS = [f"Ресторан №{i}" for i in range(1, 6)]
+PAY_TYPES = ["Наличные", "Банковские карты", "СБП", "Бонусы", "Без оплаты"]
+PAY_TYPE_WEIGHTS = [25, 60, 10, 4, 1]
+ORDER_TYPES = ["Обычный заказ", "Доставка курьером", "Доставка самовывоз"]
+ORDER_TYPE_WEIGHTS = [70, 20, 10]
+CATEGORIES = [
+    "Салаты", "Супы", "Горячее", "Гарниры", "Пицца", "Паста",
+    "Десерты", "Выпечка", "Горячие напитки", "Холодные напитки", "Бар", "Завтраки",
+]
+WAITERS_PER_DEPARTMENT = 8
+DISHES = 300
+
+
+@dataclass
+class FaultProfile:
+    """
+    Сценарий сбоев фейкового сервера.
+
+    Для каждого запроса к путям paths выбирается не более одного сбоя;
+    сумма вероятностей не должна превышать 1.
+
+    Attributes:
+        error_rate: Доля ответов со случайным статусом из error_statuses
+        error_statuses: Статусы для error_rate
+        throttle_rate: Доля ответов 429 с заголовком Retry-After
+        retry_after: Значение Retry-After в секундах
+        drip_rate: Доля ответов, тело которых отдается медленно
+        drip_chunk: Размер порции медленного тела в байтах
+        drip_delay: Пауза между порциями в секундах
+        reset_rate: Доля запросов, на которые соединение сбрасывается (RST)
+        paths: Пути (без /resto/api), к которым применяются сбои
+        seed: Зерно генератора сбоев
+    """
+
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (500, 502, 503, 504)
+    throttle_rate: float = 0.0
+    retry_after: int = 1
+    drip_rate: float = 0.0
+    drip_chunk: int = 1024
+    drip_delay: float = 0.005
+    reset_rate: float = 0.0
+    paths: Tuple[str, ...] = ("/v2/reports/olap",)
+    seed: int = 1
+
+
+# Готовые профили сбоев
+PROFILES: Dict[str, FaultProfile] = {
+    "healthy": FaultProfile(),
+    "flaky_5xx": FaultProfile(error_rate=0.2),
+    "throttled": FaultProfile(throttle_rate=0.2, retry_after=1),
+    "slow_drip": FaultProfile(drip_rate=1.0),
+    "resets": FaultProfile(reset_rate=0.1),
+    "brownout": FaultProfile(
+        error_rate=0.1, throttle_rate=0.05, drip_rate=0.3, reset_rate=0.05
+    ),
+}
+
+
+@dataclass
+class FakeServerConfig:
+    """
+    Параметры фейкового сервера.
+
+    Attributes:
+        latency: Задержка перед каждым ответом в секундах
+        rows_per_day: Сколько продаж (строк фактов) генерируется на день;
+            определяет размер ответа OLAP-отчета
+        max_licences: Лимит одновременно выданных токенов (None — без лимита)
+        token_ttl: Время жизни токена в секундах (None — бессрочно)
+        seed: Зерно генератора данных
+        server_version: Версия сервера, которую отдает /version
+        faults: Сценарий сбоев (по умолчанию сбоев нет)
+    """
+
+    latency: float = 0.0
+    rows_per_day: int = 200
+    max_licences: Optional[int] = None
+    token_ttl: Optional[float] = None
+    seed: int = 0
+    server_version: str = "9.1.8015.0"
+    faults: FaultProfile = field(default_factory=FaultProfile)
+
+
+def _dish(index: int) -> Tuple[str, str, float]:
+    """Блюдо по номеру: название, категория, цена."""
+    category = CATEGORIES[index % len(CATEGORIES)]
+    price = 90 + (index * 37) % 900
+    return f"{category} #{index + 1}", category, float(price)
+
+
+def generate_sales_facts(day: date, count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Сгенерировать продажи за день (детерминированно по day и seed).
+
+    Args:
+        day: Учетный день
+        count: Количество строк фактов
+        seed: Зерно генератора
+
+    Yields:
+        Dict[str, Any]: Строка со всеми колонками SALES_COLUMNS
+    """
+    rng = random.Random(f"{seed}:{day.isoformat()}")
+    day_text = day.isoformat()
+
+    for _ in range(count):
+        department = rng.randrange(len(DEPARTMENTS))
+        waiter = rng.randrange(WAITERS_PER_DEPARTMENT)
+        # Популярные блюда продаются чаще
+        dish_name, category, price = _dish(int((rng.paretovariate(1.2) - 1) * 20) % DISHES)
+        amount = rng.choice((1, 1, 1, 2, 2, 3))
+        total = price * amount
+        discount = round(total * rng.choice((0.05, 0.1, 0.2)), 2) if rng.random() < 0.15 else 0.0
+
+        yield {
+            "OpenDate.Typed": day_text,
+            "HourOpen": f"{rng.randint(9, 23):02d}",
+            "Department": DEPARTMENTS[department],
+            "WaiterName": f"Официант {department + 1}.{waiter + 1}",
+            "PayTypes": rng.choices(PAY_TYPES, PAY_TYPE_WEIGHTS)[0],
+            "OrderType": rng.choices(ORDER_TYPES, ORDER_TYPE_WEIGHTS)[0],
+            "DishCategory": category,
+            "DishName": dish_name,
+            "DishAmountInt": amount,
+            "DishSumInt": total,
+            "DishDiscountSumInt": round(total - discount, 2),
+            "DiscountSum": discount,
+            "GuestNum": rng.randint(1, 4),
+            "UniqOrderId.OrdersCount": 1,
+        }
+
+
+def _parse_date(value: str) -> date:
+    return datetime.fromisoformat(value.replace("Z", "")).date()
+
+
+def _date_range(filter_: Dict[str, Any]) -> Tuple[date, date]:
+    """Полуинтервал дней [start, end) из фильтра DateRange."""
+    start = _parse_date(filter_["from"])
+    end = _parse_date(filter_["to"])
+    if not filter_.get("includeLow", True):
+        start += timedelta(days=1)
+    if filter_.get("includeHigh", False):
+        end += timedelta(days=1)
+    return start, end
+
+
+def _matches(fact: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Проверить фильтры по значениям (IncludeValues/ExcludeValues)."""
+    for field, filter_ in filters.items():
+        kind = filter_.get("filterType")
+        if kind == "IncludeValues" and fact[field] not in filter_.get("values", []):
+            return False
+        if kind == "ExcludeValues" and fact[field] in filter_.get("values", []):
+            return False
+    return True
+
+
+def build_olap_response(
+    request: Dict[str, Any],
+    config: FakeServerConfig,
+    summary: bool = True,
+) -> Dict[str, Any]:
+    """
+    Построить ответ /v2/reports/olap по синтетическим данным.
+
+    Args:
+        request: Тело запроса (reportType, groupByRowFields, aggregateFields, filters)
+        config: Параметры сервера
+        summary: Добавить общие итоги
+
+    Returns:
+        Dict[str, Any]: Ответ {"data": [...], "summary": [...]}
+
+    Raises:
+        ValueError: Неизвестный тип отчета, колонка или отсутствует фильтр по дате
+    """
+    if request.get("reportType") != "SALES":
+        raise ValueError(f"Unsupported report type: {request.get('reportType')}")
+
+    group_by = list(request.get("groupByRowFields") or [])
+    aggregates = list(request.get("aggregateFields") or [])
+    for field in group_by + aggregates:
+        if field not in SALES_COLUMNS:
+            raise ValueError(f"Unknown OLAP field: {field}")
+    for field in aggregates:
+        if not SALES_COLUMNS[field]["aggregationAllowed"]:
+            raise ValueError(f"Field is not aggregatable: {field}")
+
+    filters = dict(request.get("filters") or {})
+    date_filter = filters.pop("OpenDate.Typed", None)
+    if not date_filter or date_filter.get("filterType") != "DateRange":
+        raise ValueError("DateRange filter by OpenDate.Typed is required")
+    for field in filters:
+        if field not in SALES_COLUMNS:
+            raise ValueError(f"Unknown OLAP field: {field}")
+
+    start, end = _date_range(date_filter)
+    groups: Dict[Tuple[Any, ...], List[Any]] = {}
+    totals: List[Any] = [0] * len(aggregates)
+
+    day = start
+    while day < end:
+        for fact in generate_sales_facts(day, config.rows_per_day, config.seed):
+            if filters and not _matches(fact, filters):
+                continue
+            key = tuple(fact[f] for f in group_by)
+            sums = groups.get(key)
+            if sums is None:
+                sums = groups[key] = [0] * len(aggregates)
+            for i, field in enumerate(aggregates):
+                sums[i] += fact[field]
+                totals[i] += fact[field]
+        day += timedelta(days=1)
+
+    def values(sums: List[Any]) -> Dict[str, Any]:
+        return {
+            f: round(v, 2) if isinstance(v, float) else v
+            for f, v in zip(aggregates, sums)
+        }
+
+    data = [{**dict(zip(group_by, key)), **values(sums)} for key, sums in groups.items()]
+
+    response: Dict[str, Any] = {"data": data}
+    if summary:
+        response["summary"] = [[{}, values(totals)]]
+    return response
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Обработчик запросов фейкового сервера."""
+
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными записями; без TCP_NODELAY
+    # каждый ответ ждал бы delayed ACK клиента (~40 мс)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # Сбой, выбранный для текущего запроса: None, "drip"
+    _fault: Optional[str] = None
+
+    def _send(
+        self,
+        status: int,
+        body: Any,
+        content_type: str = "text/plain",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        payload = body if isinstance(body, bytes) else str(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        if self._fault != "drip":
+            self.wfile.write(payload)
+            return
+
+        faults = self.server.fake.config.faults
+        for start in range(0, len(payload), faults.drip_chunk):
+            self.wfile.write(payload[start:start + faults.drip_chunk])
+            self.wfile.flush()
+            time.sleep(faults.drip_delay)
+
+    def _reset_connection(self) -> None:
+        """Оборвать соединение с RST вместо ответа."""
+        self.connection.setsockopt(
+            socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+        )
+        self.close_connection = True
+        self.connection.close()
+
+    def _send_json(self, status: int, obj: Any) -> None:
+        self._send(status, json.dumps(obj, ensure_ascii=False), "application/json")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        path = url.path
+        if path.startswith(API_PREFIX):
+            path = path[len(API_PREFIX):]
+
+        fake = self.server.fake
+        fake.record(path)
+        if fake.config.latency:
+            time.sleep(fake.config.latency)
+
+        self._fault = fake.roll_fault(path)
+        if self._fault == "reset":
+            return self._reset_connection()
+        if self._fault == "throttle":
+            return self._send(
+                429, "Too many requests",
+                headers={"Retry-After": str(fake.config.faults.retry_after)},
+            )
+        if self._fault == "error":
+            return self._send(fake.pick_error_status(), "Injected server error")
+
+        if path == "/auth":
+            status, token = fake.login(query.get("login"), query.get("pass"))
+            return self._send(status, token)
+
+        if path == "/logout":
+            fake.logout(query.get("key"))
+            return self._send(200, "")
+
+        if not fake.check_token(query.get("key")):
+            return self._send(401, "Token is expired or invalid")
+
+        if path == "/version" and method == "GET":
+            return self._send(200, fake.config.server_version)
+
+        if path == "/corporation/organizations" and method == "GET":
+            return self._send(200, fake.organizations_xml(), "application/xml")
+
+        if path == "/v2/reports/olap/columns" and method == "GET":
+            if query.get("reportType", "SALES") != "SALES":
+                return self._send(400, "Unsupported report type")
+            return self._send_json(200, SALES_COLUMNS)
+
+        if path == "/v2/reports/olap" and method == "POST":
+            try:
+                request = json.loads(body or b"{}")
+                response = build_olap_response(
+                    request, fake.config, summary=query.get("summary", "true") != "false"
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                return self._send(400, f"Bad OLAP request: {e}")
+            return self._send_json(200, response)
+
+        self._send(404, f"Not found: {path}")
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeIikoServer"
+
+
+class FakeIikoServer:
+    """
+    Фейковый сервер iiko API в фоновом потоке.
+
+    Пример использования:
+        >>> with FakeIikoServer(FakeServerConfig(latency=0.05)) as server:
+        ...     sdk = IikoSDK(server.make_settings(token_storage_path=tmp / ".token"))
+        ...     report = sdk.olap.build_report_v2(...)
+        ...     print(server.requests["/v2/reports/olap"])
+    """
+
+    def __init__(
+        self,
+        config: Optional[FakeServerConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Инициализация сервера (без запуска).
+
+        Args:
+            config: Параметры сервера
+            host: Адрес для прослушивания
+            port: Порт (0 — любой свободный)
+        """
+        self.config = config or FakeServerConfig()
+        self.host = host
+        self.port = port
+        self.requests: Counter = Counter()
+        self.faults: Counter = Counter()
+        self.tokens: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._fault_rng = random.Random(self.config.faults.seed)
+        self._httpd: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Базовый URL API (значение для rms_base_url)."""
+        return f"http://{self.host}:{self.port}{API_PREFIX}"
+
+    def make_settings(self, **overrides: Any):
+        """
+        Создать Settings, указывающие на этот сервер.
+
+        Args:
+            **overrides: Дополнительные поля Settings
+
+        Returns:
+            Settings: Настройки SDK
+        """
+        from ..config import Settings
+
+        values = {"rms_base_url": self.base_url, "rms_login": "admin", "rms_password": "admin"}
+        values.update(overrides)
+        return Settings(**values)
+
+    def record(self, path: str) -> None:
+        """Учесть запрос в статистике."""
+        with self._lock:
+            self.requests[path] += 1
+
+    def roll_fault(self, path: str) -> Optional[str]:
+        """
+        Выбрать сбой для запроса по профилю.
+
+        Returns:
+            Optional[str]: "reset", "throttle", "error", "drip" или None
+        """
+        faults = self.config.faults
+        if path not in faults.paths:
+            return None
+
+        with self._lock:
+            draw = self._fault_rng.random()
+            threshold = 0.0
+            for kind, rate in (
+                ("reset", faults.reset_rate),
+                ("throttle", faults.throttle_rate),
+                ("error", faults.error_rate),
+                ("drip", faults.drip_rate),
+            ):
+                threshold += rate
+                if draw < threshold:
+                    self.faults[kind] += 1
+                    return kind
+        return None
+
+    def pick_error_status(self) -> int:
+        """Случайный статус ошибки из профиля."""
+        with self._lock:
+            return self._fault_rng.choice(self.config.faults.error_statuses)
+
+    def login(self, login: Optional[str], password: Optional[str]) -> Tuple[int, str]:
+        """Выдать токен, если есть свободный слот лицензии."""
+        if not login or password is None:
+            return 401, "Login and password are required"
+        with self._lock:
+            self._expire_tokens()
+            if self.config.max_licences is not None and len(self.tokens) >= self.config.max_licences:
+                return 403, "License slots exhausted"
+            token = str(uuid.uuid4())
+            self.tokens[token] = time.monotonic()
+            return 200, token
+
+    def logout(self, token: Optional[str]) -> None:
+        """Освободить слот лицензии."""
+        with self._lock:
+            self.tokens.pop(token, None)
+
+    def check_token(self, token: Optional[str]) -> bool:
+        """Проверить, что токен выдан и не истек."""
+        with self._lock:
+            self._expire_tokens()
+            return token in self.tokens
+
+    def _expire_tokens(self) -> None:
+        if self.config.token_ttl is None:
+            return
+        deadline = time.monotonic() - self.config.token_ttl
+        for token in [t for t, issued in self.tokens.items() if issued < deadline]:
+            del self.tokens[token]
+
+    @staticmethod
+    def organizations_xml() -> str:
+        """Список организаций в формате corporateItemDtoes."""
+        items = "".join(
+            f"<corporateItemDto><id>00000000-0000-0000-0000-{i:012d}</id>"
+            f"<name>{name}</name><type>DEPARTMENT</type></corporateItemDto>"
+            for i, name in enumerate(DEPARTMENTS, 1)
+        )
+        return f'<?xml version="1.0" encoding="UTF-8"?><corporateItemDtoes>{items}</corporateItemDtoes>'
+
+    def start(self) -> "FakeIikoServer":
+        """Запустить сервер в фоновом потоке."""
+        self._httpd = _Server((self.host, self.port), _Handler)
+        self._httpd.fake = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-iiko", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Фейковый сервер iiko запущен: {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """Остановить сервер."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Точка входа `python -m src.testing.fake_server`."""
+    parser = argparse.ArgumentParser(description="Фейковый сервер iiko API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа, с")
+    parser.add_argument("--rows-per-day", type=int, default=200, help="Продаж в день")
+    parser.add_argument("--max-licences", type=int, default=None, help="Лимит слотов лицензии")
+    parser.add_argument("--token-ttl", type=float, default=None, help="Время жизни токена, с")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--faults", choices=sorted(PROFILES), default="healthy", help="Профиль сбоев"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    config = FakeServerConfig(
+        latency=args.latency,
+        rows_per_day=args.rows_per_day,
+        max_licences=args.max_licences,
+        token_ttl=args.token_ttl,
+        seed=args.seed,
+        faults=PROFILES[args.faults],
+    )
+    server = FakeIikoServer(config, host=args.host, port=args.port).start()
+    print(f"rms_base_url={server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Генератор синтетических ответов OLAP-отчетов.
+
+Выдает тела в формате ответа /v2/reports/olap
+({"data": [...], "summary": [[{}, {...}]]}) для произвольных
+groupByRowFields/aggregateFields и нужного количества строк — для оценки
+поведения SDK на 10 тыс., 1 млн и 10 млн строк.
+
+Ответ пишется потоком: строки кодируются по одной и сбрасываются порциями,
+итоги накапливаются по ходу, поэтому многогигабайтные фикстуры не
+занимают память целиком.
+
+Как и у настоящего сервера, каждая строка — уникальная комбинация значений
+полей группировки. Значения берутся из справочников реалистичного размера
+(CARDINALITIES: предприятия, официанты, типы оплаты, блюда); комбинации
+перебираются псевдослучайной перестановкой пространства ключей, без
+хранения уже выданных ключей.
+
+Запуск из командной строки:
+    python -m src.testing.synthetic --rows 1000000 --out sales_1m.json
+    python -m src.testing.synthetic --rows 10000000 --out sales_10m.json.gz \\
+        --group-by OpenDate.Typed Department DishName --cardinality DishName=5000
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import math
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Union
+
+from .fake_server import (
+    CATEGORIES,
+    ORDER_TYPES,
+    PAY_TYPES,
+    SALES_COLUMNS,
+    _dish,
+)
+
+logger = logging.getLogger(__name__)
+
+DATE_FIELD = "OpenDate.Typed"
+
+# Размер справочников по умолчанию (сеть из пары десятков предприятий)
+CARDINALITIES: Dict[str, int] = {
+    DATE_FIELD: 365,
+    "HourOpen": 15,
+    "Department": 25,
+    "WaiterName": 300,
+    "PayTypes": len(PAY_TYPES),
+    "OrderType": len(ORDER_TYPES),
+    "DishCategory": len(CATEGORIES),
+    "DishName": 1500,
+}
+# Размер справочника для полей, которых нет в CARDINALITIES
+DEFAULT_CARDINALITY = 100
+
+DEFAULT_GROUP_BY = [DATE_FIELD, "Department", "WaiterName", "PayTypes", "DishName"]
+DEFAULT_AGGREGATES = ["DishAmountInt", "DishSumInt", "DishDiscountSumInt", "GuestNum"]
+
+# Сколько закодированных строк копить перед записью
+FLUSH_BYTES = 1 << 20
+
+PathLike = Union[str, Path]
+
+
+def _dimension_values(field: str, cardinality: int, start: date) -> List[str]:
+    """Значения поля группировки."""
+    if field == DATE_FIELD:
+        return [(start + timedelta(days=i)).isoformat() for i in range(cardinality)]
+    if field == "HourOpen":
+        return [f"{(9 + i) % 24:02d}" for i in range(cardinality)]
+    if field == "Department":
+        return [f"Ресторан №{i + 1}" for i in range(cardinality)]
+    if field == "WaiterName":
+        return [f"Официант {i + 1}" for i in range(cardinality)]
+    if field == "DishName":
+        return [_dish(i)[0] for i in range(cardinality)]
+
+    known = {"PayTypes": PAY_TYPES, "OrderType": ORDER_TYPES, "DishCategory": CATEGORIES}
+    base = known.get(field, [])
+    return [base[i] if i < len(base) else f"{field} {i + 1}" for i in range(cardinality)]
+
+
+def _measure_kind(field: str) -> str:
+    """Как генерировать агрегат: count, gross, discount, net."""
+    if SALES_COLUMNS.get(field, {}).get("type") in ("AMOUNT", "INTEGER"):
+        return "count"
+    return {"DiscountSum": "discount", "DishDiscountSumInt": "net"}.get(field, "gross")
+
+
+def _coprime_step(n: int) -> int:
+    """Шаг перестановки Z_n: взаимно прост с n и далек от 1."""
+    step = max(1, int(n * 0.6180339887)) | 1
+    while math.gcd(step, n) != 1:
+        step += 2
+    return step
+
+
+class SyntheticOLAP:
+    """
+    Синтетический ответ OLAP-отчета заданной схемы и размера.
+
+    Если среди полей группировки есть OpenDate.Typed, строки идут по
+    дням подряд и распределяются между днями поровну (как в ответе
+    сервера, отсортированном по дате).
+
+    Пример использования:
+        >>> gen = SyntheticOLAP(["Department", "PayTypes"], ["DishSumInt"], rows=100)
+        >>> gen.write("sales.json")
+        >>> records = list(gen.iter_records())
+    """
+
+    def __init__(
+        self,
+        group_by_row_fields: Sequence[str] = DEFAULT_GROUP_BY,
+        aggregate_fields: Sequence[str] = DEFAULT_AGGREGATES,
+        rows: int = 10_000,
+        seed: int = 0,
+        start: date = date(2026, 1, 1),
+        cardinalities: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Инициализация генератора.
+
+        Args:
+            group_by_row_fields: Поля группировки
+            aggregate_fields: Агрегируемые поля
+            rows: Количество строк data
+            seed: Зерно генератора (одинаковые параметры дают одинаковый ответ)
+            start: Первый учетный день
+            cardinalities: Переопределение размеров справочников {поле: размер}
+
+        Raises:
+            ValueError: Уникальных комбинаций полей меньше, чем строк
+        """
+        self.group_by_row_fields = list(group_by_row_fields)
+        self.aggregate_fields = list(aggregate_fields)
+        self.rows = rows
+        self.seed = seed
+        self.start = start
+        self.cardinalities = {**CARDINALITIES, **(cardinalities or {})}
+
+        self._values = {
+            f: _dimension_values(f, self._cardinality(f), start)
+            for f in self.group_by_row_fields
+        }
+        # Дата — внешний цикл, остальные поля перебираются внутри дня
+        self._inner = [f for f in self.group_by_row_fields if f != DATE_FIELD]
+        self._days = self._cardinality(DATE_FIELD) if DATE_FIELD in self._values else 1
+        self._space = math.prod(len(self._values[f]) for f in self._inner)
+
+        per_day = -(-rows // self._days)
+        if per_day > self._space:
+            raise ValueError(
+                f"Уникальных комбинаций полей группировки ({self._space * self._days}) "
+                f"меньше, чем строк ({rows}); увеличьте cardinalities или число полей"
+            )
+
+    def _cardinality(self, field: str) -> int:
+        return max(1, self.cardinalities.get(field, DEFAULT_CARDINALITY))
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Строки отчета в формате ответа сервера.
+
+        Yields:
+            Dict[str, Any]: Строка {поле: значение}
+        """
+        rng = random.Random(self.seed)
+        inner = [(f, self._values[f]) for f in self._inner]
+        measures = [(f, _measure_kind(f)) for f in self.aggregate_fields]
+        lognormvariate = rng.lognormvariate
+        paretovariate = rng.paretovariate
+        random_ = rng.random
+        dates = self._values.get(DATE_FIELD)
+        space = self._space
+        step = _coprime_step(space)
+        base, extra = divmod(self.rows, self._days)
+
+        for day in range(self._days):
+            count = base + (1 if day < extra else 0)
+            offset = rng.randrange(space)
+            for k in range(count):
+                # (k * step + offset) mod space — перестановка, ключи не повторяются
+                index = (k * step + offset) % space
+                record: Dict[str, Any] = {}
+                if dates is not None:
+                    record[DATE_FIELD] = dates[day]
+                for f, values in inner:
+                    index, i = divmod(index, len(values))
+                    record[f] = values[i]
+                # Денежные агрегаты согласованы: со скидкой = без скидки - скидка
+                gross = lognormvariate(7.0, 1.2)
+                discount = gross * 0.1 if random_() < 0.15 else 0.0
+                for f, kind in measures:
+                    if kind == "count":
+                        # Большинство групп маленькие, изредка крупные
+                        record[f] = int(paretovariate(1.3))
+                    elif kind == "gross":
+                        record[f] = round(gross, 2)
+                    elif kind == "discount":
+                        record[f] = round(discount, 2)
+                    else:
+                        record[f] = round(gross - discount, 2)
+                yield record
+
+    def iter_chunks(self, summary: bool = True) -> Iterator[bytes]:
+        """
+        Тело ответа порциями (UTF-8).
+
+        Args:
+            summary: Добавить общие итоги (накапливаются по ходу генерации)
+
+        Yields:
+            bytes: Очередная порция JSON
+        """
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        totals: List[Any] = [0] * len(self.aggregate_fields)
+        fields = self.aggregate_fields
+
+        buffer: List[str] = ['{"data":[']
+        size = 0
+        first = True
+        for record in self.iter_records():
+            text = encode(record)
+            buffer.append(text if first else "," + text)
+            first = False
+            size += len(text)
+            if summary:
+                for i, f in enumerate(fields):
+                    totals[i] += record[f]
+            if size >= FLUSH_BYTES:
+                yield "".join(buffer).encode("utf-8")
+                buffer.clear()
+                size = 0
+
+        buffer.append("]")
+        if summary:
+            values = {
+                f: round(v, 2) if isinstance(v, float) else v
+                for f, v in zip(fields, totals)
+            }
+            buffer.append(',"summary":' + encode([[{}, values]]))
+        buffer.append("}")
+        yield "".join(buffer).encode("utf-8")
+
+    def write(self, path: PathLike, summary: bool = True) -> int:
+        """
+        Записать ответ в файл (с расширением .gz — сжатым gzip).
+
+        Args:
+            path: Путь к файлу
+            summary: Добавить общие итоги
+
+        Returns:
+            int: Размер несжатого тела в байтах
+        """
+        path = Path(path)
+        written = 0
+        with _open(path, "wb") as f:
+            for chunk in self.iter_chunks(summary=summary):
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
+    def request(self) -> Dict[str, Any]:
+        """Тело запроса /v2/reports/olap, которому соответствует ответ."""
+        return {
+            "reportType": "SALES",
+            "groupByRowFields": self.group_by_row_fields,
+            "aggregateFields": self.aggregate_fields,
+        }
+
+
+def _open(path: Path, mode: str) -> BinaryIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def read_chunks(path: PathLike, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """
+    Прочитать файл ответа порциями (для parse_olap_stream).
+
+    Args:
+        path: Путь к файлу (.gz распаковывается на лету)
+        chunk_size: Размер порции в байтах
+
+    Yields:
+        bytes: Очередная порция
+    """
+    with _open(Path(path), "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _parse_cardinality(value: str) -> Dict[str, int]:
+    field, _, size = value.partition("=")
+    if not size:
+        raise argparse.ArgumentTypeError(f"Ожидается ПОЛЕ=РАЗМЕР, получено: {value}")
+    return {field: int(size)}
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Точка входа `python -m src.testing.synthetic`."""
+    parser = argparse.ArgumentParser(description="Генератор синтетических ответов OLAP")
+    parser.add_argument("--rows", type=int, required=True, help="Количество строк data")
+    parser.add_argument("--out", type=Path, required=True, help="Файл ответа (.json или .json.gz)")
+    parser.add_argument("--group-by", nargs="+", default=DEFAULT_GROUP_BY)
+    parser.add_argument("--aggregate", nargs="+", default=DEFAULT_AGGREGATES)
+    parser.add_argument(
+        "--cardinality", type=_parse_cardinality, action="append", default=[],
+        help="Размер справочника поля, например DishName=5000 (можно повторять)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-summary", action="store_true", help="Не добавлять итоги")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    cardinalities: Dict[str, int] = {}
+    for item in args.cardinality:
+        cardinalities.update(item)
+
+    try:
+        generator = SyntheticOLAP(
+            args.group_by, args.aggregate, rows=args.rows,
+            seed=args.seed, cardinalities=cardinalities,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    started = time.perf_counter()
+    size = generator.write(args.out, summary=not args.no_summary)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Записано {args.rows} строк в {args.out}: "
+        f"{size / (1 << 20):.1f} МБ за {elapsed:.1f} с"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Пул токенов для параллельной работы с iiko API через несколько логинов.
+
+Каждая авторизация занимает один слот лицензии, а запросы одного токена
+должны идти строго последовательно. Пул держит по одному IikoSDK ("полосе")
+на логин: у каждой полосы свой токен, свой файл токена и свой лимитер,
+поэтому N логинов дают N параллельных последовательных каналов.
+"""
+
+import logging
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+from .client.hooks import Hooks
+from .client.rate_limiter import limiter_from_settings
+from .config import Settings, get_settings
+from .iiko_sdk import IikoSDK
+from .reports.chunking import DateLike
+from .reports.olap import (
+    DEFAULT_DATE_FIELD,
+    OLAPReport,
+    ReportSpec,
+    coalesce_windows,
+    merge_windows,
+    plan_chunked,
+)
+from .reports.planner import MAX_REPORT_FIELDS, join_reports, plan_report
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Credentials:
+    """Учетные данные одного логина iiko API."""
+
+    login: str
+    password: str = field(repr=False)
+
+
+class TokenPool:
+    """
+    Пул полос (IikoSDK), по одной на логин.
+
+    ВАЖНО:
+    Каждая полоса при авторизации занимает свой слот лицензии.
+    Пул с N логинами занимает N слотов.
+
+    Пример использования:
+        >>> pool = TokenPool([
+        ...     Credentials("api1", "secret1"),
+        ...     Credentials("api2", "secret2"),
+        ... ])
+        >>> with pool:
+        ...     report = pool.build_report_chunked(
+        ...         spec, "2026-01-01", "2026-04-01", chunk="week"
+        ...     )
+    """
+
+    def __init__(
+        self,
+        credentials: Sequence[Credentials],
+        settings: Optional[Settings] = None,
+        hooks: Optional[Hooks] = None,
+    ):
+        """
+        Инициализация пула.
+
+        Args:
+            credentials: Учетные данные логинов (по одной полосе на логин)
+            settings: Общие настройки (сервер, таймауты, лимиты). Логин,
+                пароль и путь к файлу токена берутся у каждой полосы свои.
+            hooks: Хуки запросов, общие для всех полос
+
+        Raises:
+            ValueError: Если список учетных данных пуст или логины повторяются
+        """
+        if not credentials:
+            raise ValueError("Нужен хотя бы один логин")
+
+        logins = [c.login for c in credentials]
+        if len(set(logins)) != len(logins):
+            raise ValueError("Логины в пуле не должны повторяться")
+
+        self.settings = settings or get_settings()
+        self.hooks = hooks if hooks is not None else Hooks()
+        self.lanes: List[IikoSDK] = [self._create_lane(c) for c in credentials]
+        self._idle: "queue.Queue[IikoSDK]" = queue.Queue()
+        for lane in self.lanes:
+            self._idle.put(lane)
+
+        logger.info(f"Пул токенов: {len(self.lanes)} полос")
+
+    def _create_lane(self, credentials: Credentials) -> IikoSDK:
+        """Создать полосу для логина."""
+        storage_path = self.settings.token_storage_path
+        suffix = re.sub(r"[^\w.-]", "_", credentials.login)
+        lane_settings = self.settings.model_copy(update={
+            "rms_login": credentials.login,
+            "rms_password": credentials.password,
+            "token_storage_path": storage_path.with_name(f"{storage_path.name}.{suffix}"),
+        })
+        # У каждой полосы свой лимитер: ограничение действует на канал,
+        # а не на сервер целиком
+        limiter = limiter_from_settings(
+            lane_settings, key=f"{lane_settings.rms_base_url}#{credentials.login}"
+        )
+        return IikoSDK(lane_settings, limiter=limiter, hooks=self.hooks)
+
+    @property
+    def size(self) -> int:
+        """Количество полос в пуле."""
+        return len(self.lanes)
+
+    def authenticate(self) -> None:
+        """
+        Авторизовать все полосы.
+
+        Raises:
+            requests.RequestException: Ошибка при авторизации
+        """
+        for lane in self.lanes:
+            lane.auth.get_token()
+
+    def logout(self) -> None:
+        """Освободить лицензии всех полос."""
+        for lane in self.lanes:
+            lane.logout()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[IikoSDK]:
+        """
+        Занять свободную полосу на время блока with.
+
+        Пока полоса занята, другие потоки ее не получают, поэтому
+        запросы одного токена не пересекаются.
+
+        Args:
+            timeout: Сколько ждать свободную полосу (None — без ограничения)
+
+        Yields:
+            IikoSDK: Клиент полосы
+
+        Raises:
+            TimeoutError: Свободная полоса не появилась за timeout
+        """
+        try:
+            lane = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("Нет свободной полосы в пуле токенов") from None
+        try:
+            yield lane
+        finally:
+            self._idle.put(lane)
+
+    def map(self, func: Callable[[IikoSDK, Any], T], items: Iterable[Any]) -> List[T]:
+        """
+        Выполнить func(sdk, item) для каждого элемента на свободных полосах.
+
+        Args:
+            func: Функция, принимающая клиент полосы и элемент
+            items: Элементы для обработки
+
+        Returns:
+            List: Результаты в порядке элементов
+
+        Raises:
+            Exception: Первая ошибка, возникшая в func
+        """
+        def run(item: Any) -> T:
+            with self.lease() as sdk:
+                return func(sdk, item)
+
+        with ThreadPoolExecutor(
+            max_workers=self.size, thread_name_prefix="iiko-lane"
+        ) as executor:
+            return list(executor.map(run, items))
+
+    def build_report_chunked(
+        self,
+        spec: ReportSpec,
+        date_from: DateLike,
+        date_to: DateLike,
+        chunk: str = "week",
+        date_field: str = DEFAULT_DATE_FIELD,
+        use_cache: bool = True,
+    ) -> OLAPReport:
+        """
+        Построить OLAP-отчет по частям, распределив окна по полосам.
+
+        Результат совпадает с OLAPReports.build_report_chunked, но окна
+        запрашиваются параллельно — по одному на полосу.
+
+        Args:
+            spec: Описание отчета
+            date_from: Начало периода (включительно)
+            date_to: Конец периода (не включительно)
+            chunk: Размер окна: "day", "week" или "month"
+            date_field: Поле, по которому фильтруется период
+            use_cache: Брать закрытые окна из дискового кэша (если он настроен)
+
+        Returns:
+            OLAPReport: Объединенный отчет (окна в хронологическом порядке)
+
+        Raises:
+            OLAPSpecError: Поля не прошли проверку по колонкам
+                (при olap_validate_specs, до первого запроса)
+            ValueError: Неверный период/размер окна или фильтр по date_field
+                уже задан в spec.filters
+            requests.RequestException: Ошибка при выполнении запроса
+        """
+        with self.lease() as sdk:
+            catalog = sdk.olap.validate_report_spec(spec)
+            windows = plan_chunked(spec, date_from, date_to, chunk, date_field)
+            window_spec, merger = sdk.olap.chunk_plan(spec, catalog)
+        windows = coalesce_windows(spec, windows, merger, date_field)
+        parts = self.map(
+            lambda sdk, window: sdk.olap.build_window(window_spec, window, date_field, use_cache),
+            windows,
+        )
+        return merge_windows(spec, zip(windows, parts), merger, date_field)
+
+    def build_report_wide(
+        self,
+        spec: ReportSpec,
+        date_from: DateLike,
+        date_to: DateLike,
+        chunk: Optional[str] = None,
+        date_field: str = DEFAULT_DATE_FIELD,
+        use_cache: bool = True,
+        max_fields: Optional[int] = None,
+    ) -> OLAPReport:
+        """
+        Построить широкий отчет узкими запросами, распределив части по полосам.
+
+        Результат совпадает с OLAPReports.build_report_wide, но части
+        (см. plan_report) запрашиваются параллельно — по одной на полосу.
+        Окна внутри части (при chunk) идут последовательно на ее полосе.
+
+        Args:
+            spec: Описание отчета
+            date_from: Начало периода (включительно)
+            date_to: Конец периода (не включительно)
+            chunk: Размер окна для каждой части или None — одним запросом
+            date_field: Поле, по которому фильтруется период
+            use_cache: Брать закрытые окна из дискового кэша (если он настроен)
+            max_fields: Максимум полей в одном запросе (по умолчанию MAX_REPORT_FIELDS)
+
+        Returns:
+            OLAPReport: Отчет с колонками spec.columns
+
+        Raises:
+            OLAPSpecError: Поля не прошли проверку по колонкам
+                (при olap_validate_specs, до первого запроса)
+            ValueError: Поля группировки не оставляют места для агрегатов,
+                неверный период или фильтр по date_field уже задан в spec.filters
+            requests.RequestException: Ошибка при выполнении запроса
+        """
+        with self.lease() as sdk:
+            catalog = sdk.olap.validate_report_spec(spec)
+        parts = plan_report(spec, max_fields or MAX_REPORT_FIELDS)
+        reports = self.map(
+            lambda sdk, part: sdk.olap.build_part(
+                part, date_from, date_to, chunk, date_field, use_cache, catalog,
+            ),
+            parts,
+        )
+        return join_reports(spec, reports)
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.authenticate()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Context manager exit.
+
+        Каждая полоса завершается так же, как IikoSDK в блоке with:
+        в режиме keep_alive токены остаются для следующего запуска,
+        общий токен (token_shared) освобождает последний арендатор.
+        """
+        for lane in self.lanes:
+            lane.__exit__(exc_type, exc_val, exc_tb)
@@ -1 +1,6 @@
 """Утилиты для iiko API SDK."""
+
+from .files import read_json_gz, write_json_gz
+from .fingerprint import fingerprint
+
+__all__ = ["read_json_gz", "write_json_gz", "fingerprint"]
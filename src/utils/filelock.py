@@ -0,0 +1,136 @@
+"""
+Межпроцессная блокировка на основе файла.
+
+На POSIX используется fcntl.flock, на Windows — msvcrt.locking.
+Блокировка снимается операционной системой при завершении процесса,
+поэтому упавший процесс не оставляет "висящих" блокировок.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Эксклюзивная блокировка файла между процессами.
+
+    Внутри одного процесса блокировка не реентерабельна и не защищает
+    от потоков — для этого используйте дополнительно threading.Lock.
+
+    Пример использования:
+        >>> with FileLock(Path("/tmp/iiko.lock")) as lock:
+        ...     data = lock.read()
+        ...     lock.write(b"...")
+    """
+
+    def __init__(self, path: Path):
+        """
+        Инициализация блокировки.
+
+        Args:
+            path: Путь к файлу блокировки (создается при необходимости)
+        """
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Захватить блокировку.
+
+        Args:
+            timeout: Максимальное время ожидания в секундах (None — без ограничения)
+
+        Raises:
+            TimeoutError: Блокировку не удалось захватить за timeout
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        try:
+            while True:
+                try:
+                    if sys.platform == "win32":
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    elif deadline is None:
+                        fcntl.flock(fd, fcntl.LOCK_EX)
+                    else:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except OSError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise TimeoutError(f"Не удалось захватить блокировку {self.path}")
+                    time.sleep(0.01)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+
+    def release(self) -> None:
+        """Освободить блокировку."""
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if sys.platform == "win32":
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    @property
+    def is_locked(self) -> bool:
+        """Захвачена ли блокировка этим объектом."""
+        return self._fd is not None
+
+    def read(self) -> bytes:
+        """
+        Прочитать содержимое файла блокировки (только под блокировкой).
+
+        Returns:
+            bytes: Содержимое файла
+        """
+        if self._fd is None:
+            raise RuntimeError("Блокировка не захвачена")
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        chunks = []
+        while True:
+            chunk = os.read(self._fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def write(self, data: bytes) -> None:
+        """
+        Перезаписать содержимое файла блокировки (только под блокировкой).
+
+        Args:
+            data: Новое содержимое
+        """
+        if self._fd is None:
+            raise RuntimeError("Блокировка не захвачена")
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.ftruncate(self._fd, 0)
+        os.write(self._fd, data)
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.release()
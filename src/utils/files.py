@@ -0,0 +1,61 @@
+"""
+Вспомогательные функции для работы с файлами.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def write_json_gz(path: Path, obj: Any, compresslevel: int = 6) -> int:
+    """
+    Атомарно записать объект в файл как JSON, сжатый gzip.
+
+    Данные пишутся во временный файл в том же каталоге и затем
+    переименовываются, поэтому читатели никогда не видят
+    частично записанный файл.
+
+    Args:
+        path: Путь к файлу
+        obj: Объект, сериализуемый в JSON
+        compresslevel: Уровень сжатия gzip (1-9)
+
+    Returns:
+        int: Размер записанного файла в байтах
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json.gz")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+            fileobj=raw, mode="wb", compresslevel=compresslevel, mtime=0
+        ) as f:
+            f.write(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return path.stat().st_size
+
+
+def read_json_gz(path: Path) -> Any:
+    """
+    Прочитать JSON из файла, сжатого gzip.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Any: Десериализованный объект
+
+    Raises:
+        OSError: Ошибка чтения или поврежденный архив
+        ValueError: Некорректный JSON
+    """
+    with gzip.open(path, "rb") as f:
+        return json.loads(f.read().decode("utf-8"))
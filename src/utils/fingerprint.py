@@ -0,0 +1,24 @@
+"""
+Стабильные отпечатки (хеши) JSON-совместимых структур.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    Вычислить SHA-256 от канонического JSON-представления объекта.
+
+    Ключи словарей сортируются, поэтому отпечаток не зависит
+    от порядка их добавления.
+
+    Args:
+        obj: JSON-совместимый объект (нестандартные значения приводятся к str)
+
+    Returns:
+        str: Hex-строка SHA-256
+    """
+    material = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
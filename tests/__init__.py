@@ -0,0 +1 @@
+"""Тесты SDK (запуск: python -m unittest discover tests)."""
@@ -0,0 +1,61 @@
+"""Общие помощники тестов: SDK, подключенный к фейковому серверу iiko."""
+
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
+from src import IikoSDK
+from src.client.rate_limiter import RateLimiter
+from src.testing import FakeIikoServer, FakeServerConfig
+
+
+@contextmanager
+def fake_server(config: Optional[FakeServerConfig] = None, **settings: Any) -> Iterator[Tuple[FakeIikoServer, Any]]:
+    """
+    Запустить фейковый сервер и подготовить настройки SDK для него.
+
+    Файл токена и кэш колонок размещаются во временном каталоге.
+
+    Yields:
+        Tuple[FakeIikoServer, Settings]: Сервер и настройки
+    """
+    with tempfile.TemporaryDirectory() as tmp, FakeIikoServer(config) as server:
+        settings.setdefault("token_storage_path", Path(tmp) / ".token")
+        settings.setdefault("olap_columns_cache_dir", Path(tmp) / "columns")
+        settings.setdefault("rate_limit_per_second", 1000.0)
+        yield server, server.make_settings(**settings)
+
+
+@contextmanager
+def fake_sdk(config: Optional[FakeServerConfig] = None, **settings: Any) -> Iterator[Tuple[FakeIikoServer, IikoSDK]]:
+    """
+    Авторизованный IikoSDK, подключенный к фейковому серверу.
+
+    Yields:
+        Tuple[FakeIikoServer, IikoSDK]: Сервер и клиент
+    """
+    with fake_server(config, **settings) as (server, app_settings):
+        with IikoSDK(app_settings) as sdk:
+            yield server, sdk
+
+
+class CountingLimiter(RateLimiter):
+    """Лимитер без пауз, считающий занятые слоты."""
+
+    def __init__(self):
+        super().__init__()
+        self.held = 0
+
+    def reserve(self) -> float:
+        self.held += 1
+        return 0.0
+
+    def release(self) -> None:
+        self.held -= 1
+
+
+def rows_by_key(report) -> dict:
+    """Строки отчета по ключу группировки (порядок строк не важен)."""
+    width = len(report.group_by_row_fields)
+    return {tuple(row[:width]): row[width:] for row in report.iter_rows()}
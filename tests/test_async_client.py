@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+from datetime import datetime
+
+from src import IikoSDK
+from src.reports.chunking import DateWindow
+
+from .support import CountingLimiter, fake_server, rows_by_key
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class ChunkedBody(httpx.AsyncByteStream if httpx else object):
+    """Тело ответа, которое читается из сети кусками."""
+
+    async def __aiter__(self):
+        yield b'{"data": '
+        yield b"[]}"
+
+
+@unittest.skipIf(httpx is None, "нужен httpx")
+class AsyncStreamTest(unittest.TestCase):
+    def _client(self, settings, handler):
+        from src.client.async_http_client import AsyncHTTPClient
+
+        limiter = CountingLimiter()
+        client = AsyncHTTPClient(settings, limiter=limiter)
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client, limiter
+
+    def test_stream_holds_lock_until_closed(self):
+        async def scenario(settings):
+            client, limiter = self._client(settings, lambda request: httpx.Response(200, stream=ChunkedBody()))
+            async with client:
+                response = await client.get("http://iiko.test/resto/api/x", stream=True)
+                self.assertTrue(client._lock.locked())
+                self.assertEqual(limiter.held, 1)
+
+                async for _ in response.aiter_bytes():
+                    pass
+                self.assertFalse(client._lock.locked())
+                self.assertEqual(limiter.held, 0)
+
+                await response.aclose()
+                self.assertEqual(limiter.held, 0)
+
+        with fake_server() as (server, settings):
+            asyncio.run(scenario(settings))
+
+    def test_error_stream_releases(self):
+        async def scenario(settings):
+            client, limiter = self._client(settings, lambda request: httpx.Response(404, content=b"nope"))
+            async with client:
+                with self.assertRaises(httpx.HTTPStatusError):
+                    await client.get("http://iiko.test/resto/api/x", stream=True)
+                self.assertFalse(client._lock.locked())
+                self.assertEqual(limiter.held, 0)
+
+        with fake_server() as (server, settings):
+            asyncio.run(scenario(settings))
+
+
+@unittest.skipIf(httpx is None, "нужен httpx")
+class AsyncSDKTest(unittest.TestCase):
+    def test_report_matches_sync_client(self):
+        from src import AsyncIikoSDK
+
+        window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 8))
+        params = dict(
+            report_type="SALES",
+            group_by_row_fields=["OpenDate.Typed", "Department"],
+            aggregate_fields=["DishSumInt", "GuestNum"],
+            filters={"OpenDate.Typed": window.to_filter()},
+        )
+
+        async def scenario(server, settings):
+            async with AsyncIikoSDK(settings) as sdk:
+                self.assertEqual(len(server.tokens), 1)
+                columns = await sdk.olap.get_columns("SALES")
+                report = await sdk.olap.build_report_v2(**params)
+            return columns, report
+
+        with fake_server() as (server, settings):
+            columns, report = asyncio.run(scenario(server, settings))
+            self.assertEqual(len(server.tokens), 0)
+            self.assertEqual(server.requests["/logout"], 1)
+
+            with IikoSDK(settings) as sdk:
+                self.assertEqual(columns, sdk.olap.get_columns("SALES"))
+                expected = sdk.olap.build_report_v2(**params)
+
+        self.assertGreater(len(report), 0)
+        self.assertEqual(rows_by_key(report), rows_by_key(expected))
+        self.assertEqual(report.summary, expected.summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.reports import OLAPCache, ReportSpec
+from src.reports.chunking import DateWindow
+
+from .support import fake_sdk, rows_by_key
+
+NOW = datetime(2026, 3, 10, 15, 30)
+
+
+def window(start_day: int, end_day: int) -> DateWindow:
+    return DateWindow(datetime(2026, 3, start_day), datetime(2026, 3, end_day))
+
+
+class OLAPCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = OLAPCache(Path(self.tmp.name), mutable_horizon=timedelta(days=3), clock=lambda: NOW)
+
+    def key(self, w: DateWindow, **overrides) -> str:
+        args = dict(
+            server="http://iiko", report_type="SALES", group_by_row_fields=["Department"],
+            aggregate_fields=["DishSumInt"], filters={}, window=w, summary=True,
+        )
+        args.update(overrides)
+        return OLAPCache.make_key(**args)
+
+    def test_only_closed_windows_are_cacheable(self):
+        self.assertTrue(self.cache.is_cacheable(window(1, 7)))
+        self.assertFalse(self.cache.is_cacheable(window(1, 8)))
+
+    def test_key_depends_on_every_part_of_request(self):
+        base = self.key(window(1, 2))
+        self.assertEqual(base, self.key(window(1, 2)))
+        self.assertNotEqual(base, self.key(window(2, 3)))
+        self.assertNotEqual(base, self.key(window(1, 2), summary=False))
+        self.assertNotEqual(base, self.key(window(1, 2), server="http://other"))
+
+    def test_round_trip_and_corrupt_entry(self):
+        key = self.key(window(1, 2))
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, {"rows": [["A", 1]], "summary": None})
+        self.assertEqual(self.cache.get(key)["rows"], [["A", 1]])
+
+        path = self.cache._path(key)
+        path.write_bytes(b"not gzip")
+        with self.assertLogs("src.reports.cache", "WARNING"):
+            self.assertIsNone(self.cache.get(key))
+        self.assertFalse(path.exists())
+
+    def test_lru_eviction(self):
+        first, second = self.key(window(1, 2)), self.key(window(2, 3))
+        self.cache.put(first, {"rows": []})
+        path = self.cache._path(first)
+        os.utime(path, (0, 0))
+        self.cache.max_bytes = path.stat().st_size + 1
+        self.cache.put(second, {"rows": []})
+        self.assertFalse(path.exists())
+        self.assertIsNotNone(self.cache.get(second))
+
+
+class ChunkedCacheTest(unittest.TestCase):
+    def test_second_build_is_served_from_cache(self):
+        spec = ReportSpec("SALES", ["OpenDate.Typed", "Department"], ["DishSumInt"])
+        with tempfile.TemporaryDirectory() as cache_dir, fake_sdk(olap_cache_dir=Path(cache_dir)) as (server, sdk):
+            first = sdk.olap.build_report_chunked(spec, "2026-01-01", "2026-01-15", chunk="week")
+            requests = server.requests["/v2/reports/olap"]
+            second = sdk.olap.build_report_chunked(spec, "2026-01-01", "2026-01-15", chunk="week")
+
+            self.assertEqual(server.requests["/v2/reports/olap"], requests)
+            self.assertTrue(all(c["cached"] for c in second.raw["chunks"]))
+            self.assertEqual(rows_by_key(first), rows_by_key(second))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime
+
+from src.reports import ReportSpec
+from src.reports.chunking import DateWindow, parse_datetime, plan_windows
+
+from .support import fake_sdk, rows_by_key
+
+
+class PlanWindowsTest(unittest.TestCase):
+    def test_week_windows_follow_calendar(self):
+        windows = plan_windows("2026-01-01", "2026-01-15", chunk="week")
+        self.assertEqual(
+            [(w.start.day, w.end.day) for w in windows],
+            [(1, 5), (5, 12), (12, 15)],
+        )
+
+    def test_windows_cover_period_without_gaps(self):
+        for chunk in ("day", "week", "month"):
+            windows = plan_windows("2026-01-03T10:00:00", "2026-03-17", chunk=chunk)
+            self.assertEqual(windows[0].start, datetime(2026, 1, 3, 10))
+            self.assertEqual(windows[-1].end, datetime(2026, 3, 17))
+            for left, right in zip(windows, windows[1:]):
+                self.assertEqual(left.end, right.start)
+
+    def test_month_crosses_year(self):
+        windows = plan_windows("2025-12-15", "2026-02-01", chunk="month")
+        self.assertEqual(
+            [w.start for w in windows],
+            [datetime(2025, 12, 15), datetime(2026, 1, 1)],
+        )
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            plan_windows("2026-01-01", "2026-01-01")
+        with self.assertRaises(ValueError):
+            plan_windows("2026-01-01", "2026-02-01", chunk="year")
+        with self.assertRaises(ValueError):
+            parse_datetime("01.01.2026")
+
+    def test_filter_is_half_open(self):
+        window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 2))
+        self.assertEqual(window.to_filter()["from"], "2026-01-01T00:00:00.000")
+        self.assertFalse(window.to_filter()["includeHigh"])
+
+
+class BuildReportChunkedTest(unittest.TestCase):
+    def test_matches_single_request(self):
+        spec = ReportSpec(
+            "SALES",
+            group_by_row_fields=["OpenDate.Typed", "Department"],
+            aggregate_fields=["DishSumInt", "GuestNum"],
+        )
+        with fake_sdk() as (server, sdk):
+            chunked = sdk.olap.build_report_chunked(spec, "2026-01-01", "2026-01-20", chunk="week")
+            window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 20))
+            single = sdk.olap.build_report_v2(
+                "SALES",
+                group_by_row_fields=spec.group_by_row_fields,
+                aggregate_fields=spec.aggregate_fields,
+                filters={"OpenDate.Typed": window.to_filter()},
+            )
+
+        self.assertEqual(len(chunked.raw["chunks"]), 4)
+        self.assertEqual(rows_by_key(chunked), rows_by_key(single))
+        self.assertEqual(chunked.summary, single.summary)
+
+    def test_rejects_date_filter_in_spec(self):
+        window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 2))
+        spec = ReportSpec("SALES", ["Department"], ["DishSumInt"], filters={"OpenDate.Typed": window.to_filter()})
+        with fake_sdk() as (server, sdk):
+            with self.assertRaises(ValueError):
+                sdk.olap.build_report_chunked(spec, "2026-01-01", "2026-01-08")
+
+
+if __name__ == "__main__":
+    unittest.main()
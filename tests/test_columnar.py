@@ -0,0 +1,84 @@
+import unittest
+
+from src.reports import OLAPReport
+from src.reports.columnar import DimensionColumn, MeasureColumn
+
+
+def column(values):
+    result = MeasureColumn()
+    for value in values:
+        result.append(value)
+    return result
+
+
+class MeasureColumnTest(unittest.TestCase):
+    def test_integers_with_missing_values_stay_integers(self):
+        measure = column([1, None, 3])
+        self.assertEqual(measure.typecode, "q")
+        self.assertEqual(list(measure), [1, None, 3])
+        self.assertIs(type(measure[2]), int)
+        self.assertIsNone(measure[1])
+
+    def test_float_promotes_and_keeps_missing(self):
+        measure = column([1, None, 2.5])
+        self.assertEqual(measure.typecode, "d")
+        self.assertEqual(list(measure), [1.0, None, 2.5])
+
+    def test_non_numeric_falls_back_to_objects(self):
+        measure = column([1, None, "n/a"])
+        self.assertEqual(measure.typecode, "O")
+        self.assertEqual(list(measure), [1, None, "n/a"])
+
+    def test_extend_merges_masks(self):
+        left = column([1, 2])
+        left.extend(column([None, 4]))
+        left.extend(column([5]))
+        self.assertEqual(list(left), [1, 2, None, 4, 5])
+        self.assertEqual(len(left.valid), len(left))
+
+        mixed = column([None])
+        mixed.extend(column([1.5]))
+        self.assertEqual(list(mixed), [None, 1.5])
+
+    def test_dimension_extend_recodes(self):
+        left, right = DimensionColumn(), DimensionColumn()
+        for value in ("a", None, "b"):
+            left.append(value)
+        for value in ("b", "c", None):
+            right.append(value)
+        left.extend(right)
+        self.assertEqual(list(left), ["a", None, "b", "b", "c", None])
+
+
+class OLAPReportTest(unittest.TestCase):
+    def setUp(self):
+        self.report = OLAPReport.from_records(
+            ["Department"], ["GuestNum", "DishSumInt"],
+            [
+                {"Department": "A", "GuestNum": 2, "DishSumInt": 10.5},
+                {"Department": "B", "GuestNum": None, "DishSumInt": 7},
+            ],
+        )
+
+    def test_to_dicts_returns_list(self):
+        dicts = self.report.to_dicts()
+        self.assertIsInstance(dicts, list)
+        self.assertEqual(len(dicts), 2)
+        self.assertEqual(dicts[0], {"Department": "A", "GuestNum": 2, "DishSumInt": 10.5})
+        self.assertIs(type(dicts[0]["GuestNum"]), int)
+        self.assertIsNone(dicts[1]["GuestNum"])
+        self.assertEqual(list(self.report.iter_dicts()), dicts)
+
+    def test_to_pandas_uses_nullable_integers(self):
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            self.skipTest("pandas не установлен")
+        frame = self.report.to_pandas()
+        self.assertEqual(str(frame["GuestNum"].dtype), "Int64")
+        self.assertEqual(frame["GuestNum"].tolist()[0], 2)
+        self.assertTrue(frame["GuestNum"].isna().tolist()[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
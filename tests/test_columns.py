@@ -0,0 +1,41 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src import IikoSDK
+from src.reports.columns import ColumnCache, ColumnCatalog
+
+from .support import fake_server
+
+
+class ColumnCacheTest(unittest.TestCase):
+    def test_default_dir_is_next_to_token(self):
+        with fake_server(olap_columns_cache_dir=None) as (server, settings):
+            cache = ColumnCache.from_settings(settings)
+        self.assertEqual(cache.cache_dir, settings.token_storage_path.parent / ".iiko-columns")
+
+    def test_key_includes_server_version(self):
+        catalog = ColumnCatalog("SALES", [{"id": "GuestNum", "type": "AMOUNT"}])
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ColumnCache(Path(tmp))
+            cache.put("http://iiko.test/version-key", "SALES", catalog, "9.1")
+            self.assertIsNotNone(cache.get("http://iiko.test/version-key", "SALES", "9.1"))
+            self.assertIsNone(cache.get("http://iiko.test/version-key", "SALES", "9.2"))
+
+    def test_server_upgrade_refreshes_columns(self):
+        with fake_server() as (server, settings):
+            for _ in range(2):
+                with IikoSDK(settings) as sdk:
+                    sdk.olap.get_column_catalog("SALES")
+            self.assertEqual(server.requests["/v2/reports/olap/columns"], 1)
+
+            server.config.server_version = "9.2.0.0"
+            with IikoSDK(settings) as sdk:
+                sdk.olap.get_column_catalog("SALES")
+                sdk.olap.get_column_catalog("SALES")
+            self.assertEqual(server.requests["/v2/reports/olap/columns"], 2)
+            self.assertEqual(server.requests["/version"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from datetime import datetime
+
+import requests
+
+from src import IikoSDK
+from src.client.hooks import HOOK_EVENTS, Hooks
+from src.reports.chunking import DateWindow
+from src.testing import FakeServerConfig, FaultProfile
+
+from .support import fake_server
+
+OLAP = "/v2/reports/olap"
+
+# При seed=1 первый запрос отчета получает 429, повтор проходит
+THROTTLED_ONCE = FakeServerConfig(faults=FaultProfile(throttle_rate=0.5, retry_after=0, seed=1))
+
+
+def _build_report(sdk):
+    window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 3))
+    return sdk.olap.build_report_v2(
+        "SALES",
+        group_by_row_fields=["Department"],
+        aggregate_fields=["DishSumInt"],
+        filters={"OpenDate.Typed": window.to_filter()},
+    )
+
+
+class HooksTest(unittest.TestCase):
+    def test_dispatch(self):
+        hooks = Hooks()
+        events = []
+        for name in HOOK_EVENTS:
+            hooks.register(name, lambda event, name=name: events.append((name, event.endpoint, event.status)))
+
+        with fake_server(THROTTLED_ONCE) as (server, settings):
+            with IikoSDK(settings, hooks=hooks) as sdk:
+                del events[:]
+                _build_report(sdk)
+                report_events = [e for e in events if e[1] == OLAP]
+                self.assertEqual(
+                    report_events,
+                    [
+                        ("on_request_start", OLAP, None),
+                        ("on_throttle", OLAP, 429),
+                        ("on_retry", OLAP, 429),
+                        ("on_response", OLAP, 200),
+                        ("on_parse", OLAP, 200),
+                    ],
+                )
+
+                with self.assertRaises(requests.HTTPError):
+                    sdk.get("missing")
+                self.assertEqual(events[-1], ("on_error", "/missing", 404))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import requests
+
+from src.client.http_client import HTTPClient
+from src.client.process_lock import InterProcessLimiter
+
+from .support import CountingLimiter, fake_server
+
+
+class HTTPClientReleaseTest(unittest.TestCase):
+    def test_stream_holds_slot_until_closed(self):
+        with fake_server() as (server, settings):
+            limiter = CountingLimiter()
+            with HTTPClient(settings, limiter=limiter) as client:
+                response = client.get(
+                    f"{server.base_url}/auth",
+                    params={"login": "admin", "pass": "x"},
+                    stream=True,
+                )
+                self.assertEqual(limiter.held, 1)
+                self.assertTrue(client._request_lock.locked())
+
+                with response:
+                    self.assertTrue(response.text)
+                self.assertEqual(limiter.held, 0)
+                self.assertFalse(client._request_lock.locked())
+
+                response.close()
+                self.assertEqual(limiter.held, 0)
+
+    def test_failed_request_releases(self):
+        with fake_server() as (server, settings):
+            limiter = CountingLimiter()
+            with HTTPClient(settings, limiter=limiter) as client:
+                for stream in (False, True):
+                    with self.assertRaises(requests.HTTPError):
+                        client.get(f"{server.base_url}/auth", stream=stream)
+                    self.assertEqual(limiter.held, 0)
+                    self.assertFalse(client._request_lock.locked())
+
+
+class InterProcessLimiterTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.lock_dir = Path(tmp.name)
+
+    def _limiter(self):
+        return InterProcessLimiter("http://iiko.test", rate=1000.0, burst=5, lock_dir=self.lock_dir)
+
+    def test_reserve_does_not_hold_lock(self):
+        limiter = self._limiter()
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertFalse(limiter._file_lock.is_locked)
+        limiter.acquire()
+        limiter.release()
+
+    def test_cancelled_acquire_async_releases_lock(self):
+        limiter = self._limiter()
+        limiter.acquire()
+
+        async def scenario():
+            task = asyncio.create_task(limiter.acquire_async())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            # Поток с acquire() получает блокировку уже после отмены
+            threading.Timer(0.05, limiter.release).start()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.3)
+
+        asyncio.run(scenario())
+
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(limiter.acquire()), daemon=True)
+        thread.start()
+        thread.join(timeout=2)
+        self.assertEqual(len(acquired), 1)
+        limiter.release()
+
+
+if __name__ == "__main__":
+    unittest.main()
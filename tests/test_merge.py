@@ -0,0 +1,109 @@
+import unittest
+
+from src.reports import MergeRule, MetricMerger, ReportSpec, infer_rule, plan_report
+from src.reports.columns import ColumnInfo
+from src.reports.olap import OLAPReport
+
+from .support import fake_sdk
+
+
+def _info(column_type: str) -> ColumnInfo:
+    return ColumnInfo("F", "F", column_type, (), False, True, False)
+
+
+class MergeRuleTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(MergeRule.parse("avg:GuestNum"), MergeRule("avg", "GuestNum"))
+        self.assertEqual(MergeRule.parse(" MAX "), MergeRule("max"))
+        with self.assertRaises(ValueError):
+            MergeRule.parse("avg")
+        with self.assertRaises(ValueError):
+            MergeRule.parse("median")
+
+    def test_infer(self):
+        self.assertEqual(infer_rule("DishSumInt", _info("MONEY")).kind, "sum")
+        self.assertEqual(infer_rule("DishSumInt.average").kind, "none")
+        self.assertEqual(infer_rule("UniqOrderId.OrdersCount").kind, "distinct")
+        self.assertEqual(infer_rule("Price.max").kind, "max")
+        self.assertEqual(infer_rule("Share", _info("PERCENT")).kind, "none")
+
+
+class MetricMergerTest(unittest.TestCase):
+    def setUp(self):
+        spec = ReportSpec(
+            "SALES", ["Department"],
+            ["Sum", "Orders", "Check", "Low", "Share"],
+            merge_rules={"Check": "avg:Orders", "Low": "min", "Share": "none"},
+        )
+        self.merger = MetricMerger.for_spec(spec)
+
+    def test_merge_by_kind(self):
+        a = {"Sum": 100.1, "Orders": 2, "Check": 10.0, "Low": 5, "Share": 0.4}
+        b = {"Sum": 0.2, "Orders": 3, "Check": 20.0, "Low": 3, "Share": 0.6}
+        self.assertEqual(
+            self.merger.merge(a, b),
+            {"Sum": 100.3, "Orders": 5, "Check": 16.0, "Low": 3, "Share": None},
+        )
+        self.assertEqual(self.merger.merge(None, b), b)
+
+    def test_merge_values_matches_merge(self):
+        a, b = [1, 2, 10.0, 5, 0.4], [2, 3, 20.0, 3, 0.6]
+        self.assertEqual(self.merger.merge_values(a, b), [3, 5, 16.0, 3, None])
+
+    def test_summarize(self):
+        report = OLAPReport(["Department"], self.merger.aggregate_fields)
+        report.append(["A", 1, 2, 10.0, 5, 0.4])
+        report.append(["B", 2, 3, 20.0, 3, 0.6])
+        self.assertFalse(self.merger.local_summary)
+        self.assertEqual(
+            self.merger.summarize(report),
+            {"Sum": 3, "Orders": 5, "Check": 16.0, "Low": 3, "Share": None},
+        )
+
+    def test_missing_weight_is_an_error(self):
+        spec = ReportSpec("SALES", ["Department"], ["Check"], merge_rules={"Check": "avg:Orders"})
+        with self.assertRaises(ValueError):
+            MetricMerger.for_spec(spec)
+
+
+class PlanWithWeightsTest(unittest.TestCase):
+    def test_avg_stays_with_weight(self):
+        spec = ReportSpec(
+            "SALES", ["OpenDate.Typed", "Department"],
+            ["F0", "F1", "F2", "F3", "F4", "F5"],
+            merge_rules={"F5": "avg:F0", "F4": "avg:F5"},
+        )
+        parts = plan_report(spec, max_fields=5)
+        for part in parts:
+            self.assertLessEqual(len(part.columns), 5)
+            MetricMerger.for_spec(part)
+        self.assertEqual(
+            sorted(sum((p.aggregate_fields for p in parts), [])),
+            sorted(spec.aggregate_fields),
+        )
+        self.assertIn(["F0", "F4", "F5"], [p.aggregate_fields for p in parts])
+
+    def test_unit_wider_than_part(self):
+        spec = ReportSpec(
+            "SALES", ["Department"], ["F0", "F1", "F2", "F3"],
+            merge_rules={"F1": "avg:F0", "F2": "avg:F0"},
+        )
+        with self.assertRaises(ValueError):
+            plan_report(spec, max_fields=3)
+
+    def test_wide_chunked_build_with_avg(self):
+        spec = ReportSpec(
+            "SALES", ["Department"],
+            ["GuestNum", "DishAmountInt", "DiscountSum", "DishSumInt"],
+            merge_rules={"DishSumInt": "avg:GuestNum"},
+        )
+        with fake_sdk() as (server, sdk):
+            report = sdk.olap.build_report_wide(
+                spec, "2026-01-01", "2026-01-20", chunk="week", max_fields=3,
+            )
+        self.assertEqual(report.aggregate_fields, spec.aggregate_fields)
+        self.assertTrue(all(v is not None for v in report.measures["DishSumInt"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
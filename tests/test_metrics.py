@@ -0,0 +1,54 @@
+import unittest
+from datetime import datetime
+
+from src import IikoSDK
+from src.client.hooks import Hooks
+from src.client.metrics import SDKMetrics
+from src.reports.chunking import DateWindow
+from src.testing import FakeServerConfig, FaultProfile
+
+from .support import fake_server
+
+OLAP = "/v2/reports/olap"
+
+# При seed=1 первый запрос отчета получает 429, повтор проходит
+THROTTLED_ONCE = FakeServerConfig(faults=FaultProfile(throttle_rate=0.5, retry_after=0, seed=1))
+
+
+def _build_report(sdk):
+    window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 3))
+    return sdk.olap.build_report_v2(
+        "SALES",
+        group_by_row_fields=["Department"],
+        aggregate_fields=["DishSumInt"],
+        filters={"OpenDate.Typed": window.to_filter()},
+    )
+
+
+class SDKMetricsTest(unittest.TestCase):
+    def test_report_with_throttle(self):
+        hooks = Hooks()
+        metrics = SDKMetrics().install(hooks)
+        with fake_server(THROTTLED_ONCE) as (server, settings):
+            with IikoSDK(settings, hooks=hooks) as sdk:
+                report = _build_report(sdk)
+            self.assertEqual(server.faults["throttle"], 1)
+
+        self.assertEqual(metrics.requests.value(endpoint=OLAP, method="POST", status=200), 1)
+        self.assertEqual(metrics.retries.value(endpoint=OLAP, status=429), 1)
+        self.assertEqual(metrics.throttled.value(endpoint=OLAP, source="server"), 1)
+        self.assertEqual(metrics.rows.value(endpoint=OLAP), len(report))
+        self.assertEqual(metrics.licence_acquisitions.value(), 1)
+        self.assertEqual(metrics.licence_releases.value(), 1)
+
+        lines = metrics.registry.render_prometheus().splitlines()
+        self.assertIn("# TYPE iiko_requests_total counter", lines)
+        self.assertIn('iiko_requests_total{endpoint="/v2/reports/olap",method="POST",status="200"} 1', lines)
+        self.assertIn('iiko_retries_total{endpoint="/v2/reports/olap",status="429"} 1', lines)
+        self.assertIn('iiko_throttled_total{endpoint="/v2/reports/olap",source="server"} 1', lines)
+        self.assertIn('iiko_request_duration_seconds_count{endpoint="/v2/reports/olap"} 1', lines)
+        self.assertIn("iiko_licence_acquisitions_total 1", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
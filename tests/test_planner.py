@@ -0,0 +1,75 @@
+import unittest
+from datetime import datetime
+
+from src.reports import ReportSpec, join_reports, plan_report
+from src.reports.chunking import DateWindow
+from src.reports.olap import OLAPReport
+
+from .support import fake_sdk, rows_by_key
+
+AGGREGATES = ["DishSumInt", "GuestNum", "DishAmountInt", "DiscountSum", "DishDiscountSumInt"]
+
+
+class PlanReportTest(unittest.TestCase):
+    def test_narrow_spec_is_kept(self):
+        spec = ReportSpec("SALES", ["Department"], AGGREGATES[:3])
+        self.assertEqual(plan_report(spec), [spec])
+
+    def test_parts_are_even(self):
+        spec = ReportSpec("SALES", ["Department", "WaiterName"], [f"F{i}" for i in range(12)])
+        parts = plan_report(spec, max_fields=7)
+        self.assertEqual([len(p.aggregate_fields) for p in parts], [4, 4, 4])
+        self.assertEqual(sum((p.aggregate_fields for p in parts), []), spec.aggregate_fields)
+        for part in parts:
+            self.assertEqual(part.group_by_row_fields, spec.group_by_row_fields)
+            self.assertLessEqual(len(part.columns), 7)
+
+    def test_no_room_for_aggregates(self):
+        spec = ReportSpec("SALES", ["A", "B", "C"], ["F1", "F2"])
+        with self.assertRaises(ValueError):
+            plan_report(spec, max_fields=3)
+
+
+class JoinReportsTest(unittest.TestCase):
+    def test_outer_join(self):
+        spec = ReportSpec("SALES", ["Department"], ["DishSumInt", "GuestNum"])
+        left = OLAPReport(["Department"], ["DishSumInt"])
+        left.append(["A", 10])
+        left.append(["B", 20])
+        right = OLAPReport(["Department"], ["GuestNum"])
+        right.append(["B", 2])
+        right.append(["C", 3])
+
+        joined = join_reports(spec, [left, right])
+        self.assertEqual(
+            list(joined.iter_rows()),
+            [["A", 10, None], ["B", 20, 2], ["C", None, 3]],
+        )
+        self.assertEqual(joined.raw["parts"][1], {"aggregateFields": ["GuestNum"], "rows": 2})
+
+    def test_different_grouping_is_rejected(self):
+        spec = ReportSpec("SALES", ["Department"], ["DishSumInt"])
+        with self.assertRaises(ValueError):
+            join_reports(spec, [OLAPReport(["WaiterName"], ["DishSumInt"])])
+
+
+class BuildReportWideTest(unittest.TestCase):
+    def test_matches_single_request(self):
+        spec = ReportSpec("SALES", ["OpenDate.Typed", "Department"], AGGREGATES)
+        with fake_sdk() as (server, sdk):
+            wide = sdk.olap.build_report_wide(spec, "2026-01-01", "2026-01-08", max_fields=4)
+            window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 8))
+            single = sdk.olap.build_report_v2(
+                "SALES",
+                group_by_row_fields=spec.group_by_row_fields,
+                aggregate_fields=spec.aggregate_fields,
+                filters={"OpenDate.Typed": window.to_filter()},
+            )
+        self.assertEqual(len(wide.raw["parts"]), 3)
+        self.assertEqual(wide.columns, spec.columns)
+        self.assertEqual(rows_by_key(wide), rows_by_key(single))
+        self.assertEqual(wide.summary, single.summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import requests
+
+from src.auth.auth_manager import is_token_rejected
+from src.testing import FakeServerConfig, FaultProfile
+
+from .support import fake_sdk
+
+
+def _rejecting(status: int) -> FakeServerConfig:
+    """Сервер, отвечающий status на каждый запрос списка организаций."""
+    return FakeServerConfig(
+        faults=FaultProfile(
+            error_rate=1.0, error_statuses=(status,), paths=("/corporation/organizations",)
+        )
+    )
+
+
+class IsTokenRejectedTest(unittest.TestCase):
+    def test_status_and_body(self):
+        self.assertTrue(is_token_rejected(401))
+        self.assertTrue(is_token_rejected(403, "Token is expired or invalid"))
+        self.assertTrue(is_token_rejected(403, "Пользователь не авторизован"))
+        self.assertFalse(is_token_rejected(403, "No permission for column key DishSumInt"))
+        self.assertFalse(is_token_rejected(403, "Нет прав на отчет с ключом SALES"))
+        self.assertFalse(is_token_rejected(500, "token"))
+
+
+class ReauthenticateTest(unittest.TestCase):
+    def test_revoked_token_is_replaced_once(self):
+        with fake_sdk() as (server, sdk):
+            stale = sdk.token
+            server.logout(stale)
+
+            response = sdk.get("corporation/organizations")
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(sdk.token, stale)
+            self.assertEqual(server.requests["/auth"], 2)
+            self.assertEqual(server.requests["/corporation/organizations"], 2)
+
+    def test_single_replay(self):
+        with fake_sdk(_rejecting(401)) as (server, sdk):
+            with self.assertRaises(requests.HTTPError):
+                sdk.get("corporation/organizations")
+            self.assertEqual(server.requests["/auth"], 2)
+            self.assertEqual(server.requests["/corporation/organizations"], 2)
+
+    def test_permission_error_is_not_replayed(self):
+        with fake_sdk(_rejecting(403)) as (server, sdk):
+            with self.assertRaises(requests.HTTPError):
+                sdk.get("corporation/organizations")
+            self.assertEqual(server.requests["/auth"], 1)
+            self.assertEqual(server.requests["/corporation/organizations"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from datetime import datetime
+
+from src.reports import MetricMerger, ReportSpec, coalesce_windows
+from src.reports.chunking import DateWindow, plan_windows
+from src.reports.merge import GroupAccumulator
+from src.reports.olap import OLAPReport
+
+from .support import fake_sdk, rows_by_key
+
+
+def _part(fields, rows):
+    part = OLAPReport(["Department"], fields)
+    for row in rows:
+        part.append(row)
+    return part
+
+
+class GroupAccumulatorTest(unittest.TestCase):
+    def test_merges_groups_across_windows(self):
+        spec = ReportSpec(
+            "SALES", ["Department"], ["Sum", "Orders", "Check"],
+            merge_rules={"Check": "avg:Orders", "Orders": "distinct"},
+        )
+        acc = GroupAccumulator(["Department"], MetricMerger.for_spec(spec))
+        acc.add(_part(spec.aggregate_fields, [["A", 1.5, 2, 10.0], ["B", 1, 1, 5.0]]))
+        acc.add(_part(spec.aggregate_fields, [["A", 2, 3, 20.0], ["C", None, 1, 7.0]]))
+        self.assertEqual(
+            list(acc.rows()),
+            [["A", 3.5, 5, 16.0], ["B", 1, 1, 5.0], ["C", None, 1, 7.0]],
+        )
+
+    def test_none_kind_group_across_windows_raises(self):
+        spec = ReportSpec("SALES", ["Department"], ["Sum", "Share"], merge_rules={"Share": "none"})
+        acc = GroupAccumulator(["Department"], MetricMerger.for_spec(spec))
+        acc.add(_part(spec.aggregate_fields, [["A", 1, 0.5]]))
+        # Новые группы сливать не нужно
+        acc.add(_part(spec.aggregate_fields, [["B", 1, 0.5]]))
+        with self.assertRaises(ValueError):
+            acc.add(_part(spec.aggregate_fields, [["A", 1, 0.5]]))
+
+
+class CoalesceWindowsTest(unittest.TestCase):
+    def setUp(self):
+        self.windows = plan_windows("2026-01-01", "2026-01-20", chunk="week")
+
+    def test_coarse_grouping_with_none_kind(self):
+        spec = ReportSpec("SALES", ["Department"], ["DishSumInt", "Share"], merge_rules={"Share": "none"})
+        with self.assertLogs("src.reports.olap", "WARNING"):
+            windows = coalesce_windows(spec, self.windows, MetricMerger.for_spec(spec))
+        self.assertEqual(windows, [DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 20))])
+
+    def test_windows_kept_when_mergeable(self):
+        spec = ReportSpec("SALES", ["Department"], ["DishSumInt"])
+        self.assertEqual(coalesce_windows(spec, self.windows, MetricMerger.for_spec(spec)), self.windows)
+        by_date = ReportSpec("SALES", ["OpenDate.Typed"], ["Share"], merge_rules={"Share": "none"})
+        self.assertEqual(coalesce_windows(by_date, self.windows, MetricMerger.for_spec(by_date)), self.windows)
+
+
+class CoarseChunkedBuildTest(unittest.TestCase):
+    def _single(self, sdk, spec):
+        window = DateWindow(datetime(2026, 1, 1), datetime(2026, 1, 20))
+        return sdk.olap.build_report_v2(
+            "SALES",
+            group_by_row_fields=spec.group_by_row_fields,
+            aggregate_fields=spec.aggregate_fields,
+            filters={"OpenDate.Typed": window.to_filter()},
+        )
+
+    def test_regroup_matches_single_request(self):
+        spec = ReportSpec("SALES", ["Department", "WaiterName"], ["DishSumInt", "GuestNum"])
+        with fake_sdk() as (server, sdk):
+            chunked = sdk.olap.build_report_chunked(spec, "2026-01-01", "2026-01-20", chunk="week")
+            single = self._single(sdk, spec)
+        self.assertEqual(len(chunked.raw["chunks"]), 4)
+        self.assertEqual(rows_by_key(chunked), rows_by_key(single))
+
+    def test_none_kind_falls_back_to_single_request(self):
+        spec = ReportSpec("SALES", ["Department"], ["DishSumInt", "GuestNum"], merge_rules={"GuestNum": "none"})
+        with fake_sdk() as (server, sdk):
+            with self.assertLogs("src.reports.olap", "WARNING"):
+                chunked = sdk.olap.build_report_chunked(spec, "2026-01-01", "2026-01-20", chunk="week")
+            single = self._single(sdk, spec)
+        self.assertEqual(len(chunked.raw["chunks"]), 1)
+        self.assertEqual(rows_by_key(chunked), rows_by_key(single))
+        self.assertTrue(all(v is not None for v in chunked.measures["GuestNum"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
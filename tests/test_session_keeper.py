@@ -0,0 +1,59 @@
+import unittest
+
+from src import IikoSDK
+from src.auth.session_keeper import SessionKeeper
+
+from .support import fake_server
+
+
+class KeepAliveTest(unittest.TestCase):
+    def test_token_survives_runs(self):
+        with fake_server(session_mode="keep_alive") as (server, settings):
+            with IikoSDK(settings) as first:
+                token = first.token
+            with IikoSDK(settings) as second:
+                self.assertEqual(second.token, token)
+                second.get("corporation/organizations")
+
+            self.assertEqual(server.requests["/auth"], 1)
+            self.assertEqual(server.requests["/logout"], 0)
+            self.assertEqual(list(server.tokens), [token])
+
+            keeper = SessionKeeper(settings)
+            self.addCleanup(keeper.http_client.close)
+            self.assertFalse(keeper.check())
+            self.assertTrue(keeper.check(idle_timeout=0))
+            self.assertEqual(server.requests["/logout"], 1)
+            self.assertEqual(len(server.tokens), 0)
+
+            # Следующий запуск получает новый токен
+            with IikoSDK(settings) as third:
+                self.assertNotEqual(third.token, token)
+            self.assertEqual(server.requests["/auth"], 2)
+
+    def test_keeper_skips_leased_shared_token(self):
+        with fake_server(session_mode="keep_alive", token_shared=True) as (server, settings):
+            keeper = SessionKeeper(settings)
+            self.addCleanup(keeper.http_client.close)
+            with IikoSDK(settings):
+                self.assertFalse(keeper.check(idle_timeout=0))
+                self.assertEqual(len(server.tokens), 1)
+
+            self.assertEqual(server.requests["/logout"], 0)
+            self.assertTrue(keeper.check(idle_timeout=0))
+            self.assertEqual(len(server.tokens), 0)
+
+    def test_run_releases_on_stop(self):
+        with fake_server(session_mode="keep_alive") as (server, settings):
+            with IikoSDK(settings):
+                pass
+
+            keeper = SessionKeeper(settings)
+            keeper.stop()
+            keeper.run()
+            self.assertEqual(server.requests["/logout"], 1)
+            self.assertEqual(len(server.tokens), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import subprocess
+import sys
+import unittest
+
+from src import IikoSDK
+
+from .support import fake_server
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _dead_pid() -> int:
+    """PID завершившегося процесса."""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class SharedTokenTest(unittest.TestCase):
+    def test_two_sdks_share_one_auth(self):
+        with fake_server(token_shared=True) as (server, settings):
+            with IikoSDK(settings) as first, IikoSDK(settings) as second:
+                self.assertEqual(first.token, second.token)
+                self.assertEqual(server.requests["/auth"], 1)
+                self.assertEqual(len(server.tokens), 1)
+
+    def test_logout_on_last_lease(self):
+        with fake_server(token_shared=True) as (server, settings):
+            first = IikoSDK(settings).__enter__()
+            second = IikoSDK(settings).__enter__()
+
+            first.__exit__(None, None, None)
+            self.assertEqual(server.requests["/logout"], 0)
+            self.assertEqual(len(server.tokens), 1)
+            # Оставшийся арендатор продолжает работать с тем же токеном
+            second.get("corporation/organizations")
+            self.assertEqual(server.requests["/auth"], 1)
+
+            second.__exit__(None, None, None)
+            self.assertEqual(server.requests["/logout"], 1)
+            self.assertEqual(len(server.tokens), 0)
+
+    def test_dead_leases_are_pruned(self):
+        with fake_server(token_shared=True) as (server, settings):
+            sdk = IikoSDK(settings).__enter__()
+
+            # Аренда процесса, упавшего без release()
+            path = settings.token_storage_path
+            state = json.loads(path.read_text())
+            state["leases"].append({"pid": _dead_pid(), "lease": "crashed"})
+            path.write_text(json.dumps(state))
+
+            sdk.__exit__(None, None, None)
+            self.assertEqual(server.requests["/logout"], 1)
+            self.assertEqual(len(server.tokens), 0)
+
+    @unittest.skipIf(httpx is None, "нужен httpx")
+    def test_async_client_takes_a_lease(self):
+        from src import AsyncIikoSDK
+
+        async def run_async(settings):
+            async with AsyncIikoSDK(settings) as sdk:
+                await sdk.get("corporation/organizations")
+                return sdk.token
+
+        with fake_server(token_shared=True) as (server, settings):
+            with IikoSDK(settings) as sdk:
+                async_token = asyncio.run(run_async(settings))
+                self.assertEqual(async_token, sdk.token)
+
+                # logout асинхронного клиента не отзывает общий токен
+                self.assertEqual(server.requests["/logout"], 0)
+                self.assertEqual(len(server.tokens), 1)
+                sdk.get("corporation/organizations")
+                self.assertEqual(server.requests["/auth"], 1)
+
+            self.assertEqual(server.requests["/logout"], 1)
+            self.assertEqual(len(server.tokens), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
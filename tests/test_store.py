@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from src.reports import ReportSpec
+from src.reports.chunking import DateWindow, floor_boundary
+from src.reports.olap import OLAPReport
+from src.reports.store import OLAPStore
+
+from .support import fake_sdk, rows_by_key
+
+SPEC = ReportSpec(
+    "SALES",
+    group_by_row_fields=["OpenDate.Typed", "Department"],
+    aggregate_fields=["DishSumInt", "GuestNum"],
+)
+
+
+class FloorBoundaryTest(unittest.TestCase):
+    def test_floor(self):
+        dt = datetime(2026, 1, 14, 13, 30)  # среда
+        self.assertEqual(floor_boundary(dt, "day"), datetime(2026, 1, 14))
+        self.assertEqual(floor_boundary(dt, "week"), datetime(2026, 1, 12))
+        self.assertEqual(floor_boundary(dt, "month"), datetime(2026, 1, 1))
+
+
+class SyncTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = OLAPStore(Path(tmp.name))
+
+    def test_week_resync_keeps_rows(self):
+        with fake_sdk() as (server, sdk):
+            first = sdk.olap.sync(SPEC, self.store, start="2026-01-01", until="2026-01-20", chunk="week")
+            loaded = self.store.load(first.key, SPEC)
+            expected = sdk.olap.build_report_chunked(SPEC, "2026-01-01", "2026-01-20", chunk="week")
+            self.assertEqual(len(loaded), len(expected))
+
+            # Перепроверка начинается с понедельника 12.01, а не с 18.01:
+            # иначе окно [18.01, 19.01) стерло бы партицию [12.01, 20.01)
+            again = sdk.olap.sync(SPEC, self.store, until="2026-01-20", chunk="week")
+            self.assertEqual(again.windows[0].start, datetime(2026, 1, 12))
+            self.assertEqual(rows_by_key(self.store.load(first.key, SPEC)), rows_by_key(expected))
+
+            sdk.olap.sync(SPEC, self.store, until="2026-02-03", chunk="week")
+            longer = sdk.olap.build_report_chunked(SPEC, "2026-01-01", "2026-02-03", chunk="week")
+            self.assertEqual(rows_by_key(self.store.load(first.key, SPEC)), rows_by_key(longer))
+
+    def test_resync_does_not_reach_before_first_partition(self):
+        with fake_sdk() as (server, sdk):
+            sdk.olap.sync(SPEC, self.store, start="2026-01-07", until="2026-01-09", chunk="week")
+            again = sdk.olap.sync(SPEC, self.store, until="2026-01-09", recheck_days=7, chunk="week")
+        self.assertEqual(again.windows[0].start, datetime(2026, 1, 7))
+
+    def test_changed_chunk_is_rejected(self):
+        with fake_sdk() as (server, sdk):
+            result = sdk.olap.sync(SPEC, self.store, start="2026-01-05", until="2026-01-19", chunk="week")
+            with self.assertRaises(ValueError):
+                sdk.olap.sync(SPEC, self.store, until="2026-01-19", chunk="day")
+            self.assertEqual(len(self.store._partition_windows(result.key)), 2)
+
+
+class WriteWindowTest(unittest.TestCase):
+    def test_partial_overlap_raises(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = OLAPStore(Path(tmp))
+            report = OLAPReport(["Department"], ["DishSumInt"])
+            report.append(["A", 1])
+            store.write_window("k", DateWindow(datetime(2026, 1, 5), datetime(2026, 1, 12)), report)
+
+            with self.assertRaises(ValueError):
+                store.write_window("k", DateWindow(datetime(2026, 1, 10), datetime(2026, 1, 11)), report)
+
+            # Окно, целиком покрывающее партицию, заменяет ее
+            store.write_window("k", DateWindow(datetime(2026, 1, 5), datetime(2026, 1, 19)), report)
+            self.assertEqual(len(store.load("k", ReportSpec("SALES", ["Department"], ["DishSumInt"]))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
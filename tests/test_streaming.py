@@ -0,0 +1,53 @@
+import json
+import unittest
+
+from src.reports.streaming import OLAPStreamParser, parse_olap_stream
+
+BODY = json.dumps(
+    {
+        "data": [
+            {"Department": "Кафе", "DishSumInt": -0.5, "GuestNum": 12},
+            {"Department": "Бар", "DishSumInt": 1.25e3, "GuestNum": -7, "Flag": True},
+            [10, -0.125, 3E-2, None, "x,]"],
+            1234567,
+            -0.5,
+            2e5,
+        ],
+        "summary": [[], {"DishSumInt": 1249.5}],
+    },
+    ensure_ascii=False,
+).encode("utf-8")
+
+
+def _parse(chunks):
+    rows = []
+    meta = parse_olap_stream(chunks, rows.append)
+    return dict(meta, data=rows)
+
+
+class OLAPStreamParserTest(unittest.TestCase):
+    def test_every_split_point(self):
+        expected = json.loads(BODY)
+        for split in range(len(BODY) + 1):
+            with self.subTest(split=split):
+                self.assertEqual(_parse([BODY[:split], BODY[split:]]), expected)
+
+    def test_exponent_literals(self):
+        body = b'{"data": [1e5, -2.5E+3, [0], 7], "summary": -1E-2}'
+        for split in range(len(body) + 1):
+            with self.subTest(split=split):
+                self.assertEqual(_parse([body[:split], body[split:]]), json.loads(body))
+
+    def test_byte_by_byte(self):
+        chunks = [BODY[i:i + 1] for i in range(len(BODY))]
+        self.assertEqual(_parse(chunks), json.loads(BODY))
+
+    def test_truncated_body(self):
+        parser = OLAPStreamParser(lambda row: None)
+        parser.feed(BODY[:-3])
+        with self.assertRaises(ValueError):
+            parser.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from src import Credentials, TokenPool
+from src.reports import ReportSpec
+
+from .support import fake_sdk, fake_server, rows_by_key
+
+CREDENTIALS = [Credentials("api1", "secret1"), Credentials("api2", "secret2")]
+
+
+class TokenPoolTest(unittest.TestCase):
+    def test_chunked_matches_sdk(self):
+        spec = ReportSpec("SALES", ["Department"], ["DishSumInt", "GuestNum"])
+        with fake_sdk() as (server, sdk):
+            expected = sdk.olap.build_report_chunked(spec, "2026-01-01", "2026-01-20", chunk="week")
+            with TokenPool(CREDENTIALS, sdk.settings) as pool:
+                report = pool.build_report_chunked(spec, "2026-01-01", "2026-01-20", chunk="week")
+        self.assertEqual(rows_by_key(report), rows_by_key(expected))
+
+    def test_exit_logs_out_per_run(self):
+        with fake_server() as (server, settings):
+            with TokenPool(CREDENTIALS, settings):
+                self.assertEqual(len(server.tokens), 2)
+            self.assertEqual(server.requests["/logout"], 2)
+            self.assertEqual(len(server.tokens), 0)
+
+    def test_exit_detaches_keep_alive(self):
+        with fake_server(session_mode="keep_alive") as (server, settings):
+            with TokenPool(CREDENTIALS, settings):
+                pass
+            self.assertEqual(server.requests["/logout"], 0)
+            self.assertEqual(len(server.tokens), 2)
+
+            # Следующий запуск берет сохраненные токены без авторизации
+            with TokenPool(CREDENTIALS, settings):
+                pass
+            self.assertEqual(server.requests["/auth"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+from src.reports import OLAPSpecError, ReportSpec
+from src.reports.olap import OLAPReports
+
+from .support import fake_sdk
+
+SPEC = ReportSpec(
+    "SALES",
+    group_by_row_fields=["OpenDate.Typed", "Department"],
+    aggregate_fields=["DishSumInt", "GuestNum", "DishAmountInt", "DiscountSum"],
+)
+COLUMNS = "/v2/reports/olap/columns"
+
+
+class ValidateOnceTest(unittest.TestCase):
+    """Без кэша колонок (ttl=0) каждая проверка — отдельный запрос /columns."""
+
+    def test_chunked_fetches_columns_once(self):
+        with fake_sdk(olap_columns_cache_ttl_seconds=0) as (server, sdk):
+            report = sdk.olap.build_report_chunked(SPEC, "2026-01-01", "2026-01-20", chunk="week")
+        self.assertEqual(len(report.raw["chunks"]), 4)
+        self.assertEqual(server.requests[COLUMNS], 1)
+
+    def test_wide_fetches_columns_once(self):
+        with fake_sdk(olap_columns_cache_ttl_seconds=0) as (server, sdk):
+            sdk.olap.build_report_wide(SPEC, "2026-01-01", "2026-01-20", chunk="week", max_fields=4)
+        self.assertEqual(server.requests["/v2/reports/olap"], 8)
+        self.assertEqual(server.requests[COLUMNS], 1)
+
+    def test_invalid_spec_fails_before_requests(self):
+        spec = ReportSpec("SALES", ["Department"], ["NoSuchField"])
+        with fake_sdk() as (server, sdk):
+            with self.assertRaises(OLAPSpecError):
+                sdk.olap.build_report_chunked(spec, "2026-01-01", "2026-01-20")
+        self.assertEqual(server.requests["/v2/reports/olap"], 0)
+
+    def test_malformed_columns_skip_validation(self):
+        with fake_sdk() as (server, sdk):
+            with mock.patch.object(OLAPReports, "_parse_columns", side_effect=ValueError("bad body")):
+                with self.assertLogs("src.reports.olap", "WARNING"):
+                    self.assertIsNone(sdk.olap.validate_spec("SALES", ["Department"], ["DishSumInt"]))
+
+
+if __name__ == "__main__":
+    unittest.main()